@@ -1,28 +1,128 @@
 # ==============================================================================
 # File: ai_sentiment_analyzer.py
 # NEW FILE
+# UPDATED: Selectable CPU backends (PyTorch fp32/int8, ONNX Runtime fp32/int8).
 # ==============================================================================
+import os
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import numpy as np
 import torch
 
+BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+# Positional order of BertForSequenceClassification.forward; the export passes
+# the inputs positionally, so it must follow this and not the tokenizer's order.
+FORWARD_INPUTS = ('input_ids', 'attention_mask', 'token_type_ids')
+PARITY_SENTENCES = (
+    "Shares rallied after the company raised its full-year guidance.",
+    "Losses widened.",
+    "The board will meet on Tuesday to discuss the dividend, analysts said.",
+)
+
+
 class AISentimentAnalyzer:
-    def __init__(self):
-        print("Initializing AI Sentiment Analyzer (FinBERT)...")
+    def __init__(self, backend='torch', onnx_path='models/finbert.onnx'):
+        print(f"Initializing AI Sentiment Analyzer (FinBERT, {backend} backend)...")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown sentiment backend '{backend}', expected one of {BACKENDS}")
         # This will download the model the first time it's run.
         model_name = "ProsusAI/finbert"
+        self.backend = backend
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.model.eval()
+        self.labels = list(self.model.config.id2label.values())
+        self._session = None
+
+        if backend == 'torch-int8':
+            self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        elif backend.startswith('onnx'):
+            self._session = self._load_onnx_session(onnx_path, quantize=backend == 'onnx-int8')
         print("FinBERT model loaded successfully.")
 
+    def _load_onnx_session(self, onnx_path, quantize):
+        """Exports the model to ONNX on first use (and int8-quantizes it if asked).
+
+        The fp32 export is checked against PyTorch every time it is loaded; one
+        that disagrees (e.g. left by an older, mis-wired export) is rebuilt
+        together with its int8 copy.
+        """
+        import onnxruntime
+
+        root, ext = os.path.splitext(onnx_path)
+        quantized_path = f"{root}.int8{ext}"
+        if os.path.exists(onnx_path):
+            try:
+                self._check_onnx_parity(onnxruntime.InferenceSession(onnx_path, providers=['CPUExecutionProvider']))
+            except RuntimeError as e:
+                print(f"Discarding stale ONNX model {onnx_path}: {e}")
+                for path in (onnx_path, quantized_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+        if not os.path.exists(onnx_path):
+            self._export_onnx(onnx_path)
+            try:
+                self._check_onnx_parity(onnxruntime.InferenceSession(onnx_path, providers=['CPUExecutionProvider']))
+            except RuntimeError:
+                os.remove(onnx_path)
+                raise
+        if quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            if not os.path.exists(quantized_path):
+                print(f"Quantizing ONNX model to {quantized_path}...")
+                quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QInt8)
+            onnx_path = quantized_path
+
+        session = onnxruntime.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+        self._onnx_inputs = [i.name for i in session.get_inputs()]
+        return session
+
+    def _export_onnx(self, onnx_path):
+        print(f"Exporting FinBERT to ONNX at {onnx_path}...")
+        os.makedirs(os.path.dirname(onnx_path) or '.', exist_ok=True)
+        sample = self.tokenizer(["warm up"], return_tensors="pt")
+        names = [name for name in FORWARD_INPUTS if name in sample]
+        axes = {name: {0: 'batch', 1: 'sequence'} for name in names}
+        axes['logits'] = {0: 'batch'}
+        torch.onnx.export(self.model, tuple(sample[name] for name in names), onnx_path,
+                          input_names=names, output_names=['logits'], dynamic_axes=axes, opset_version=14)
+
+    def _check_onnx_parity(self, session, atol=1e-3):
+        """Raises RuntimeError if ONNX and PyTorch logits disagree on a few sentences."""
+        inputs = self.tokenizer(list(PARITY_SENTENCES), return_tensors="pt", truncation=True, padding=True)
+        with torch.no_grad():
+            expected = self.model(**inputs).logits.numpy()
+        feed = {i.name: inputs[i.name].numpy().astype(np.int64) for i in session.get_inputs()}
+        actual = session.run(None, feed)[0]
+        if not np.allclose(actual, expected, atol=atol):
+            raise RuntimeError(f"ONNX export does not match PyTorch (max |diff| {np.abs(actual - expected).max():.2e})")
+
     def analyze(self, text):
         try:
-            inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512, padding=True)
-            with torch.no_grad():
-                logits = self.model(**inputs).logits
-            scores = {k: v for k, v in zip(self.model.config.id2label.values(), torch.softmax(logits, dim=1)[0].tolist())}
-            label = max(scores, key=scores.get)
-            score = scores[label]
-            return label, score
+            return self.analyze_batch([text])[0]
         except Exception as e:
             print(f"Error during FinBERT analysis: {e}")
             return "neutral", 0.0
+
+    def analyze_batch(self, texts):
+        """Scores several texts in one forward pass, padded to the longest one.
+
+        Returns a (label, score) tuple per text, in order.
+        """
+        results = []
+        for probabilities in self._probabilities(texts):
+            scores = dict(zip(self.labels, probabilities))
+            label = max(scores, key=scores.get)
+            results.append((label, scores[label]))
+        return results
+
+    def _probabilities(self, texts):
+        if self._session is not None:
+            inputs = self.tokenizer(texts, return_tensors="np", truncation=True, max_length=512, padding=True)
+            logits = self._session.run(None, {name: inputs[name].astype(np.int64) for name in self._onnx_inputs})[0]
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            return (exp / exp.sum(axis=1, keepdims=True)).tolist()
+
+        inputs = self.tokenizer(texts, return_tensors="pt", truncation=True, max_length=512, padding=True)
+        with torch.no_grad():
+            logits = self.model(**inputs).logits
+        return torch.softmax(logits, dim=1).tolist()
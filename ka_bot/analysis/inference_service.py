@@ -0,0 +1,134 @@
+# ==============================================================================
+# File: inference_service.py
+# NEW FILE: Micro-batched FinBERT inference on a dedicated thread.
+# ==============================================================================
+import asyncio
+import queue
+import threading
+import time
+
+from analysis.text_cache import text_key
+from services.metrics import INFERENCE_SECONDS, INFERENCE_TEXTS
+
+
+def _resolve(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _fail(future, exc):
+    if not future.done():
+        future.set_exception(exc)
+
+
+class SentimentInferenceService:
+    """Awaitable front end for AISentimentAnalyzer that batches concurrent requests.
+
+    ``analyze`` hands the text to a worker thread and awaits the result, so the
+    event loop keeps running while the model does. The worker takes the first
+    waiting request, keeps collecting until it has ``max_batch_size`` texts or
+    ``max_latency`` seconds have passed, and scores them with one padded forward
+    pass (``AISentimentAnalyzer.analyze_batch``).
+
+    With a ``cache`` (TextCache), repeated texts are answered without inference,
+    and identical texts already waiting on the model share one request.
+    """
+
+    def __init__(self, analyzer, max_batch_size=16, max_latency=0.02, cache=None):
+        self._analyzer = analyzer
+        self.cache = cache
+        self._pending = {}
+        self.max_batch_size, self.max_latency = max_batch_size, max_latency
+        self._requests = queue.Queue()
+        self._thread = None
+        self._stopped = False
+        self.batches = 0
+        self.texts = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, name='sentiment-inference', daemon=True)
+        self._thread.start()
+        print(f"Sentiment inference service started (batch {self.max_batch_size} / {self.max_latency * 1000:.0f} ms).")
+
+    def stop(self):
+        """Stops the worker after its current batch and fails every request still waiting.
+
+        Blocks while the worker finishes (up to 5 s), so call it with asyncio.to_thread from the loop.
+        """
+        self._stopped = True
+        if self._thread:
+            self._requests.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+        while True:
+            try:
+                item = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                _, future, loop = item
+                loop.call_soon_threadsafe(_fail, future, RuntimeError("Sentiment inference service stopped"))
+
+    async def analyze(self, text):
+        if self.cache is None:
+            return await self._submit(text)
+
+        key = text_key(text)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = asyncio.ensure_future(self._submit(text))
+            future.add_done_callback(lambda f: self._cache_result(key, f))
+        return await asyncio.shield(future)
+
+    def _cache_result(self, key, future):
+        self._pending.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    async def _submit(self, text):
+        if self._stopped:
+            raise RuntimeError("Sentiment inference service stopped")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._requests.put((text, future, loop))
+        return await future
+
+    def _collect_batch(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._requests.put(None)  # Finish this batch, then stop.
+                break
+            batch.append(item)
+        return batch
+
+    def _worker(self):
+        while True:
+            first = self._requests.get()
+            if first is None:
+                return
+            batch = self._collect_batch(first)
+            texts = [text for text, _, _ in batch]
+            started = time.perf_counter()
+            try:
+                results = self._analyzer.analyze_batch(texts)
+            except Exception as e:
+                print(f"Error during batched FinBERT analysis ({len(texts)} texts): {e}. Falling back to single posts.")
+                results = [self._analyzer.analyze(text) for text in texts]
+            INFERENCE_SECONDS.observe(time.perf_counter() - started)
+            INFERENCE_TEXTS.inc(len(texts))
+            self.batches += 1
+            self.texts += len(texts)
+            for (_, future, loop), result in zip(batch, results):
+                loop.call_soon_threadsafe(_resolve, future, result)
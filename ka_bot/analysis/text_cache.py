@@ -0,0 +1,63 @@
+# ==============================================================================
+# File: text_cache.py
+# NEW FILE: Content-hash keyed LRU/TTL cache for per-text model results.
+# ==============================================================================
+import hashlib
+import time
+from collections import OrderedDict
+
+
+def text_key(text):
+    """Hash of the text with case and whitespace normalised.
+
+    FinBERT's tokenizer is uncased and splits on whitespace, so texts that only
+    differ in those respects score identically.
+    """
+    normalized = ' '.join(text.lower().split())
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+
+class TextCache:
+    """Size-bounded LRU cache with a per-entry time to live."""
+
+    def __init__(self, max_entries=20000, ttl_seconds=3600):
+        self.max_entries, self.ttl_seconds = max_entries, ttl_seconds
+        self._entries = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, ttl_seconds=None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
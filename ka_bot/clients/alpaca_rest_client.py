@@ -3,35 +3,56 @@
 # NEW FILE: Handles stock trading via Alpaca.
 # ==============================================================================
 import alpaca_trade_api as tradeapi
+from alpaca_trade_api.rest import APIError
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from services.order_router import RetryableOrderError
 
 class AlpacaRestClient:
-    def __init__(self, config):
+    def __init__(self, config, max_workers=4):
         self._config = config
         self.api = tradeapi.REST(
             key_id=self._config.APCA_API_KEY_ID,
             secret_key=self._config.APCA_API_SECRET_KEY,
             base_url=self._config.APCA_BASE_URL
         )
+        # The SDK is synchronous; orders get their own threads instead of the loop's default executor.
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='alpaca-orders')
         print("Trader Initialized (AlpacaRestClient).")
 
     def get_tradable_assets(self):
         try: return {asset.symbol for asset in self.api.list_assets(status='active')}
         except Exception as e: print(f"Could not fetch Alpaca assets: {e}"); return set()
 
-    async def place_order(self, symbol, qty, side, order_type, time_in_force):
+    async def place_order(self, symbol, order_type, side, qty, time_in_force='gtc', client_order_id=None, **kwargs):
+        """Same argument order as the other traders; returns the order, or None if Alpaca rejects it."""
         print(f"PLACING LIVE ALPACA ORDER: {side} {qty} of {symbol}...")
+        loop = asyncio.get_running_loop()
         try:
-            loop = asyncio.get_running_loop()
             return await loop.run_in_executor(
-                None,
-                self.api.submit_order,
-                symbol,
-                qty,
-                side,
-                order_type,
-                time_in_force,
+                self._executor,
+                lambda: self.api.submit_order(symbol, qty=qty, side=side, type=order_type,
+                                              time_in_force=time_in_force, client_order_id=client_order_id),
             )
-        except Exception as e:
-            print(f"Alpaca order failed: {e}")
+        except APIError as e:
+            if e.status_code == 429 or (e.status_code or 0) >= 500:
+                raise RetryableOrderError(str(e))
+            if client_order_id and e.status_code == 422 and 'client_order_id' in str(e):
+                # Alpaca refuses any repeated client_order_id: the order exists already.
+                print(f"Order {client_order_id} already exists on Alpaca.")
+                return await self.find_order(client_order_id)
+            print(f"Alpaca order rejected: {e}")
             return None
+
+    async def find_order(self, client_order_id):
+        """The order placed under client_order_id, or None if Alpaca has none."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self.api.get_order_by_client_order_id, client_order_id)
+        except APIError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -1,69 +1,187 @@
 # ==============================================================================
 # File: alpaca_ws_client.py
-# UPDATED: Added a robust reconnection loop and proper thread-safe async calls.
+# UPDATED: Runs the trade stream as a coroutine on the main loop by default; the
+#          thread mode hands trades over in batches. Backoff never blocks the loop.
 # ==============================================================================
 import alpaca_trade_api as tradeapi
 import time
 import asyncio
+import json
+import threading
+import websockets
+from services.metrics import MESSAGES_RECEIVED
+from services.tracing import start_trace
+from services.messages import MarketTick
+
+_received = MESSAGES_RECEIVED.labels('alpaca')
+
+STREAM_MODES = ('async', 'thread')
+MAX_BACKOFF = 60
 
 
 class AlpacaWsClient:
+    """Alpaca IEX trade stream.
+
+    ``async`` mode (``run_async``) speaks Alpaca's market data WebSocket
+    protocol (auth, subscribe, JSON trade messages) directly on the main event
+    loop, like KrakenWsClient, so trades go straight onto the data queue and
+    reconnects use the backoff below. ``tradeapi.Stream`` offers no public
+    coroutine, and its internal loop retries on its own without backing off.
+
+    ``thread`` mode (``run``) keeps ``tradeapi.Stream`` on its own thread and
+    loop; trades are buffered there and moved to the main loop in batches, one
+    wakeup per batch instead of one cross-thread future per trade.
+    """
+
     def __init__(self, initial_assets, data_queue, config, loop):
         self._config = config
         self._data_queue = data_queue
         self._subscribed_assets = set(initial_assets)
-        self._conn = None
+        self._conn = None  # thread mode: tradeapi.Stream
+        self._ws = None    # async mode: authenticated WebSocket
         self.loop = loop  # Store a reference to the main event loop
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._drain_scheduled = False
+        self._drains = set()
+        self.handoffs = self.reconnects = 0
 
-    async def _handle_trade_async(self, trade):
-        """Async handler expected by alpaca_trade_api.Stream."""
-        # Schedule putting the data on the main loop's queue since this handler
-        # runs in the Alpaca Stream's event loop.
-        asyncio.run_coroutine_threadsafe(
-            self._data_queue.put({
-                'type': 'market_data',
-                'source': 'alpaca',
-                'symbol': trade.symbol,
-                'price': trade.price,
-                'asset_class': 'stock'
-            }),
-            self.loop
+    def _new_stream(self):
+        return tradeapi.Stream(
+            key_id=self._config.APCA_API_KEY_ID,
+            secret_key=self._config.APCA_API_SECRET_KEY,
+            base_url=self._config.APCA_BASE_URL,
+            data_feed='iex'
         )
 
-    async def add_subscription(self, new_asset):
-        if new_asset not in self._subscribed_assets:
-            self._subscribed_assets.add(new_asset)
-            if self._conn:
-                print(f"Alpaca dynamically subscribing to {new_asset}")
-                # The library requires async handlers
-                self._conn.subscribe_trades(self._handle_trade_async, new_asset)
-            return True
-        return False
+    @staticmethod
+    def _retry_delay(error, backoff):
+        if isinstance(error, ValueError) and "connection limit exceeded" in str(error):
+            print("Alpaca connection limit exceeded. Waiting 60 seconds before retrying...")
+            return 60
+        print(f"An error occurred in Alpaca WS client: {error}. Retrying in {backoff}s.")
+        return backoff
 
-    def run(self):
-        print("Alpaca WS Client starting...")
+    # --- async mode -------------------------------------------------------
+
+    async def run_async(self):
+        print("Alpaca WS Client starting on the main event loop...")
+        backoff = 5
         while True:
             try:
-                self._conn = tradeapi.Stream(
-                    key_id=self._config.APCA_API_KEY_ID,
-                    secret_key=self._config.APCA_API_SECRET_KEY,
-                    base_url=self._config.APCA_BASE_URL,
-                    data_feed='iex'
-                )
+                async with websockets.connect(self._config.ALPACA_DATA_WS_URL, ping_interval=20,
+                                              ping_timeout=20) as ws:
+                    await self._authenticate(ws)
+                    self._ws, backoff = ws, 5
+                    print(f"Alpaca stream connected ({len(self._subscribed_assets)} symbols).")
+                    if self._subscribed_assets:
+                        await self._subscribe(ws, sorted(self._subscribed_assets))
+                    await self._read(ws)
+                delay = backoff
+                print("Alpaca stream closed.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = self._retry_delay(e, backoff)
+            finally:
+                self._ws = None
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            backoff = min(MAX_BACKOFF, backoff * 2)
 
-                if self._subscribed_assets:
-                    for asset in list(self._subscribed_assets):
-                        self._conn.subscribe_trades(self._handle_trade_async, asset)
+    async def _authenticate(self, ws, timeout=10):
+        await ws.send(json.dumps({"action": "auth", "key": self._config.APCA_API_KEY_ID,
+                                  "secret": self._config.APCA_API_SECRET_KEY}))
+        while True:
+            for msg in json.loads(await asyncio.wait_for(ws.recv(), timeout)):
+                if msg.get('T') == 'success' and msg.get('msg') == 'authenticated':
+                    return
+                if msg.get('T') == 'error':
+                    # Same message text as tradeapi.Stream, e.g. "connection limit exceeded".
+                    raise ValueError(msg.get('msg', 'authentication failed'))
 
-                self._conn.run()
+    @staticmethod
+    async def _subscribe(ws, symbols):
+        await ws.send(json.dumps({"action": "subscribe", "trades": symbols}))
+
+    async def _read(self, ws):
+        put = self._data_queue.put
+        async for message in ws:
+            for msg in json.loads(message):
+                kind = msg.get('T')
+                if kind == 't':
+                    _received.inc()
+                    await put(MarketTick(msg['S'], float(msg['p']), 'stock', 'alpaca', start_trace()))
+                elif kind == 'error':
+                    print(f"Alpaca stream error: {msg.get('code')} {msg.get('msg')}")
+
+    # --- thread mode ------------------------------------------------------
 
-            except ValueError as e:
-                if "connection limit exceeded" in str(e):
-                    print("Alpaca connection limit exceeded. Waiting 60 seconds before retrying...")
-                    time.sleep(60)
-                else:
-                    print(f"Alpaca WS value error: {e}. Retrying in 10s.")
-                    time.sleep(10)
+    async def _buffer_trade(self, trade):
+        """Handler on the Stream's own loop: buffer, and wake the main loop once per batch."""
+        _received.inc()
+        tick = MarketTick(trade.symbol, trade.price, 'stock', 'alpaca', start_trace())
+        with self._buffer_lock:
+            self._buffer.append(tick)
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        self.loop.call_soon_threadsafe(self._start_drain)
+
+    def _start_drain(self):
+        # The loop only keeps a weak reference to tasks; hold one until the drain is done.
+        task = self.loop.create_task(self._drain())
+        self._drains.add(task)
+        task.add_done_callback(self._drains.discard)
+
+    async def _drain(self):
+        # Only one drain runs at a time; it keeps going until the buffer is empty,
+        # so trades reach the queue in arrival order even if a put has to wait.
+        while True:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+                if not batch:
+                    self._drain_scheduled = False
+                    return
+            self.handoffs += 1
+            for tick in batch:
+                await self._data_queue.put(tick)
+
+    def run(self):
+        print("Alpaca WS Client starting on its own thread...")
+        backoff = 5
+        while True:
+            try:
+                self._conn = self._new_stream()
+                for asset in list(self._subscribed_assets):
+                    self._conn.subscribe_trades(self._buffer_trade, asset)
+                # Stream.run() reconnects internally; only errors that escape it reach the backoff.
+                self._conn.run()
+                backoff = 5
             except Exception as e:
-                print(f"An unexpected error occurred in Alpaca WS client: {e}. Retrying in 10s.")
-                time.sleep(10)
\ No newline at end of file
+                time.sleep(self._retry_delay(e, backoff))  # Only this thread waits.
+                backoff = min(MAX_BACKOFF, backoff * 2)
+
+    # ----------------------------------------------------------------------
+
+    async def add_subscription(self, new_asset):
+        if new_asset not in self._subscribed_assets:
+            self._subscribed_assets.add(new_asset)
+            if self._ws:
+                print(f"Alpaca dynamically subscribing to {new_asset}")
+                try:
+                    await self._subscribe(self._ws, [new_asset])
+                except websockets.exceptions.ConnectionClosed:
+                    pass  # The reconnect subscribes every symbol.
+            elif self._conn:
+                print(f"Alpaca dynamically subscribing to {new_asset}")
+                # subscribe_trades blocks until the Stream's loop has sent the request;
+                # wait for it on a worker thread so the main loop keeps running.
+                await asyncio.to_thread(self._conn.subscribe_trades, self._buffer_trade, new_asset)
+            return True
+        return False
+
+    def stats(self):
+        return {'mode': self._config.ALPACA_STREAM_MODE, 'subscribed': len(self._subscribed_assets),
+                'connected': self._ws is not None or self._conn is not None, 'reconnects': self.reconnects,
+                'batched_handoffs': self.handoffs}
@@ -0,0 +1,60 @@
+# ==============================================================================
+# File: http_client.py
+# NEW FILE: One long-lived aiohttp session shared by the REST and feed clients.
+# ==============================================================================
+from collections import Counter
+from urllib.parse import urlsplit
+
+import aiohttp
+
+
+class SharedHttpClient:
+    """Keep-alive connection pool for every outbound HTTP request.
+
+    Connections are reused across requests and clients, so repeated calls to
+    the same host skip the TCP/TLS handshake. The pool is capped overall
+    (``limit``) and per host (``limit_per_host``), DNS answers are cached for
+    ``dns_cache_ttl`` seconds, and every request gets ``timeout`` seconds in
+    total (``connect_timeout`` to connect) unless it passes its own.
+    The session is created on first use, inside the running event loop.
+    """
+
+    def __init__(self, limit=100, limit_per_host=20, dns_cache_ttl=300, keepalive_timeout=60, timeout=30,
+                 connect_timeout=5):
+        self._connector_args = dict(limit=limit, limit_per_host=limit_per_host, ttl_dns_cache=dns_cache_ttl,
+                                    keepalive_timeout=keepalive_timeout)
+        self._timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self._session = None
+        self.requests = Counter()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.HTTP_POOL_LIMIT, config.HTTP_POOL_LIMIT_PER_HOST, config.HTTP_DNS_CACHE_TTL,
+                   config.HTTP_KEEPALIVE_SECONDS, config.HTTP_TIMEOUT_SECONDS, config.HTTP_CONNECT_TIMEOUT_SECONDS)
+
+    @property
+    def session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(**self._connector_args),
+                                                  timeout=self._timeout)
+        return self._session
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """Use as ``async with http.request(...) as resp``; ``timeout`` is total seconds."""
+        self.requests[urlsplit(url).hostname] += 1
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout, connect=self._timeout.connect)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def stats(self):
+        return {'requests_by_host': dict(self.requests), 'open': self._session is not None and not self._session.closed}
@@ -2,12 +2,28 @@
 # File: kraken_rest_client.py
 # UPDATED: Added a method for public GET requests.
 # ==============================================================================
-import time, hmac, hashlib, base64, urllib.parse, aiohttp
+import time, hmac, hashlib, base64, urllib.parse
+from clients.http_client import SharedHttpClient
+from services.order_router import RetryableOrderError
+
+# Kraken error prefixes that mean "try again later" rather than "this order is invalid".
+# An invalid nonce means the request was refused unread (it overtook a later-signed
+# one on another connection), so it is safe to send again with a fresh nonce.
+RETRYABLE_ERRORS = ('EAPI:Rate limit exceeded', 'EService:', 'EGeneral:Temporary lockout', 'EOrder:Rate limit exceeded',
+                    'EAPI:Invalid nonce')
+# cl_ord_id is only unique among open orders; a repeat of one still open is refused.
+DUPLICATE_ORDER_ERRORS = ('EOrder:Duplicate',)
+
+
+class DuplicateOrderError(Exception):
+    pass
 
 
 class KrakenRestClient:
-    def __init__(self, config):
+    def __init__(self, config, http=None):
         self._config, self.api_key, self.private_key, self.base_url = config, config.KRAKEN_API_KEY, config.KRAKEN_PRIVATE_KEY, config.KRAKEN_REST_URL
+        self._http = http or SharedHttpClient()
+        self._last_nonce = 0
         print("Trader Initialized (KrakenRestClient).")
 
     def _get_kraken_signature(self, urlpath, data):
@@ -17,23 +33,31 @@ class KrakenRestClient:
         mac = hmac.new(base64.b64decode(self.private_key), message, hashlib.sha512)
         return base64.b64encode(mac.digest()).decode()
 
+    def _next_nonce(self):
+        """Millisecond timestamp, bumped so that concurrent requests never share or reuse one."""
+        self._last_nonce = max(self._last_nonce + 1, int(time.time() * 1000))
+        return self._last_nonce
+
     async def _private_request(self, uri_path, data=None):
         data = data or {}
-        data['nonce'] = str(int(time.time() * 1000))
+        data['nonce'] = str(self._next_nonce())
         headers = {'API-Key': self.api_key, 'API-Sign': self._get_kraken_signature(uri_path, data)}
-        async with aiohttp.ClientSession() as session:
-            async with session.post(self.base_url + uri_path, headers=headers, data=data) as resp:
-                result = await resp.json()
-                if result.get('error'): print(f"API Error: {result['error']}"); return None
-                return result.get('result')
+        async with self._http.post(self.base_url + uri_path, headers=headers, data=data,
+                                   timeout=self._config.KRAKEN_ORDER_TIMEOUT_SECONDS) as resp:
+            result = await resp.json()
+            errors = result.get('error')
+            if errors:
+                if any(e.startswith(RETRYABLE_ERRORS) for e in errors): raise RetryableOrderError(errors)
+                if any(e.startswith(DUPLICATE_ORDER_ERRORS) for e in errors): raise DuplicateOrderError(errors)
+                print(f"API Error: {errors}"); return None
+            return result.get('result')
 
     async def _public_request(self, uri_path, data=None):
         url = self.base_url + uri_path
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=data) as resp:
-                result = await resp.json()
-                if result.get('error'): return None
-                return result.get('result')
+        async with self._http.get(url, params=data) as resp:
+            result = await resp.json()
+            if result.get('error'): return None
+            return result.get('result')
 
     async def get_tradable_asset_pairs(self):
         return await self._public_request('/0/public/AssetPairs')
@@ -42,7 +66,23 @@ class KrakenRestClient:
         print("Fetching account balance...")
         return await self._private_request('/0/private/Balance')
 
-    async def place_order(self, pair, order_type, side, volume, **kwargs):
+    async def place_order(self, pair, order_type, side, volume, client_order_id=None, **kwargs):
         print(f"PLACING ORDER: {side} {volume} of {pair}...")
-        return await self._private_request('/0/private/AddOrder',
-                                           {'pair': pair, 'type': side, 'ordertype': order_type, 'volume': str(volume)})
+        data = {'pair': pair, 'type': side, 'ordertype': order_type, 'volume': str(volume)}
+        if client_order_id:
+            data['cl_ord_id'] = client_order_id
+        try:
+            return await self._private_request('/0/private/AddOrder', data)
+        except DuplicateOrderError:
+            print(f"Order {client_order_id} is already open on Kraken.")
+            return await self.find_order(client_order_id)
+
+    async def find_order(self, client_order_id):
+        """The open or closed order placed under client_order_id, or None if Kraken has none."""
+        for uri_path, key in (('/0/private/OpenOrders', 'open'), ('/0/private/ClosedOrders', 'closed')):
+            result = await self._private_request(uri_path, {'cl_ord_id': client_order_id})
+            if result is None:
+                raise RuntimeError(f"Kraken {uri_path} lookup of {client_order_id} failed")
+            for txid, order in (result.get(key) or {}).items():
+                return {'txid': [txid], **order}
+        return None
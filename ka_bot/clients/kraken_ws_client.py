@@ -1,59 +1,159 @@
 # ==============================================================================
 # File: kraken_ws_client.py
-# UPDATED: Added keepalive ping settings to the WebSocket connection.
+# UPDATED: Shards pairs across several WebSocket connections, each with its own
+#          batched subscribes and independent reconnect/backoff.
 # ==============================================================================
-import asyncio, websockets, json
-from datetime import datetime, timezone
+import asyncio, websockets, json, random, zlib
+from services.metrics import MESSAGES_RECEIVED
+from services.tracing import start_trace
+from services.messages import MarketTick
 
+try:  # Optional: orjson parses ticker frames several times faster than the stdlib.
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
-class KrakenWsClient:
-    def __init__(self, initial_assets, data_queue, config):
-        self._config, self._url, self._subscribed_assets, self._data_queue, self._connection = config, config.KRAKEN_WS_URL, set(
-            initial_assets), data_queue, None
+_received = MESSAGES_RECEIVED.labels('kraken')
+
+SUBSCRIBE_BATCH = 100       # symbols per subscribe request
+SUBSCRIBE_DELAY = 0.05      # seconds to gather dynamically added pairs into one request
+SUBSCRIBE_RETRY_DELAY = 1   # seconds before a failed subscribe request is re-queued
+MAX_BACKOFF = 30
+
+
+class _KrakenShard:
+    """One WebSocket connection and the pairs hashed to it."""
+
+    def __init__(self, index, url, data_queue):
+        self.index, self._url, self._data_queue = index, url, data_queue
+        self.assets = set()
+        self._connection = None
+        self._pending = set()
+        self._flush_timer = None
+        self._subscribes = set()
+        self.connected = False
+        self.reconnects = self.messages = self.subscribe_errors = 0
+
+    def add(self, asset):
+        """Queues a subscribe; pairs added within SUBSCRIBE_DELAY go out in one request."""
+        self.assets.add(asset)
+        if self._connection is None:
+            return  # Subscribed with everything else once connected.
+        self._pending.add(asset)
+        if len(self._pending) >= SUBSCRIBE_BATCH:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(SUBSCRIBE_DELAY, self._flush)
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        pending, self._pending = sorted(self._pending), set()
+        if pending and self._connection is not None:
+            task = asyncio.get_running_loop().create_task(self._subscribe(self._connection, pending))
+            self._subscribes.add(task)
+            task.add_done_callback(lambda t: self._subscribe_done(t, pending))
 
-    async def connect(self):
+    def _subscribe_done(self, task, assets):
+        self._subscribes.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+        self.subscribe_errors += 1
+        print(f"Kraken shard {self.index} failed to subscribe {len(assets)} pairs: {task.exception()!r}. Retrying.")
+        asyncio.get_running_loop().call_later(SUBSCRIBE_RETRY_DELAY, self._requeue, assets)
+
+    def _requeue(self, assets):
+        # add() leaves them to the reconnect if the connection has gone meanwhile.
+        for asset in assets:
+            self.add(asset)
+
+    async def _subscribe(self, connection, assets):
         try:
-            # Added ping_interval and ping_timeout to maintain connection
-            self._connection = await websockets.connect(
-                self._url,
-                ping_interval=20,
-                ping_timeout=20
-            )
-            print("Successfully connected to Kraken WebSocket API with keepalive.")
-            if self._subscribed_assets: await self.subscribe(list(self._subscribed_assets))
-        except Exception as e:
-            print(f"Error connecting to Kraken WebSocket: {e}")
+            for i in range(0, len(assets), SUBSCRIBE_BATCH):
+                chunk = assets[i:i + SUBSCRIBE_BATCH]
+                msg = {"method": "subscribe", "params": {"channel": "ticker", "symbol": chunk}}
+                await connection.send(json.dumps(msg))
+            print(f"Kraken shard {self.index} subscribed to {len(assets)} pairs")
+        except websockets.exceptions.ConnectionClosed:
+            pass  # The reconnect resubscribes this shard's pairs.
+
+    async def run(self):
+        backoff = 1
+        while True:
+            try:
+                async with websockets.connect(self._url, ping_interval=20, ping_timeout=20) as connection:
+                    self._connection, self.connected, backoff = connection, True, 1
+                    print(f"Kraken shard {self.index} connected ({len(self.assets)} pairs).")
+                    if self.assets:
+                        await self._subscribe(connection, sorted(self.assets))
+                    await self._read(connection)
+            except websockets.exceptions.ConnectionClosed:
+                print(f"Kraken shard {self.index} connection closed.")
+            except Exception as e:
+                print(f"Critical error in Kraken shard {self.index}: {e}.")
+            finally:
+                self._connection, self.connected = None, False
+                self._pending.clear()
+                for task in self._subscribes:
+                    task.cancel()
+
+            self.reconnects += 1
+            delay = backoff * random.uniform(0.5, 1.5)  # Jitter keeps shards from reconnecting in lockstep.
+            print(f"Kraken shard {self.index} reconnecting in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+            backoff = min(MAX_BACKOFF, backoff * 2)
+
+    async def _read(self, connection):
+        put = self._data_queue.put
+        async for message in connection:
+            _received.inc()
+            self.messages += 1
+            trace = start_trace()
+            data = _loads(message)
+            if data.get('channel') == 'ticker' and 'data' in data:
+                # Snapshots and batched updates carry one entry per pair.
+                for entry in data['data']:
+                    await put(MarketTick(entry['symbol'], float(entry['last']), 'crypto', 'kraken', dict(trace)))
+
+    def stats(self):
+        return {'connected': self.connected, 'pairs': len(self.assets), 'messages': self.messages,
+                'reconnects': self.reconnects, 'subscribe_errors': self.subscribe_errors}
+
+
+class KrakenWsClient:
+    """Kraken v2 ticker stream over ``KRAKEN_WS_CONNECTIONS`` connections.
+
+    Pairs are spread across the connections by a stable hash, so a dropped
+    connection only interrupts (and resubscribes) its own share of pairs.
+    """
+
+    def __init__(self, initial_assets, data_queue, config, url=None, connections=None):
+        self._config, self._url, self._data_queue = config, url or config.KRAKEN_WS_URL, data_queue
+        count = connections or config.KRAKEN_WS_CONNECTIONS
+        self._shards = [_KrakenShard(i, self._url, data_queue) for i in range(max(1, count))]
+        self._subscribed_assets = set()
+        for asset in initial_assets:
+            self._subscribed_assets.add(asset)
+            self._shard_for(asset).add(asset)
+
+    def _shard_for(self, asset):
+        return self._shards[zlib.crc32(asset.encode()) % len(self._shards)]
 
     async def subscribe(self, assets_to_sub):
-        if not self._connection or not assets_to_sub: return
-        msg = {"method": "subscribe", "params": {"channel": "ticker", "symbol": assets_to_sub}}
-        await self._connection.send(json.dumps(msg))
-        print(f"Kraken subscribed to: {assets_to_sub}")
+        for asset in assets_to_sub:
+            self._subscribed_assets.add(asset)
+            self._shard_for(asset).add(asset)
 
     async def add_subscription(self, new_asset):
         if new_asset not in self._subscribed_assets:
-            self._subscribed_assets.add(new_asset)
             print(f"Kraken dynamically subscribing to {new_asset}")
-            await self.subscribe([new_asset]);
+            await self.subscribe([new_asset])
             return True
         return False
 
     async def listen(self):
-        while True:
-            try:
-                if not self._connection or self._connection.closed:
-                    await self.connect()
-
-                async for message in self._connection:
-                    data = json.loads(message)
-                    if data.get('channel') == 'ticker' and 'data' in data:
-                        price, symbol = float(data['data'][0]['last']), data['data'][0]['symbol']
-                        await self._data_queue.put(
-                            {'type': 'market_data', 'source': 'kraken', 'symbol': symbol, 'price': price,
-                             'asset_class': 'crypto'})
-            except websockets.exceptions.ConnectionClosed:
-                print(f"Kraken WS connection closed. Reconnecting in 5 seconds...")
-            except Exception as e:
-                print(f"Critical error in Kraken listener: {e}. Reconnecting in 5 seconds...")
+        await asyncio.gather(*(shard.run() for shard in self._shards))
 
-            await asyncio.sleep(5)
\ No newline at end of file
+    def stats(self):
+        return {f"shard_{shard.index}": shard.stats() for shard in self._shards}
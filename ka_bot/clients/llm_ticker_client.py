@@ -0,0 +1,148 @@
+# ==============================================================================
+# File: llm_ticker_client.py
+# NEW FILE: Batched, pooled and cached Gemini client for ticker extraction.
+# ==============================================================================
+import asyncio
+import json
+
+import aiohttp
+
+from analysis.text_cache import TextCache, text_key
+from clients.http_client import SharedHttpClient
+
+RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "results": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {"index": {"type": "INTEGER"}, "tickers": {"type": "ARRAY", "items": {"type": "STRING"}}},
+                "required": ["index", "tickers"],
+            },
+        }
+    },
+}
+
+
+def build_prompt(texts):
+    posts = "\n".join(f"[{i}] {' '.join(text.split())}" for i, text in enumerate(texts))
+    return ("For each numbered post below, extract potential stock tickers (like 'TSLA', 'AAPL') and crypto "
+            "tickers (like 'BTC', 'ETH'). Ignore common words. Return one result per post with its index; "
+            "use an empty list when a post has none.\n\n" + posts)
+
+
+class LlmTickerClient:
+    """Extracts tickers with Gemini, many posts per request.
+
+    ``extract`` queues a post and awaits its tickers. Queued posts are sent
+    together once ``max_batch_size`` are waiting or ``max_latency`` seconds have
+    passed, using a structured per-post response schema. Requests go through
+    the shared HTTP client (or a private one), at most ``max_concurrency`` are in flight, 429/5xx
+    responses and transport errors (connection failures, timeouts) are retried
+    with exponential backoff (honouring Retry-After), and answers are cached by
+    text hash. A request waiting out its backoff does not hold a concurrency slot.
+    """
+
+    def __init__(self, config, api_url=None, max_batch_size=20, max_latency=0.5, max_concurrency=4,
+                 max_retries=5, cache=None, timeout=30, http=None):
+        self._url = api_url or (f"{config.GEMINI_API_URL}/v1beta/models/{config.GEMINI_MODEL}:generateContent"
+                                f"?key={config.GEMINI_API_KEY}")
+        self.max_batch_size, self.max_latency, self.max_retries = max_batch_size, max_latency, max_retries
+        self.cache = cache if cache is not None else TextCache(max_entries=50000, ttl_seconds=24 * 3600)
+        self._timeout = timeout
+        self._owns_http = http is None
+        self._http = http or SharedHttpClient(limit_per_host=max_concurrency, timeout=timeout)
+        self._max_concurrency = max_concurrency
+        self._semaphore = None
+        self._batch = []
+        self._flush_timer = None
+        self._pending = {}
+        self._tasks = set()
+        self.stats = {'requests': 0, 'posts': 0, 'retries': 0, 'errors': 0}
+
+    async def close(self):
+        if self._batch:
+            self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._owns_http:
+            await self._http.close()
+
+    async def extract(self, text):
+        key = text_key(text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = asyncio.get_running_loop().create_future()
+            self._batch.append((text, key, future))
+            if len(self._batch) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_timer is None:
+                self._flush_timer = asyncio.get_running_loop().call_later(self.max_latency, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._batch = self._batch, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, batch):
+        texts = [text for text, _, _ in batch]
+        results = None
+        try:
+            results = await self._request(texts)
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"LLM_TICKER_ERROR: Batch of {len(texts)} posts failed: {e}")
+        for i, (_, key, future) in enumerate(batch):
+            self._pending.pop(key, None)
+            tickers = results.get(i, []) if results is not None else []
+            if results is not None:
+                self.cache.put(key, tickers)
+            if not future.done():
+                future.set_result(tickers)
+
+    async def _request(self, texts):
+        payload = {"contents": [{"role": "user", "parts": [{"text": build_prompt(texts)}]}],
+                   "generationConfig": {"responseMimeType": "application/json", "responseSchema": RESPONSE_SCHEMA}}
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            async with self._semaphore:
+                self.stats['requests'] += 1
+                try:
+                    async with self._http.post(self._url, json=payload, timeout=self._timeout) as resp:
+                        if resp.status == 200:
+                            body = await resp.json()
+                            self.stats['posts'] += len(texts)
+                            return self._parse(body, len(texts))
+                        if resp.status != 429 and resp.status < 500:
+                            raise RuntimeError(f"HTTP {resp.status}: {(await resp.text())[:200]}")
+                        retry_after = resp.headers.get('Retry-After')
+                        failure = f"HTTP {resp.status}"
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    failure = f"{type(e).__name__}: {e}"
+            if attempt == self.max_retries:
+                raise RuntimeError(f"{failure} after {self.max_retries} retries")
+            self.stats['retries'] += 1
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else min(30.0, 0.5 * 2 ** attempt)
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _parse(body, count):
+        text = body['candidates'][0]['content']['parts'][0]['text']
+        results = {}
+        for item in json.loads(text).get('results', []):
+            index = item.get('index')
+            if isinstance(index, int) and 0 <= index < count:
+                results[index] = [t for t in item.get('tickers', []) if isinstance(t, str)]
+        return results
@@ -1,49 +1,120 @@
 # ==============================================================================
 # File: news_client.py
-# NEW FILE: Fetches financial news headlines via RSS.
+# UPDATED: Polls all feeds concurrently with conditional GETs, parses off the
+#          event loop, and dedups links in a bounded, persisted, expiring cache.
 # ==============================================================================
 import asyncio
-import aiohttp
+import hashlib
+from datetime import datetime, timezone
 import feedparser
+from analysis.text_cache import TextCache
+from clients.http_client import SharedHttpClient
+from services.metrics import MESSAGES_RECEIVED
+from services.tracing import start_trace
+from services.messages import NewsPost
+
+_received = MESSAGES_RECEIVED.labels('news')
+
+DEFAULT_FEEDS = (
+    "https://feeds.marketwatch.com/marketwatch/topstories/",
+    "https://finance.yahoo.com/rss/topstories",
+)
+
+
+def link_key(link):
+    return hashlib.blake2b(link.encode('utf-8'), digest_size=16).digest()
 
 
 class FinancialNewsClient:
-    """Simple RSS-based news fetcher."""
+    """RSS-based news fetcher.
+
+    Each round requests every feed at once, sending the ETag/Last-Modified
+    from the previous response so unchanged feeds answer 304 with no body.
+    Links already seen (kept for ``dedup_ttl`` seconds, at most
+    ``dedup_max_entries``) are skipped. New ones count as seen, and are
+    recorded in seen_news so a restart does not replay them, only once their
+    posts are stored; until then the feed's validators are not updated either,
+    so a failed insert is retried on the next poll.
+    """
 
-    def __init__(self, data_queue, db_manager):
+    def __init__(self, data_queue, db_manager, http=None, feeds=None, dedup_max_entries=100000,
+                 dedup_ttl=3 * 24 * 3600):
         self._queue = data_queue
         self._db = db_manager
-        self._feeds = [
-            "https://feeds.marketwatch.com/marketwatch/topstories/",
-            "https://finance.yahoo.com/rss/topstories",
-        ]
-        self._seen_links = set()
+        self._http = http or SharedHttpClient()
+        self._feeds = list(feeds or DEFAULT_FEEDS)
+        self._validators = {}  # url -> conditional GET headers from the last 200
+        self._seen = TextCache(dedup_max_entries, dedup_ttl)
+        self._claimed = set()  # keys another feed is storing right now
+        self.counts = dict.fromkeys(('fetched', 'not_modified', 'errors', 'new_articles'), 0)
         print("Financial News client initialized.")
 
+    async def _load_seen(self):
+        rows = await self._db.load_seen_news(self._seen.ttl_seconds)
+        for key, age in rows:
+            self._seen.put(key, True, ttl_seconds=self._seen.ttl_seconds - age)
+        print(f"News client restored {len(rows)} recently seen links.")
+
     async def poll(self, interval=300):
         """Periodically fetches RSS feeds and posts new articles."""
+        try:
+            await self._load_seen()
+        except Exception as e:
+            print(f"NEWS_CLIENT_ERROR: Could not restore seen links: {e}")
         while True:
-            for url in self._feeds:
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url) as resp:
-                            text = await resp.text()
-                    feed = feedparser.parse(text)
-                    for entry in feed.entries:
-                        link = entry.get("link")
-                        if link in self._seen_links:
-                            continue
-                        self._seen_links.add(link)
-                        title = entry.get("title", "")
-                        summary = entry.get("summary", "")
-                        content = f"{title}. {summary}"
-                        self._db.execute_query(
-                            "INSERT INTO social_posts (source, content, author, subreddit) VALUES (%s, %s, %s, %s);",
-                            ("news", content, None, None),
-                        )
-                        post_id = self._db.execute_query("SELECT lastval();", fetch="one")[0]
-                        if post_id:
-                            await self._queue.put({"type": "news_post", "text": content, "post_id": post_id})
-                except Exception as e:
-                    print(f"NEWS_CLIENT_ERROR: {e}")
+            await asyncio.gather(*(self._poll_feed(url) for url in self._feeds))
             await asyncio.sleep(interval)
+
+    async def _poll_feed(self, url):
+        try:
+            async with self._http.get(url, headers=self._validators.get(url, {})) as resp:
+                if resp.status == 304:
+                    self.counts['not_modified'] += 1
+                    return
+                resp.raise_for_status()
+                text = await resp.text()
+                validators = {}
+                if resp.headers.get('ETag'):
+                    validators['If-None-Match'] = resp.headers['ETag']
+                if resp.headers.get('Last-Modified'):
+                    validators['If-Modified-Since'] = resp.headers['Last-Modified']
+            self.counts['fetched'] += 1
+            fetched = start_trace()
+            feed = await asyncio.to_thread(feedparser.parse, text)
+
+            new = {}  # link key -> content, in feed order
+            for entry in feed.entries:
+                link = entry.get("link") or entry.get("title")
+                if not link:
+                    continue
+                key = link_key(link)
+                if key in new or key in self._claimed or self._seen.get(key) is not None:
+                    continue
+                title = entry.get("title", "")
+                summary = entry.get("summary", "")
+                new[key] = f"{title}. {summary}"
+            if new:
+                contents = list(new.values())
+                self._claimed.update(new)
+                try:
+                    post_ids = await self._db.ingest_posts([("news", content, None, None) for content in contents])
+                finally:
+                    self._claimed.difference_update(new)
+                if len(post_ids) != len(contents):
+                    # Nothing is marked seen and the validators are kept, so the next poll retries these.
+                    raise RuntimeError(f"stored {len(post_ids)} of {len(contents)} new articles")
+                now = datetime.now(timezone.utc)
+                for key in new:
+                    self._seen.put(key, True)
+                    self._db.writer.put('seen_news', (key, now))
+                _received.inc(len(contents))
+                self.counts['new_articles'] += len(contents)
+                for content, post_id in zip(contents, post_ids):
+                    await self._queue.put(NewsPost(content, post_id, dict(fetched)))
+            self._validators[url] = validators
+        except Exception as e:
+            self.counts['errors'] += 1
+            print(f"NEWS_CLIENT_ERROR: {url}: {e}")
+
+    def stats(self):
+        return {**self.counts, 'feeds': len(self._feeds), 'seen_links': len(self._seen)}
@@ -1,25 +1,114 @@
 # ==============================================================================
 # File: reddit_client.py
+# UPDATED: Buffers comments into size/time-bounded batches, drops repeats by
+#          comment id, and reconnects in a loop with backoff.
 # ==============================================================================
 import asyncio
 
 import asyncpraw
+from analysis.text_cache import TextCache
+from services.metrics import MESSAGES_RECEIVED
+from services.tracing import start_trace
+from services.messages import SocialPost
+
+_received = MESSAGES_RECEIVED.labels('reddit')
+
+INITIAL_BACKOFF = 5
+MAX_BACKOFF = 300
+
 
 class RedditClient:
-    def __init__(self, data_queue, config, db_manager, subreddits):
+    """Streams comments from the monitored subreddits.
+
+    Comments are buffered and written with one ``ingest_posts`` call per
+    batch (``batch_size`` comments or ``batch_seconds`` after the first, whichever
+    comes first), then queued together. While ``max_buffered`` comments are
+    waiting (e.g. behind a slow ``ingest_posts``), reading the stream pauses.
+    Comment ids seen recently are remembered (bounded, ``dedup_size``) so a
+    reconnect that replays the stream's tail does not store or score a
+    comment twice.
+    """
+
+    def __init__(self, data_queue, config, db_manager, subreddits, reddit=None):
         self._config, self._data_queue, self._db, self.subreddits_to_monitor = config, data_queue, db_manager, subreddits
-        self.reddit = asyncpraw.Reddit(client_id=config.REDDIT_CLIENT_ID, client_secret=config.REDDIT_CLIENT_SECRET, user_agent=config.REDDIT_USER_AGENT)
+        self.reddit = reddit or asyncpraw.Reddit(client_id=config.REDDIT_CLIENT_ID, client_secret=config.REDDIT_CLIENT_SECRET, user_agent=config.REDDIT_USER_AGENT)
+        self.batch_size, self.batch_seconds = config.REDDIT_BATCH_SIZE, config.REDDIT_BATCH_SECONDS
+        self._seen_ids = TextCache(config.REDDIT_DEDUP_SIZE, ttl_seconds=24 * 3600)
+        self.max_buffered = config.REDDIT_MAX_BUFFERED
+        self._buffer = []
+        self._wake = self._room = None
+        self._closing = False
+        self.counts = dict.fromkeys(('comments', 'duplicates', 'batches', 'reconnects', 'failed_batches', 'stalls'), 0)
         print("Reddit client initialized.")
 
     async def stream_comments(self):
+        self._wake, self._room = asyncio.Event(), asyncio.Event()
+        self._closing = False
+        flusher = asyncio.ensure_future(self._flush_loop())
+        try:
+            await self._read_loop()
+        finally:
+            # The flusher does the final flush itself, so a batch it is in the middle of storing is not lost.
+            self._closing = True
+            self._wake.set()
+            await flusher
+
+    async def _read_loop(self):
         subreddits_str = "+".join(self.subreddits_to_monitor)
         print(f"Starting to stream comments from subreddits: {subreddits_str}")
-        try:
-            subreddit = await self.reddit.subreddit(subreddits_str)
-            async for comment in subreddit.stream.comments(skip_existing=True):
-                author, subreddit_name, content = (comment.author.name if comment.author else "[deleted]"), comment.subreddit.display_name, comment.body
-                self._db.execute_query("INSERT INTO social_posts (source, content, author, subreddit) VALUES (%s, %s, %s, %s);", ('reddit', content, author, subreddit_name))
-                post_id = self._db.execute_query("SELECT lastval();", fetch='one')[0]
-                if post_id: await self._data_queue.put({'type': 'social_post', 'text': content, 'post_id': post_id})
-        except Exception as e:
-            print(f"Error in Reddit stream: {e}. Restarting..."); await asyncio.sleep(30); await self.stream_comments()
\ No newline at end of file
+        backoff = INITIAL_BACKOFF
+        while True:
+            try:
+                subreddit = await self.reddit.subreddit(subreddits_str)
+                async for comment in subreddit.stream.comments(skip_existing=True):
+                    backoff = INITIAL_BACKOFF
+                    await self._add(comment)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counts['reconnects'] += 1
+                print(f"Error in Reddit stream: {e}. Reconnecting in {backoff}s...")
+                await asyncio.sleep(backoff)
+                backoff = min(MAX_BACKOFF, backoff * 2)
+
+    async def _add(self, comment):
+        _received.inc()
+        if self._seen_ids.get(comment.id) is not None:
+            self.counts['duplicates'] += 1
+            return
+        self._seen_ids.put(comment.id, True)
+        self.counts['comments'] += 1
+        author = comment.author.name if comment.author else "[deleted]"
+        self._buffer.append((comment.subreddit.display_name, author, comment.body, start_trace()))
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+        if len(self._buffer) >= self.max_buffered:
+            self.counts['stalls'] += 1
+            while len(self._buffer) >= self.max_buffered:
+                self._room.clear()
+                await self._room.wait()
+
+    async def _flush_loop(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.batch_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self._flush()
+
+    async def _flush(self):
+        while self._buffer:
+            batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+            self._room.set()
+            post_ids = await self._db.ingest_posts([('reddit', body, author, sub) for sub, author, body, _ in batch])
+            if len(post_ids) != len(batch):
+                self.counts['failed_batches'] += 1
+                print(f"REDDIT_CLIENT_ERROR: Could not store a batch of {len(batch)} comments.")
+                continue
+            self.counts['batches'] += 1
+            for (_, _, body, trace), post_id in zip(batch, post_ids):
+                await self._data_queue.put(SocialPost(body, post_id, trace))
+
+    def stats(self):
+        return {**self.counts, 'buffered': len(self._buffer)}
@@ -13,20 +13,57 @@ class Config:
     KRAKEN_PRIVATE_KEY = os.getenv("KRAKEN_PRIVATE_KEY")
     KRAKEN_REST_URL = "https://api.kraken.com"
     KRAKEN_WS_URL = "wss://ws.kraken.com/v2"
+    KRAKEN_WS_CONNECTIONS = int(os.getenv("KRAKEN_WS_CONNECTIONS", 1))  # pairs are sharded across connections
 
     APCA_API_KEY_ID = os.getenv("APCA_API_KEY_ID")
     APCA_API_SECRET_KEY = os.getenv("APCA_API_SECRET_KEY")
+    ALPACA_STREAM_MODE = os.getenv("ALPACA_STREAM_MODE", "async")  # async (main loop) | thread
+    ALPACA_DATA_WS_URL = os.getenv("ALPACA_DATA_WS_URL", "wss://stream.data.alpaca.markets/v2/iex")  # async mode
     APCA_BASE_URL = "https://paper-api.alpaca.markets"
 
     # --- Data Sources ---
     REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
     REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
     REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT", "python:trading_bot:v0.1 (by /u/your_username)")
+    REDDIT_BATCH_SIZE = int(os.getenv("REDDIT_BATCH_SIZE", 50))
+    REDDIT_BATCH_SECONDS = float(os.getenv("REDDIT_BATCH_SECONDS", 0.5))
+    REDDIT_DEDUP_SIZE = int(os.getenv("REDDIT_DEDUP_SIZE", 50000))  # recent comment ids remembered
+    REDDIT_MAX_BUFFERED = int(os.getenv("REDDIT_MAX_BUFFERED", 500))  # stream pauses while this many are unstored
+
+    # --- News feeds ---
+    NEWS_FEEDS = [u.strip() for u in os.getenv("NEWS_FEEDS", "").split(",") if u.strip()]  # empty = built-in feeds
+    NEWS_POLL_SECONDS = float(os.getenv("NEWS_POLL_SECONDS", 300))
+    NEWS_DEDUP_MAX_ENTRIES = int(os.getenv("NEWS_DEDUP_MAX_ENTRIES", 100000))
+    NEWS_DEDUP_TTL_HOURS = float(os.getenv("NEWS_DEDUP_TTL_HOURS", 72))
 
     # --- Core Logic ---
     TRADE_MODE = os.getenv("TRADE_MODE", "mock")
     SENTIMENT_CONFIDENCE_THRESHOLD = 0.6
     GEMINI_API_KEY=os.getenv("GEMINI_API_KEY")
+    GEMINI_API_URL = os.getenv("GEMINI_API_URL", "https://generativelanguage.googleapis.com")
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+    LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", 20))
+    LLM_BATCH_LATENCY_MS = float(os.getenv("LLM_BATCH_LATENCY_MS", 500))
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 4))
+
+    # --- Sentiment Inference ---
+    SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch")  # torch | torch-int8 | onnx | onnx-int8
+    SENTIMENT_ONNX_PATH = os.getenv("SENTIMENT_ONNX_PATH", "models/finbert.onnx")
+    SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", 16))
+    SENTIMENT_BATCH_LATENCY_MS = float(os.getenv("SENTIMENT_BATCH_LATENCY_MS", 20))
+    SENTIMENT_MAX_IN_FLIGHT = int(os.getenv("SENTIMENT_MAX_IN_FLIGHT", 64))
+    SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", 20000))
+    SENTIMENT_CACHE_TTL_SECONDS = float(os.getenv("SENTIMENT_CACHE_TTL_SECONDS", 3600))
+
+    # --- Order Routing (token bucket per venue: orders/second, burst) ---
+    KRAKEN_ORDER_RATE = float(os.getenv("KRAKEN_ORDER_RATE", 1.0))
+    KRAKEN_ORDER_BURST = int(os.getenv("KRAKEN_ORDER_BURST", 10))
+    ALPACA_ORDER_RATE = float(os.getenv("ALPACA_ORDER_RATE", 3.0))  # Alpaca allows 200 requests/minute
+    ALPACA_ORDER_BURST = int(os.getenv("ALPACA_ORDER_BURST", 10))
+    ORDER_SUBMITTERS_PER_VENUE = int(os.getenv("ORDER_SUBMITTERS_PER_VENUE", 4))
+    ORDER_MAX_PENDING = int(os.getenv("ORDER_MAX_PENDING", 1000))
+    ORDER_MAX_RETRIES = int(os.getenv("ORDER_MAX_RETRIES", 3))
+
     # --- Risk Management ---
     BASE_TRADE_VOLUME_USD = float(os.getenv("BASE_TRADE_VOLUME_USD", 20.0))
     TREND_TRADE_VOLUME_USD = float(os.getenv("TREND_TRADE_VOLUME_USD", 100.0))
@@ -38,6 +75,35 @@ class Config:
     # --- Asset Discovery ---
     DISCOVERY_MENTION_THRESHOLD = 10
     DISCOVERY_TIMEFRAME_SECONDS = 300
+    DISCOVERY_LLM_FALLBACK = os.getenv("DISCOVERY_LLM_FALLBACK", "false").lower() == "true"
+    DISCOVERY_MAX_IN_FLIGHT = int(os.getenv("DISCOVERY_MAX_IN_FLIGHT", 64))
+
+    # --- Outbound HTTP (one pooled session for REST, RSS and LLM calls) ---
+    HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", 100))
+    HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 20))
+    HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", 300))
+    HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", 60))
+    HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", 30))
+    HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", 5))
+    KRAKEN_ORDER_TIMEOUT_SECONDS = float(os.getenv("KRAKEN_ORDER_TIMEOUT_SECONDS", 10))
+
+    # --- Pipeline ---
+    TA_SHARDS = int(os.getenv("TA_SHARDS", 0))  # 0 = compute indicators inline on the event loop
+    # process: one interpreter per shard, scales with cores. thread: no parallelism (GIL), for debugging
+    TA_SHARD_MODE = os.getenv("TA_SHARD_MODE", "process")  # process | thread
+    # Raw ingestion queue, bounded per message type. Overflow: block | drop_oldest | drop_newest
+    MARKET_DATA_QUEUE_SIZE = int(os.getenv("MARKET_DATA_QUEUE_SIZE", 5000))
+    MARKET_DATA_OVERFLOW = os.getenv("MARKET_DATA_OVERFLOW", "drop_oldest")
+    SOCIAL_POST_QUEUE_SIZE = int(os.getenv("SOCIAL_POST_QUEUE_SIZE", 2000))
+    SOCIAL_POST_OVERFLOW = os.getenv("SOCIAL_POST_OVERFLOW", "block")
+    NEWS_POST_QUEUE_SIZE = int(os.getenv("NEWS_POST_QUEUE_SIZE", 500))
+    NEWS_POST_OVERFLOW = os.getenv("NEWS_POST_OVERFLOW", "block")
+    BUS_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("BUS_SUBSCRIBER_QUEUE_SIZE", 1000))
+    BUS_SUBSCRIBER_OVERFLOW = os.getenv("BUS_SUBSCRIBER_OVERFLOW", "drop_oldest")  # block | drop_oldest | drop_newest
+
+    # --- Latency tracing ---
+    TRACE_WINDOW = int(os.getenv("TRACE_WINDOW", 2048))  # recent samples per path for /status percentiles
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", 0.0))  # fraction persisted to pipeline_traces
 
     # --- Database ---
     DB_HOST = os.getenv("DB_HOST", "db")  # IMPORTANT: Changed to 'db' for Docker networking
@@ -46,6 +112,9 @@ class Config:
     DB_USER = os.getenv("DB_USER")
     DB_PASSWORD = os.getenv("DB_PASSWORD")
     DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", 500))
+    DB_WRITE_FLUSH_SECONDS = float(os.getenv("DB_WRITE_FLUSH_SECONDS", 1.0))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 256))
 
     @staticmethod
     def validate():
@@ -0,0 +1,205 @@
+# ==============================================================================
+# File: async_database.py
+# NEW FILE: asyncio-native DatabaseManager built on an asyncpg connection pool.
+# ==============================================================================
+import asyncio
+import re
+from functools import lru_cache
+
+import asyncpg
+
+from db.database import SCHEMA_COMMANDS, WriteBehindQueue, PRUNE_SEEN_NEWS_QUERY, LOAD_SEEN_NEWS_QUERY
+from db.symbol_registry import ASSETS_CHANNEL, SymbolRegistry
+
+_PLACEHOLDER = re.compile(r'%s')
+
+
+@lru_cache(maxsize=256)
+def _to_asyncpg(query):
+    """Rewrites psycopg2-style %s placeholders to asyncpg's $1, $2, ..."""
+    counter = iter(range(1, 1000))
+    return _PLACEHOLDER.sub(lambda _: f"${next(counter)}", query)
+
+
+class AsyncDatabaseManager:
+    """Same query surface as DatabaseManager, but every call is a coroutine.
+
+    asyncpg prepares each distinct statement once per pooled connection and
+    reuses it from the connection's statement cache, so the hot queries below
+    (and the ones services pass through ``execute_query``) are parsed and
+    planned once instead of on every call. Nothing here blocks the event loop.
+    """
+
+    SELECT_ASSET_ID = "SELECT id FROM assets WHERE symbol = $1;"
+    INSERT_ASSET = "INSERT INTO assets (symbol, asset_class) VALUES ($1, $2) ON CONFLICT (symbol) DO NOTHING;"
+    INGEST_POSTS = ("INSERT INTO social_posts (source, content, author, subreddit) "
+                    "SELECT * FROM unnest($1::varchar[], $2::text[], $3::varchar[], $4::varchar[]) RETURNING id;")
+    RESERVE_IDS = "SELECT nextval(pg_get_serial_sequence($1, 'id')) FROM generate_series(1, $2);"
+
+    def __init__(self, config):
+        self._config, self._pool, self._listener = config, None, None
+        self._channels = {}  # channel -> (callback, on_reconnect)
+        self._reconnect_task = None
+        self.assets = SymbolRegistry(self)
+        self.writer = WriteBehindQueue(self, config.DB_WRITE_BATCH_SIZE, config.DB_WRITE_FLUSH_SECONDS)
+        print("Async Database Manager initialized.")
+
+    async def connect(self):
+        retries = 5
+        while retries > 0:
+            try:
+                self._pool = await asyncpg.create_pool(
+                    dsn=self._config.DATABASE_URL, min_size=1, max_size=10,
+                    statement_cache_size=self._config.DB_STATEMENT_CACHE_SIZE)
+                print("Async database connection pool created successfully.")
+                async with self._pool.acquire() as conn:
+                    await self._create_tables(conn)
+                    await self._seed_initial_data(conn)
+                await self.assets.load()
+                # Notifications sent while the listener was down are lost, so reload everything.
+                await self.listen(ASSETS_CHANNEL, self.assets.on_notify, on_reconnect=self.assets.load)
+                return
+            except (OSError, asyncpg.PostgresError) as e:
+                print(f"FATAL: Could not connect to the database: {e}. Retrying in 5 seconds...")
+                retries -= 1
+                await asyncio.sleep(5)
+        print("FATAL: Could not connect to database after multiple retries. Exiting.")
+        exit(1)
+
+    async def close(self):
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._listener:
+            listener, self._listener = self._listener, None
+            listener.remove_termination_listener(self._on_listener_lost)
+            await listener.close()
+        if self._pool:
+            await self._pool.close()
+
+    async def listen(self, channel, callback, on_reconnect=None):
+        """Subscribes callback to a NOTIFY channel on a dedicated (non-pooled) connection.
+
+        If that connection drops it is re-opened in the background and every
+        channel re-subscribed; ``on_reconnect`` is then awaited so the caller
+        can catch up on notifications it missed.
+        """
+        self._channels[channel] = (callback, on_reconnect)
+        if self._listener is None:
+            await self._open_listener()
+        else:
+            await self._listener.add_listener(channel, callback)
+
+    async def _open_listener(self):
+        listener = await asyncpg.connect(dsn=self._config.DATABASE_URL)
+        for channel, (callback, _) in self._channels.items():
+            await listener.add_listener(channel, callback)
+        listener.add_termination_listener(self._on_listener_lost)
+        self._listener = listener
+
+    def _on_listener_lost(self, connection):
+        if connection is not self._listener:
+            return
+        print("Database LISTEN connection lost, reconnecting...")
+        self._listener = None
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect_listener())
+
+    async def _reconnect_listener(self, delay=1, max_delay=60):
+        while True:
+            try:
+                await self._open_listener()
+                break
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                print(f"Could not re-open LISTEN connection: {e}. Retrying in {delay} seconds...")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_delay)
+        print(f"Database LISTEN connection restored ({', '.join(self._channels)}).")
+        for channel, (_, on_reconnect) in self._channels.items():
+            if on_reconnect is not None:
+                try:
+                    await on_reconnect()
+                except Exception as e:
+                    print(f"Error catching up on {channel} after reconnect: {e}")
+
+    async def _create_tables(self, conn):
+        async with conn.transaction():
+            for command in SCHEMA_COMMANDS: await conn.execute(command)
+        print("Database tables verified/created successfully.")
+
+    async def _seed_initial_data(self, conn):
+        async with conn.transaction():
+            if await conn.fetchval("SELECT COUNT(*) FROM monitored_subreddits;") == 0:
+                print("Seeding initial subreddits...")
+                default_subreddits = [('CryptoCurrency',), ('wallstreetbets',), ('stocks',)]
+                await conn.executemany("INSERT INTO monitored_subreddits (name) VALUES ($1);", default_subreddits)
+
+            if await conn.fetchval("SELECT COUNT(*) FROM monitored_assets;") == 0:
+                print("Seeding initial assets...")
+                default_assets = [('BTC/USD', 'crypto'), ('ETH/USD', 'crypto')]
+                for symbol, asset_class in default_assets:
+                    await conn.execute(self.INSERT_ASSET, symbol, asset_class)
+                    asset_id = await conn.fetchval(self.SELECT_ASSET_ID, symbol)
+                    await conn.execute("INSERT INTO monitored_assets (asset_id) VALUES ($1);", asset_id)
+
+    async def execute_query(self, query, params=None, fetch=None):
+        try:
+            async with self._pool.acquire() as conn:
+                args = params or ()
+                query = _to_asyncpg(query)
+                if fetch == 'one': return await conn.fetchrow(query, *args)
+                if fetch: return await conn.fetch(query, *args)
+                await conn.execute(query, *args)
+        except Exception as error:
+            print(f"Database query error: {error}")
+
+    async def insert_many(self, table, columns, rows, suffix=''):
+        """Bulk insert: COPY when there is no ON CONFLICT clause, else a pipelined executemany.
+
+        A rejected batch is retried row by row, as in DatabaseManager.insert_many.
+        """
+        placeholders = ', '.join(f"${i}" for i in range(1, len(columns) + 1))
+        single = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) {suffix};"
+        try:
+            async with self._pool.acquire() as conn:
+                if suffix:
+                    await conn.executemany(single, rows)
+                else:
+                    await conn.copy_records_to_table(table, records=rows, columns=columns)
+            return
+        except Exception as error:
+            print(f"Database batch insert into {table} failed ({error}), retrying {len(rows)} rows individually.")
+        for row in rows:
+            await self.execute_query(single, row)
+
+    async def ingest_posts(self, batch):
+        """Inserts (source, content, author, subreddit) rows in one round trip.
+
+        Returns the new ids in the same order as ``batch`` (see
+        DatabaseManager.ingest_posts).
+        """
+        if not batch:
+            return []
+        rows = await self.execute_query(self.INGEST_POSTS, tuple(map(list, zip(*batch))), fetch='all')
+        return sorted(row[0] for row in rows) if rows else []
+
+    async def load_seen_news(self, max_age_seconds):
+        """Drops expired seen_news rows and returns [(link_key, age_seconds)] for the rest."""
+        await self.execute_query(PRUNE_SEEN_NEWS_QUERY, (float(max_age_seconds),))
+        rows = await self.execute_query(LOAD_SEEN_NEWS_QUERY, fetch='all')
+        return [(bytes(row[0]), row[1]) for row in rows] if rows else []
+
+    async def reserve_ids(self, table, count):
+        rows = await self.execute_query(self.RESERVE_IDS, (table, count), fetch='all')
+        return [row[0] for row in rows] if rows else []
+
+    async def get_or_create_asset(self, symbol, asset_class='crypto'):
+        return await self.assets.get_or_create(symbol, asset_class)
+
+    async def get_monitored_assets(self):
+        rows = await self.execute_query(
+            "SELECT a.symbol FROM assets a JOIN monitored_assets ma ON a.id = ma.asset_id WHERE ma.is_active = TRUE;",
+            fetch='all')
+        return [row[0] for row in rows] if rows else []
+
+    async def get_monitored_subreddits(self):
+        rows = await self.execute_query("SELECT name FROM monitored_subreddits WHERE is_active = TRUE;", fetch='all')
+        return [row[0] for row in rows] if rows else []
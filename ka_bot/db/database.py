@@ -1,22 +1,344 @@
 # ==============================================================================
 # File: database.py
 # ==============================================================================
+import asyncio
 import psycopg2
 from psycopg2 import pool
+from psycopg2.extras import execute_values
+from collections import deque
 from datetime import datetime
 import time
+from services.metrics import DB_WRITE_SECONDS, DB_ROWS_WRITTEN
+
+SCHEMA_COMMANDS = (
+    """CREATE TABLE IF NOT EXISTS assets
+    (
+        id
+        SERIAL
+        PRIMARY
+        KEY,
+        symbol
+        VARCHAR
+       (
+        20
+       ) UNIQUE NOT NULL, asset_class VARCHAR
+       (
+           20
+       ) NOT NULL, first_seen TIMESTAMPTZ DEFAULT NOW
+       (
+       ));""",
+    """CREATE TABLE IF NOT EXISTS monitored_assets
+    (
+        id
+        SERIAL
+        PRIMARY
+        KEY,
+        asset_id
+        INTEGER
+        NOT
+        NULL
+        REFERENCES
+        assets
+       (
+        id
+       ) UNIQUE, is_active BOOLEAN DEFAULT TRUE);""",
+    """CREATE TABLE IF NOT EXISTS monitored_subreddits
+    (
+        id
+        SERIAL
+        PRIMARY
+        KEY,
+        name
+        VARCHAR
+       (
+        100
+       ) UNIQUE NOT NULL, is_active BOOLEAN DEFAULT TRUE);""",
+    """CREATE TABLE IF NOT EXISTS price_ticks
+    (
+        id
+        BIGSERIAL
+        PRIMARY
+        KEY,
+        asset_id
+        INTEGER
+        NOT
+        NULL
+        REFERENCES
+        assets
+       (
+        id
+       ), price NUMERIC
+       (
+           20,
+           8
+       ) NOT NULL, timestamp TIMESTAMPTZ NOT NULL);""",
+    """CREATE TABLE IF NOT EXISTS technical_indicators
+    (
+        id
+        BIGSERIAL
+        PRIMARY
+        KEY,
+        asset_id
+        INTEGER
+        NOT
+        NULL
+        REFERENCES
+        assets
+       (
+        id
+       ), timestamp TIMESTAMPTZ NOT NULL, rsi NUMERIC
+       (
+           10,
+           2
+       ), sma_20 NUMERIC
+       (
+           20,
+           8
+       ), sma_50 NUMERIC
+       (
+           20,
+           8
+       ), upper_bollinger NUMERIC
+       (
+           20,
+           8
+       ), lower_bollinger NUMERIC
+       (
+           20,
+           8
+       ), UNIQUE
+       (
+           asset_id,
+           timestamp
+       ));""",
+    """CREATE TABLE IF NOT EXISTS social_posts
+    (
+        id
+        BIGSERIAL
+        PRIMARY
+        KEY,
+        source
+        VARCHAR
+       (
+        50
+       ) NOT NULL, content TEXT NOT NULL, author VARCHAR
+       (
+           100
+       ), subreddit VARCHAR
+       (
+           100
+       ), timestamp TIMESTAMPTZ DEFAULT NOW
+       (
+       ));""",
+    """CREATE TABLE IF NOT EXISTS sentiment_signals
+    (
+        id
+        BIGSERIAL
+        PRIMARY
+        KEY,
+        post_id
+        INTEGER
+        REFERENCES
+        social_posts
+       (
+        id
+       ), asset_id INTEGER REFERENCES assets
+       (
+           id
+       ), sentiment_score NUMERIC
+       (
+           5,
+           4
+       ) NOT NULL, signal VARCHAR
+       (
+           10
+       ) NOT NULL, timestamp TIMESTAMPTZ DEFAULT NOW
+       (
+       ));""",
+    """CREATE TABLE IF NOT EXISTS trades
+    (
+        id
+        BIGSERIAL
+        PRIMARY
+        KEY,
+        signal_id
+        INTEGER
+        REFERENCES
+        sentiment_signals
+       (
+        id
+       ), asset_id INTEGER NOT NULL REFERENCES assets
+       (
+           id
+       ), trade_type VARCHAR
+       (
+           4
+       ) NOT NULL, price NUMERIC
+       (
+           20,
+           8
+       ) NOT NULL, volume NUMERIC
+       (
+           20,
+           8
+       ) NOT NULL, total_usd NUMERIC
+       (
+           20,
+           8
+       ) NOT NULL, timestamp TIMESTAMPTZ NOT NULL);""",
+    # Tell every bot process (see SymbolRegistry) when a symbol is added or removed.
+    """CREATE OR REPLACE FUNCTION notify_assets_changed() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('assets_changed', COALESCE(NEW.symbol, OLD.symbol));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;""",
+    """DROP TRIGGER IF EXISTS assets_changed ON assets;""",
+    """CREATE TRIGGER assets_changed AFTER INSERT OR DELETE OR UPDATE OF symbol ON assets
+    FOR EACH ROW EXECUTE FUNCTION notify_assets_changed();""",
+    # Recently seen news links (blake2b of the URL), so restarts skip old articles.
+    """CREATE TABLE IF NOT EXISTS seen_news
+    (
+        link_key BYTEA PRIMARY KEY,
+        seen_at TIMESTAMPTZ NOT NULL
+    );""",
+    # Sampled end-to-end latency traces (see services/tracing.py); stage offsets in ms.
+    """CREATE TABLE IF NOT EXISTS pipeline_traces
+    (
+        id BIGSERIAL PRIMARY KEY,
+        path VARCHAR(30) NOT NULL,
+        symbol VARCHAR(20),
+        total_ms NUMERIC(12, 3) NOT NULL,
+        stages JSONB NOT NULL,
+        timestamp TIMESTAMPTZ NOT NULL
+    );"""
+)
+
+PRUNE_SEEN_NEWS_QUERY = "DELETE FROM seen_news WHERE seen_at < NOW() - make_interval(secs => %s);"
+# Oldest first: TextCache is an LRU, so when there are more rows than it holds, the newest ones stay.
+LOAD_SEEN_NEWS_QUERY = ("SELECT link_key, EXTRACT(EPOCH FROM NOW() - seen_at)::float8 FROM seen_news "
+                        "ORDER BY seen_at;")
+
+INGEST_POSTS_QUERY = "INSERT INTO social_posts (source, content, author, subreddit) VALUES %s RETURNING id;"
+
+# Tables written through the write-behind queue, in flush order (a trade row
+# references its sentiment signal, so signals must land first).
+WRITE_BEHIND_TABLES = {
+    'technical_indicators': (('asset_id', 'timestamp', 'rsi', 'sma_20', 'sma_50', 'upper_bollinger', 'lower_bollinger'),
+                             'ON CONFLICT (asset_id, timestamp) DO NOTHING'),
+    'sentiment_signals': (('id', 'post_id', 'asset_id', 'sentiment_score', 'signal'), ''),
+    'trades': (('signal_id', 'asset_id', 'trade_type', 'price', 'volume', 'total_usd', 'timestamp'), ''),
+    'pipeline_traces': (('path', 'symbol', 'total_ms', 'stages', 'timestamp'), ''),
+    'seen_news': (('link_key', 'seen_at'), 'ON CONFLICT (link_key) DO NOTHING'),
+}
+
+
+async def _call_db(method, *args):
+    """Awaits an AsyncDatabaseManager method, or runs a sync one in a worker thread."""
+    if asyncio.iscoroutinefunction(method):
+        return await method(*args)
+    return await asyncio.to_thread(method, *args)
+
+
+class WriteBehindQueue:
+    """Buffers INSERT rows from the async services and writes them in bulk.
+
+    ``put`` only appends to an in-memory buffer, so callers never wait on the
+    database. ``run`` flushes every buffered table with one multi-row INSERT
+    once ``max_rows`` rows are pending or ``max_delay`` seconds have passed.
+    Rows that need their id up front (sentiment signals are referenced by
+    trades) take it from ``next_id``, which reserves sequence values in blocks.
+    """
+
+    def __init__(self, db, max_rows=500, max_delay=1.0, id_block_size=100):
+        self._db = db
+        self.max_rows, self.max_delay, self.id_block_size = max_rows, max_delay, id_block_size
+        self._buffers = {table: [] for table in WRITE_BEHIND_TABLES}
+        self._pending = 0
+        self._id_blocks = {}
+        self._id_locks = {}
+        self._wake = None
+        self._flush_lock = None
+        self._closed = False
+        self.last_flush = None
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def put(self, table, row):
+        self._buffers[table].append(row)
+        self._pending += 1
+        if self._pending >= self.max_rows and self._wake:
+            self._wake.set()
+
+    async def next_id(self, table):
+        lock = self._id_locks.setdefault(table, asyncio.Lock())
+        async with lock:
+            block = self._id_blocks.get(table)
+            if not block:
+                block = self._id_blocks[table] = deque(
+                    await _call_db(self._db.reserve_ids, table, self.id_block_size))
+            return block.popleft() if block else None
+
+    async def run(self):
+        self._wake = asyncio.Event()
+        print(f"DB write-behind queue started (batch {self.max_rows} rows / {self.max_delay}s).")
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            # Shielded: cancelling run() mid-INSERT would abort the statement and lose
+            # rows already taken from the buffers. The write finishes in its own task
+            # and close() waits for it (through the flush lock) before the final flush.
+            await asyncio.shield(asyncio.ensure_future(self.flush()))
+
+    async def flush(self):
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batches = {table: rows for table, rows in self._buffers.items() if rows}
+            self._buffers = {table: [] for table in WRITE_BEHIND_TABLES}
+            self._pending = 0
+
+            started = time.perf_counter()
+            for table, rows in batches.items():
+                columns, suffix = WRITE_BEHIND_TABLES[table]
+                try:
+                    with DB_WRITE_SECONDS.labels(table).time():
+                        await _call_db(self._db.insert_many, table, columns, rows, suffix)
+                    DB_ROWS_WRITTEN.labels(table).inc(len(rows))
+                except Exception as e:
+                    print(f"DB_WRITER_ERROR: Could not write {len(rows)} rows to {table}: {e}")
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            counts = {table: len(rows) for table, rows in batches.items()}
+            self.last_flush = {'rows': sum(counts.values()), 'tables': counts, 'duration_ms': round(elapsed_ms, 2)}
+            print(f"DB_WRITER | Flushed {self.last_flush['rows']} rows {counts} in {elapsed_ms:.1f} ms")
+
+    async def close(self):
+        """Stops the flush loop and writes out anything still buffered, after any write in progress."""
+        self._closed = True
+        if self._wake:
+            self._wake.set()
+        await self.flush()
 
 
 class DatabaseManager:
     def __init__(self, config):
         self._config, self._pool = config, None
+        self.writer = WriteBehindQueue(self, config.DB_WRITE_BATCH_SIZE, config.DB_WRITE_FLUSH_SECONDS)
         print("Database Manager initialized.")
 
     def connect(self):
         retries = 5
         while retries > 0:
             try:
-                self._pool = psycopg2.pool.SimpleConnectionPool(1, 10, dsn=self._config.DATABASE_URL)
+                self._pool = psycopg2.pool.ThreadedConnectionPool(1, 10, dsn=self._config.DATABASE_URL)
                 conn = self._get_connection()
                 print("Database connection pool created successfully.")
                 self._create_tables(conn)
@@ -37,185 +359,8 @@ class DatabaseManager:
         self._pool.putconn(conn)
 
     def _create_tables(self, conn):
-        commands = (
-            """CREATE TABLE IF NOT EXISTS assets
-            (
-                id
-                SERIAL
-                PRIMARY
-                KEY,
-                symbol
-                VARCHAR
-               (
-                20
-               ) UNIQUE NOT NULL, asset_class VARCHAR
-               (
-                   20
-               ) NOT NULL, first_seen TIMESTAMPTZ DEFAULT NOW
-               (
-               ));""",
-            """CREATE TABLE IF NOT EXISTS monitored_assets
-            (
-                id
-                SERIAL
-                PRIMARY
-                KEY,
-                asset_id
-                INTEGER
-                NOT
-                NULL
-                REFERENCES
-                assets
-               (
-                id
-               ) UNIQUE, is_active BOOLEAN DEFAULT TRUE);""",
-            """CREATE TABLE IF NOT EXISTS monitored_subreddits
-            (
-                id
-                SERIAL
-                PRIMARY
-                KEY,
-                name
-                VARCHAR
-               (
-                100
-               ) UNIQUE NOT NULL, is_active BOOLEAN DEFAULT TRUE);""",
-            """CREATE TABLE IF NOT EXISTS price_ticks
-            (
-                id
-                BIGSERIAL
-                PRIMARY
-                KEY,
-                asset_id
-                INTEGER
-                NOT
-                NULL
-                REFERENCES
-                assets
-               (
-                id
-               ), price NUMERIC
-               (
-                   20,
-                   8
-               ) NOT NULL, timestamp TIMESTAMPTZ NOT NULL);""",
-            """CREATE TABLE IF NOT EXISTS technical_indicators
-            (
-                id
-                BIGSERIAL
-                PRIMARY
-                KEY,
-                asset_id
-                INTEGER
-                NOT
-                NULL
-                REFERENCES
-                assets
-               (
-                id
-               ), timestamp TIMESTAMPTZ NOT NULL, rsi NUMERIC
-               (
-                   10,
-                   2
-               ), sma_20 NUMERIC
-               (
-                   20,
-                   8
-               ), sma_50 NUMERIC
-               (
-                   20,
-                   8
-               ), upper_bollinger NUMERIC
-               (
-                   20,
-                   8
-               ), lower_bollinger NUMERIC
-               (
-                   20,
-                   8
-               ), UNIQUE
-               (
-                   asset_id,
-                   timestamp
-               ));""",
-            """CREATE TABLE IF NOT EXISTS social_posts
-            (
-                id
-                BIGSERIAL
-                PRIMARY
-                KEY,
-                source
-                VARCHAR
-               (
-                50
-               ) NOT NULL, content TEXT NOT NULL, author VARCHAR
-               (
-                   100
-               ), subreddit VARCHAR
-               (
-                   100
-               ), timestamp TIMESTAMPTZ DEFAULT NOW
-               (
-               ));""",
-            """CREATE TABLE IF NOT EXISTS sentiment_signals
-            (
-                id
-                BIGSERIAL
-                PRIMARY
-                KEY,
-                post_id
-                INTEGER
-                REFERENCES
-                social_posts
-               (
-                id
-               ), asset_id INTEGER REFERENCES assets
-               (
-                   id
-               ), sentiment_score NUMERIC
-               (
-                   5,
-                   4
-               ) NOT NULL, signal VARCHAR
-               (
-                   10
-               ) NOT NULL, timestamp TIMESTAMPTZ DEFAULT NOW
-               (
-               ));""",
-            """CREATE TABLE IF NOT EXISTS trades
-            (
-                id
-                BIGSERIAL
-                PRIMARY
-                KEY,
-                signal_id
-                INTEGER
-                REFERENCES
-                sentiment_signals
-               (
-                id
-               ), asset_id INTEGER NOT NULL REFERENCES assets
-               (
-                   id
-               ), trade_type VARCHAR
-               (
-                   4
-               ) NOT NULL, price NUMERIC
-               (
-                   20,
-                   8
-               ) NOT NULL, volume NUMERIC
-               (
-                   20,
-                   8
-               ) NOT NULL, total_usd NUMERIC
-               (
-                   20,
-                   8
-               ) NOT NULL, timestamp TIMESTAMPTZ NOT NULL);"""
-        )
         with conn.cursor() as cur:
-            for command in commands: cur.execute(command)
+            for command in SCHEMA_COMMANDS: cur.execute(command)
         conn.commit()
         print("Database tables verified/created successfully.")
 
@@ -248,9 +393,66 @@ class DatabaseManager:
             conn.commit()
         except Exception as error:
             print(f"Database query error: {error}")
+            conn.rollback()
         finally:
             if release_conn and conn: self._release_connection(conn)
 
+    def insert_many(self, table, columns, rows, suffix=''):
+        """Inserts rows with a single multi-row VALUES statement.
+
+        If the batch is rejected (e.g. one row violates a constraint) the rows are
+        retried one by one so a single bad row does not drop the whole batch.
+        """
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s {suffix};"
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                execute_values(cur, query, rows, page_size=len(rows))
+            conn.commit()
+            return
+        except Exception as error:
+            conn.rollback()
+            print(f"Database batch insert into {table} failed ({error}), retrying {len(rows)} rows individually.")
+        finally:
+            self._release_connection(conn)
+
+        single = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) {suffix};"
+        for row in rows:
+            self.execute_query(single, row)
+
+    def ingest_posts(self, batch):
+        """Inserts (source, content, author, subreddit) rows in one statement.
+
+        Returns the new ids in the same order as ``batch``. Ids are drawn from the
+        sequence row by row, so sorting them restores the input order even though
+        RETURNING itself does not promise one.
+        """
+        if not batch:
+            return []
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                rows = execute_values(cur, INGEST_POSTS_QUERY, batch, page_size=len(batch), fetch=True)
+            conn.commit()
+            return sorted(row[0] for row in rows)
+        except Exception as error:
+            print(f"Database post ingestion error: {error}")
+            conn.rollback()
+            return []
+        finally:
+            self._release_connection(conn)
+
+    def load_seen_news(self, max_age_seconds):
+        """Drops expired seen_news rows and returns [(link_key, age_seconds)] for the rest."""
+        self.execute_query(PRUNE_SEEN_NEWS_QUERY, (float(max_age_seconds),))
+        rows = self.execute_query(LOAD_SEEN_NEWS_QUERY, fetch='all')
+        return [(bytes(row[0]), row[1]) for row in rows] if rows else []
+
+    def reserve_ids(self, table, count):
+        rows = self.execute_query("SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s);",
+                                  (table, count), fetch='all')
+        return [row[0] for row in rows] if rows else []
+
     def get_or_create_asset(self, symbol, asset_class='crypto', conn=None):
         asset_id = self.execute_query("SELECT id FROM assets WHERE symbol = %s;", (symbol,), fetch='one', conn=conn)
         if asset_id: return asset_id[0]
@@ -0,0 +1,68 @@
+# ==============================================================================
+# File: symbol_registry.py
+# NEW FILE: In-memory symbol -> asset id map, preloaded from the assets table.
+# ==============================================================================
+import asyncio
+
+ASSETS_CHANNEL = 'assets_changed'
+
+
+class SymbolRegistry:
+    """Serves asset ids from memory instead of querying ``assets`` on every use.
+
+    All of ``assets`` is loaded once at startup; unknown symbols are created with
+    a single upsert that also returns the id. Other writers (e.g. the dashboard
+    container) are picked up through the ``assets_changed`` NOTIFY fired by the
+    trigger on ``assets``: the affected symbol is re-read from the database.
+    """
+
+    SELECT_ALL = "SELECT symbol, id FROM assets;"
+    SELECT_ONE = "SELECT id FROM assets WHERE symbol = $1;"
+    # The no-op DO UPDATE makes RETURNING yield the id of an existing row too.
+    UPSERT = ("INSERT INTO assets (symbol, asset_class) VALUES ($1, $2) "
+              "ON CONFLICT (symbol) DO UPDATE SET asset_class = assets.asset_class RETURNING id;")
+
+    def __init__(self, db):
+        self._db = db
+        self._ids = {}
+        self._refreshes = set()
+
+    def __len__(self):
+        return len(self._ids)
+
+    async def load(self):
+        rows = await self._db.execute_query(self.SELECT_ALL, fetch='all')
+        self._ids = {symbol: asset_id for symbol, asset_id in rows or ()}
+        print(f"Symbol registry loaded {len(self._ids)} assets.")
+
+    def get(self, symbol):
+        return self._ids.get(symbol)
+
+    async def get_or_create(self, symbol, asset_class='crypto'):
+        asset_id = self._ids.get(symbol)
+        if asset_id is not None:
+            return asset_id
+        row = await self._db.execute_query(self.UPSERT, (symbol, asset_class), fetch='one')
+        if row is None:
+            return None
+        self._ids[symbol] = row[0]
+        return row[0]
+
+    def invalidate(self, symbol=None):
+        """Drops one symbol (or everything) so the next lookup goes to the database."""
+        if symbol is None:
+            self._ids.clear()
+        else:
+            self._ids.pop(symbol, None)
+
+    async def refresh(self, symbol):
+        self.invalidate(symbol)
+        row = await self._db.execute_query(self.SELECT_ONE, (symbol,), fetch='one')
+        if row is not None:
+            self._ids[symbol] = row[0]
+
+    def on_notify(self, connection, pid, channel, payload):
+        """asyncpg listener callback for ``assets_changed``."""
+        task = asyncio.get_running_loop().create_task(self.refresh(payload))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
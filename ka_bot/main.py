@@ -3,20 +3,30 @@
 # UPDATED: Added a simple HTTP server for status reporting.
 # ==============================================================================
 import asyncio
+import signal
 from config import Config
-from db.database import DatabaseManager
+from db.async_database import AsyncDatabaseManager
 from clients.kraken_ws_client import KrakenWsClient
 from clients.kraken_rest_client import KrakenRestClient
 from clients.alpaca_ws_client import AlpacaWsClient
 from clients.alpaca_rest_client import AlpacaRestClient
 from clients.reddit_client import RedditClient
 from clients.news_client import FinancialNewsClient
+from clients.http_client import SharedHttpClient
 from services.technical_analyzer import TechnicalAnalyzer
 from services.risk_manager import RiskManager
 from services.sentiment_engine import SentimentEngine
-from analysis.ai_sentiment_analyzer import AISentimentAnalyzer
+from analysis.inference_service import SentimentInferenceService
+from analysis.text_cache import TextCache
 from services.mock_trader import MockTrader
 from services.asset_discoverer import AssetDiscoverer
+from services.order_router import OrderRouter
+from services.event_bus import EventBus
+from services.typed_queue import TypedQueue
+from services.conflator import TickConflator
+from services.indicator_shards import ShardedIndicatorPool
+from services.metrics import REGISTRY, CONTENT_TYPE, QUEUE_DEPTH
+from services.tracing import TRACKER
 import threading
 import http.server
 import socketserver
@@ -29,12 +39,25 @@ status_data = {
     'alpaca_ws': {'status': 'Initializing', 'last_seen': None},
     'reddit_client': {'status': 'Initializing', 'last_seen': None},
     'pipeline_processor': {'status': 'Initializing', 'last_seen': None},
+    'market_data_processor': {'status': 'Initializing', 'last_seen': None},
     'sentiment_engine': {'status': 'Initializing', 'last_seen': None},
     'asset_discoverer': {'status': 'Initializing', 'last_seen': None},
     'asset_monitor': {'status': 'Initializing', 'last_seen': None},
     'news_client': {'status': 'Initializing', 'last_seen': None},
+    'db_writer': {'status': 'Initializing', 'last_seen': None},
+    'order_router': {'status': 'Initializing', 'last_seen': None},
+    'queue_depth_sampler': {'status': 'Initializing', 'last_seen': None},
 }
 
+# --- Extra /status sections: name -> callable returning a JSON-serialisable dict ---
+# Providers read state owned by the event loop, so they are called on the loop.
+status_providers = {}
+status_loop = None
+
+
+async def collect_status_sections():
+    return {name: provider() for name, provider in status_providers.items()}
+
 
 def update_status(component, new_status='Running'):
     status_data[component]['status'] = new_status
@@ -48,7 +71,16 @@ class StatusHandler(http.server.SimpleHTTPRequestHandler):
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.end_headers()
-            self.wfile.write(json.dumps(status_data).encode('utf-8'))
+            payload = dict(status_data)
+            if status_loop is not None:
+                payload.update(asyncio.run_coroutine_threadsafe(collect_status_sections(), status_loop).result(5))
+            self.wfile.write(json.dumps(payload).encode('utf-8'))
+        elif self.path == '/metrics':
+            body = REGISTRY.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-type', CONTENT_TYPE)
+            self.end_headers()
+            self.wfile.write(body)
         else:
             self.send_error(404, "File not found")
 
@@ -66,17 +98,31 @@ async def main():
     except ValueError as e:
         print(f"Configuration error: {e}"); return
 
+    global status_loop
+    status_loop = asyncio.get_running_loop()
     config = Config()
-    db_manager = DatabaseManager(config)
-    db_manager.connect()
+    db_manager = AsyncDatabaseManager(config)
+    await db_manager.connect()
+    TRACKER.configure(config.TRACE_WINDOW, config.TRACE_SAMPLE_RATE, db_manager.writer)
+    status_providers['latency'] = TRACKER.stats
 
-    initial_assets = db_manager.get_monitored_assets()
-    subreddits = db_manager.get_monitored_subreddits()
+    initial_assets = await db_manager.get_monitored_assets()
+    subreddits = await db_manager.get_monitored_subreddits()
 
-    raw_data_queue = asyncio.Queue()
-    processed_data_queue = asyncio.Queue()
+    raw_data_queue = TypedQueue({
+        'market_data': (config.MARKET_DATA_QUEUE_SIZE, config.MARKET_DATA_OVERFLOW),
+        'social_post': (config.SOCIAL_POST_QUEUE_SIZE, config.SOCIAL_POST_OVERFLOW),
+        'news_post': (config.NEWS_POST_QUEUE_SIZE, config.NEWS_POST_OVERFLOW),
+    })
+    status_providers['raw_queue'] = raw_data_queue.stats
+    tick_conflator = TickConflator()
+    status_providers['conflation'] = tick_conflator.stats
+    event_bus = EventBus()
+    status_providers['event_bus'] = event_bus.stats
 
-    kraken_rest = KrakenRestClient(config)
+    http_client = SharedHttpClient.from_config(config)
+    status_providers['http'] = http_client.stats
+    kraken_rest = KrakenRestClient(config, http_client)
     alpaca_rest = AlpacaRestClient(config)
 
     mock_trader_instance = MockTrader(config, db_manager)
@@ -84,37 +130,61 @@ async def main():
         'crypto': kraken_rest if config.TRADE_MODE == 'live' else mock_trader_instance,
         'stock': alpaca_rest if config.TRADE_MODE == 'live' else mock_trader_instance
     }
+    order_router = OrderRouter(traders, {'crypto': (config.KRAKEN_ORDER_RATE, config.KRAKEN_ORDER_BURST),
+                                         'stock': (config.ALPACA_ORDER_RATE, config.ALPACA_ORDER_BURST)},
+                               config.ORDER_SUBMITTERS_PER_VENUE, config.ORDER_MAX_PENDING, config.ORDER_MAX_RETRIES)
+    status_providers['orders'] = order_router.stats
 
-    tech_analyzer = TechnicalAnalyzer(config, db_manager)
+    shard_pool = ShardedIndicatorPool(config.TA_SHARDS, config.TA_SHARD_MODE) if config.TA_SHARDS > 0 else None
+    if shard_pool is not None:
+        status_providers['ta_shards'] = shard_pool.stats
+    tech_analyzer = TechnicalAnalyzer(config, db_manager, shard_pool)
 
     initial_crypto = [a for a in initial_assets if '/' in a]
     initial_stocks = [a for a in initial_assets if '/' not in a]
 
     kraken_ws = KrakenWsClient(initial_crypto, raw_data_queue, config)
+    status_providers['kraken_shards'] = kraken_ws.stats
     loop = asyncio.get_event_loop()
     alpaca_ws = AlpacaWsClient(initial_stocks, raw_data_queue, config, loop)
+    status_providers['alpaca_stream'] = alpaca_ws.stats
     reddit_client = RedditClient(raw_data_queue, config, db_manager, subreddits)
-    news_client = FinancialNewsClient(raw_data_queue, db_manager)
+    status_providers['reddit'] = reddit_client.stats
+    news_client = FinancialNewsClient(raw_data_queue, db_manager, http_client, config.NEWS_FEEDS,
+                                      config.NEWS_DEDUP_MAX_ENTRIES, config.NEWS_DEDUP_TTL_HOURS * 3600)
+    status_providers['news'] = news_client.stats
 
-    ai_analyzer = AISentimentAnalyzer()
+    # Imported here, not at module level: spawned TA shard workers re-import this
+    # module, and must not load torch and transformers each.
+    from analysis.ai_sentiment_analyzer import AISentimentAnalyzer
+    ai_analyzer = AISentimentAnalyzer(config.SENTIMENT_BACKEND, config.SENTIMENT_ONNX_PATH)
+    sentiment_cache = TextCache(config.SENTIMENT_CACHE_SIZE, config.SENTIMENT_CACHE_TTL_SECONDS)
+    status_providers['sentiment_cache'] = sentiment_cache.stats
+    inference_service = SentimentInferenceService(ai_analyzer, config.SENTIMENT_BATCH_SIZE,
+                                                  config.SENTIMENT_BATCH_LATENCY_MS / 1000, sentiment_cache)
+    inference_service.start()
     risk_manager = RiskManager(config, tech_analyzer)
 
-    sentiment_engine = SentimentEngine(processed_data_queue, config, traders, db_manager, tech_analyzer, risk_manager,
-                                       ai_analyzer, initial_assets)
+    sentiment_feed = event_bus.subscribe('sentiment_engine', ('social_post', 'news_post'),
+                                         config.BUS_SUBSCRIBER_QUEUE_SIZE, config.BUS_SUBSCRIBER_OVERFLOW)
+    sentiment_engine = SentimentEngine(sentiment_feed, config, order_router, db_manager, tech_analyzer, risk_manager,
+                                       inference_service, initial_assets)
     for asset in initial_assets:
         sentiment_engine.add_asset(asset, 'crypto' if '/' in asset else 'stock')
 
-    asset_discoverer = AssetDiscoverer(processed_data_queue, config, {'crypto': kraken_rest, 'stock': alpaca_rest},
-                                       {'crypto': kraken_ws, 'stock': alpaca_ws}, sentiment_engine)
+    discovery_feed = event_bus.subscribe('asset_discoverer', ('social_post', 'news_post'),
+                                         config.BUS_SUBSCRIBER_QUEUE_SIZE, config.BUS_SUBSCRIBER_OVERFLOW)
+    asset_discoverer = AssetDiscoverer(discovery_feed, config, {'crypto': kraken_rest, 'stock': alpaca_rest},
+                                       {'crypto': kraken_ws, 'stock': alpaca_ws}, sentiment_engine, http_client)
 
     await asset_discoverer.initialize()
 
     async def asset_monitor(db, kr_ws, al_ws, engine, poll_interval=30):
         print("Database asset monitor started...")
-        known = set(await asyncio.to_thread(db.get_monitored_assets))
+        known = set(await db.get_monitored_assets())
         while True:
             update_status('asset_monitor')
-            current = set(await asyncio.to_thread(db.get_monitored_assets))
+            current = set(await db.get_monitored_assets())
             new_assets = current - known
             for asset in new_assets:
                 if '/' in asset:
@@ -126,14 +196,24 @@ async def main():
             known = current
             await asyncio.sleep(poll_interval)
 
-    async def pipeline_processor(raw_q, processed_q):
+    async def pipeline_processor(raw_q, conflator, bus):
         print("Linear pipeline processor started.")
         while True:
             data = await raw_q.get()
             update_status('pipeline_processor')
-            await tech_analyzer.process_data_point(data)
-            await processed_q.put(data)
-            raw_q.task_done()
+            if data.type == 'market_data':
+                conflator.offer(data)
+            else:
+                await bus.publish(data)
+
+    async def market_data_processor(conflator, bus):
+        print("Conflated market data processor started.")
+        while True:
+            ticks = await conflator.drain()
+            await tech_analyzer.process_batch(ticks)
+            for tick in ticks:
+                await bus.publish(tick)
+            update_status('market_data_processor')
 
     async def run_and_update_status(component_name, coro):
         update_status(component_name, 'Running')
@@ -143,28 +223,61 @@ async def main():
             update_status(component_name, f'Error: {e}')
             print(f"Error in {component_name}: {e}")
 
-    alpaca_thread = threading.Thread(target=alpaca_ws.run, daemon=True)
-    alpaca_thread.start()
-    update_status('alpaca_ws', 'Running')  # Assume it starts correctly
+    if config.ALPACA_STREAM_MODE == 'thread':
+        alpaca_thread = threading.Thread(target=alpaca_ws.run, daemon=True)
+        alpaca_thread.start()
+        update_status('alpaca_ws', 'Running')  # Assume it starts correctly
 
     # Start status server in a separate thread
     status_thread = threading.Thread(target=run_status_server, daemon=True)
     status_thread.start()
 
+    async def queue_depth_sampler(interval=1):
+        # Sampled here on the loop, which owns the queues; /metrics only reads the gauge.
+        while True:
+            depths = {f"raw:{t}": s['depth'] for t, s in raw_data_queue.stats().items()}
+            depths.update({f"bus:{n}": s['depth'] for n, s in event_bus.stats().items()})
+            depths['conflator'] = tick_conflator.stats()['pending_symbols']
+            depths['db_writer'] = db_manager.writer.pending
+            for queue_name, depth in depths.items():
+                QUEUE_DEPTH.labels(queue_name).set(depth)
+            update_status('queue_depth_sampler')
+            await asyncio.sleep(interval)
+
+    # docker stop sends SIGTERM to PID 1; cancel main so the finally below flushes and closes.
+    status_loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
     print("Starting all data streams and engines...")
-    await asyncio.gather(
-        run_and_update_status('kraken_ws', kraken_ws.listen()),
-        run_and_update_status('reddit_client', reddit_client.stream_comments()),
-        run_and_update_status('news_client', news_client.poll()),
-        run_and_update_status('pipeline_processor', pipeline_processor(raw_data_queue, processed_data_queue)),
-        run_and_update_status('sentiment_engine', sentiment_engine.run()),
-        run_and_update_status('asset_discoverer', asset_discoverer.run()),
-        run_and_update_status('asset_monitor', asset_monitor(db_manager, kraken_ws, alpaca_ws, sentiment_engine))
-    )
+    try:
+        await asyncio.gather(
+            run_and_update_status('kraken_ws', kraken_ws.listen()),
+            *([run_and_update_status('alpaca_ws', alpaca_ws.run_async())]
+              if config.ALPACA_STREAM_MODE == 'async' else []),
+            run_and_update_status('reddit_client', reddit_client.stream_comments()),
+            run_and_update_status('news_client', news_client.poll(config.NEWS_POLL_SECONDS)),
+            run_and_update_status('pipeline_processor', pipeline_processor(raw_data_queue, tick_conflator, event_bus)),
+            run_and_update_status('market_data_processor', market_data_processor(tick_conflator, event_bus)),
+            run_and_update_status('sentiment_engine', sentiment_engine.run()),
+            run_and_update_status('asset_discoverer', asset_discoverer.run()),
+            run_and_update_status('asset_monitor', asset_monitor(db_manager, kraken_ws, alpaca_ws, sentiment_engine)),
+            run_and_update_status('db_writer', db_manager.writer.run()),
+            run_and_update_status('order_router', order_router.run()),
+            run_and_update_status('queue_depth_sampler', queue_depth_sampler())
+        )
+    finally:
+        print("Flushing buffered database writes...")
+        await asyncio.to_thread(inference_service.stop)  # joins the inference worker
+        alpaca_rest.close()
+        if shard_pool is not None:
+            await asyncio.to_thread(shard_pool.close)  # joins the workers
+        await asset_discoverer.llm.close()
+        await http_client.close()
+        await db_manager.writer.close()
+        await db_manager.close()
 
 
 if __name__ == "__main__":
     try:
         asyncio.run(main())
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\nBot shutting down.")
\ No newline at end of file
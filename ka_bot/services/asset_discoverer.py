@@ -3,16 +3,26 @@
 # UPDATED: Corrected logic for classifying assets.
 # ==============================================================================
 import asyncio
-import re, time, aiohttp, json as json_parser
+import time
 from collections import defaultdict
+from services.ticker_extractor import LocalTickerExtractor
+from clients.llm_ticker_client import LlmTickerClient
 
 
 class AssetDiscoverer:
-    def __init__(self, data_queue, config, rest_clients, ws_clients, sentiment_engine):
+    def __init__(self, data_queue, config, rest_clients, ws_clients, sentiment_engine, http=None):
         self.data_queue, self.config, self.rest, self.ws, self.engine = data_queue, config, rest_clients, ws_clients, sentiment_engine
         self.potential_assets = defaultdict(list)
         self.known_crypto_pairs = set()
         self.known_stock_tickers = set()
+        self.extractor = LocalTickerExtractor(self.known_stock_tickers, self.known_crypto_pairs)
+        self.llm = LlmTickerClient(config, max_batch_size=config.LLM_BATCH_SIZE,
+                                   max_latency=config.LLM_BATCH_LATENCY_MS / 1000,
+                                   max_concurrency=config.LLM_MAX_CONCURRENCY, http=http)
+        self.llm_fallback_calls = 0
+        self._in_flight = asyncio.Semaphore(config.DISCOVERY_MAX_IN_FLIGHT)
+        self._tasks = set()
+        self._validating = set()  # tickers with a validation under way
         print("Asset Discoverer initialized.")
 
     async def initialize(self):
@@ -25,30 +35,20 @@ class AssetDiscoverer:
             print(f"Found {len(self.known_crypto_pairs)} USD-based crypto pairs on Kraken.")
         alpaca_assets = self.rest['stock'].get_tradable_assets()
         if alpaca_assets:
-            self.known_stock_tickers = alpaca_assets
+            self.known_stock_tickers.update(alpaca_assets)
             print(f"Found {len(self.known_stock_tickers)} tradable stocks on Alpaca.")
             for stock in self.known_stock_tickers: self.engine.add_asset(stock, 'stock')
 
     async def _extract_tickers_with_ai(self, text):
-        prompt = f"Analyze: '{text}'. Extract potential stock tickers (like 'TSLA', 'AAPL') and crypto tickers (like 'BTC', 'ETH'). Ignore common words. If none, return empty list."
-        payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}],
-                   "generationConfig": {"responseMimeType": "application/json", "responseSchema": {"type": "OBJECT",
-                                                                                                   "properties": {
-                                                                                                       "tickers": {
-                                                                                                           "type": "ARRAY",
-                                                                                                           "items": {
-                                                                                                               "type": "STRING"}}}}}}
-        try:
-            api_key = self.config.GEMINI_API_KEY
-            api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
-            async with aiohttp.ClientSession() as s:
-                async with s.post(api_url, json=payload) as r:
-                    if r.status == 200:
-                        res = await r.json();
-                        return json_parser.loads(res['candidates'][0]['content']['parts'][0]['text']).get("tickers", [])
-                    return []
-        except:
-            return []
+        return await self.llm.extract(text)
+
+    async def _extract_tickers(self, text):
+        """Local rules first; the LLM only sees posts the rules could not classify."""
+        tickers, unresolved = self.extractor.extract(text)
+        if not tickers and unresolved and self.config.DISCOVERY_LLM_FALLBACK:
+            self.llm_fallback_calls += 1
+            return await self._extract_tickers_with_ai(text)
+        return tickers
 
     async def _validate_and_add_asset(self, ticker, asset_class):
         if asset_class == 'crypto':
@@ -65,27 +65,44 @@ class AssetDiscoverer:
         print("Asset Discoverer listening...")
         while True:
             data = await self.data_queue.get()
-            if data.get('type') in ('social_post', 'news_post'):
-                tickers = await self._extract_tickers_with_ai(data['text'])
-                for ticker in tickers:
-                    ticker_upper = ticker.upper()
-                    asset_class = None
-                    if ticker_upper in self.known_stock_tickers:
-                        asset_class = 'stock'
-                    elif f"{ticker_upper}/USD" in self.known_crypto_pairs:
-                        asset_class = 'crypto'
-                    else:
-                        continue  # Not a known asset, ignore
+            if data.type in ('social_post', 'news_post'):
+                # Posts are handled concurrently so LLM fallbacks can share a batch
+                # and do not hold up the posts the local rules resolve.
+                await self._in_flight.acquire()
+                task = asyncio.create_task(self._process_post(data))
+                self._tasks.add(task)
+                task.add_done_callback(self._post_done)
+
+    def _post_done(self, task):
+        self._tasks.discard(task)
+        self._in_flight.release()
+        if not task.cancelled() and task.exception():
+            print(f"ASSET_DISCOVERER_ERROR: {task.exception()}")
+
+    async def _process_post(self, data):
+        tickers = await self._extract_tickers(data.text)
+        for ticker in tickers:
+            ticker_upper = ticker.upper()
+            asset_class = None
+            if ticker_upper in self.known_stock_tickers:
+                asset_class = 'stock'
+            elif f"{ticker_upper}/USD" in self.known_crypto_pairs:
+                asset_class = 'crypto'
+            else:
+                continue  # Not a known asset, ignore
 
-                    ws_client = self.ws[asset_class]
-                    asset_name = f"{ticker_upper}/USD" if asset_class == 'crypto' else ticker_upper
-                    if asset_name in ws_client._subscribed_assets: continue
+            ws_client = self.ws[asset_class]
+            asset_name = f"{ticker_upper}/USD" if asset_class == 'crypto' else ticker_upper
+            if asset_name in ws_client._subscribed_assets or ticker in self._validating: continue
 
-                    now = time.time()
-                    self.potential_assets[ticker].append(now)
-                    self.potential_assets[ticker] = [ts for ts in self.potential_assets[ticker] if
-                                                     now - ts < self.config.DISCOVERY_TIMEFRAME_SECONDS]
-                    if len(self.potential_assets[ticker]) >= self.config.DISCOVERY_MENTION_THRESHOLD:
-                        print(f"DISCOVERY | High mention count for {ticker}. Validating...")
-                        await self._validate_and_add_asset(ticker, asset_class)
-            await asyncio.sleep(0.01)
\ No newline at end of file
+            now = time.time()
+            self.potential_assets[ticker].append(now)
+            self.potential_assets[ticker] = [ts for ts in self.potential_assets[ticker] if
+                                             now - ts < self.config.DISCOVERY_TIMEFRAME_SECONDS]
+            if len(self.potential_assets[ticker]) >= self.config.DISCOVERY_MENTION_THRESHOLD:
+                print(f"DISCOVERY | High mention count for {ticker}. Validating...")
+                self._validating.add(ticker)
+                try:
+                    await self._validate_and_add_asset(ticker, asset_class)
+                finally:
+                    self._validating.discard(ticker)
@@ -0,0 +1,43 @@
+# ==============================================================================
+# File: conflator.py
+# NEW FILE: Keeps only the newest pending tick per symbol.
+# ==============================================================================
+import asyncio
+
+
+class TickConflator:
+    """One latest-value slot per symbol between ingestion and technical analysis.
+
+    ``offer`` overwrites the symbol's pending tick if the consumer has not taken
+    it yet; ``drain`` waits for at least one pending tick and hands over all of
+    them at once, in the order the symbols first became pending. Work
+    downstream is therefore bounded by the number of symbols, not the tick rate.
+    """
+
+    def __init__(self):
+        self._slots = {}
+        self._ready = asyncio.Event()
+        self.offered = self.conflated = self.drained = 0
+
+    def offer(self, tick):
+        symbol = tick.symbol
+        self.offered += 1
+        if symbol in self._slots:
+            self.conflated += 1
+        self._slots[symbol] = tick
+        self._ready.set()
+
+    async def drain(self):
+        await self._ready.wait()
+        self._ready.clear()
+        ticks, self._slots = list(self._slots.values()), {}
+        self.drained += len(ticks)
+        return ticks
+
+    def stats(self):
+        return {
+            'offered': self.offered,
+            'conflated': self.conflated,
+            'drained': self.drained,
+            'pending_symbols': len(self._slots),
+        }
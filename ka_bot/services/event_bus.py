@@ -0,0 +1,88 @@
+# ==============================================================================
+# File: event_bus.py
+# NEW FILE: In-process pub/sub with one bounded queue per subscriber.
+# ==============================================================================
+import asyncio
+import time
+from collections import defaultdict
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+
+class Subscription:
+    """A subscriber's bounded mailbox. Consumers call ``await get()`` like a queue."""
+
+    def __init__(self, name, types, maxsize, overflow):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        self.name, self.types, self.overflow = name, frozenset(types), overflow
+        self._queue = asyncio.Queue(maxsize)
+        self.delivered = self.consumed = self.dropped = self.high_water = 0
+        self.last_lag = 0.0
+
+    async def offer(self, message):
+        item = (time.monotonic(), message)
+        queue = self._queue
+        if queue.full():
+            if self.overflow == 'drop_newest':
+                self.dropped += 1
+                return
+            if self.overflow == 'drop_oldest':
+                queue.get_nowait()
+                self.dropped += 1
+        if self.overflow == 'block':
+            await queue.put(item)
+        else:
+            queue.put_nowait(item)
+        self.delivered += 1
+        if queue.qsize() > self.high_water:
+            self.high_water = queue.qsize()
+
+    async def get(self):
+        enqueued_at, message = await self._queue.get()
+        self.consumed += 1
+        self.last_lag = time.monotonic() - enqueued_at
+        return message
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        return {
+            'types': sorted(self.types),
+            'overflow': self.overflow,
+            'depth': self._queue.qsize(),
+            'high_water': self.high_water,
+            'delivered': self.delivered,
+            'consumed': self.consumed,
+            'dropped': self.dropped,
+            'lag_ms': round(self.last_lag * 1000, 2),
+        }
+
+
+class EventBus:
+    """Fans each published message out to every subscriber of its ``type``.
+
+    Subscribers share the same message object (nothing is copied), so they must
+    treat messages as read-only. A slow subscriber only fills its own queue;
+    what happens then is its overflow policy: ``block`` the publisher, or drop
+    the oldest / newest message.
+    """
+
+    def __init__(self):
+        self._by_type = defaultdict(list)
+        self.subscriptions = {}
+
+    def subscribe(self, name, types, maxsize=1000, overflow='block'):
+        subscription = Subscription(name, types, maxsize, overflow)
+        self.subscriptions[name] = subscription
+        for message_type in subscription.types:
+            self._by_type[message_type].append(subscription)
+        return subscription
+
+    async def publish(self, message):
+        for subscription in self._by_type.get(message.type, ()):
+            await subscription.offer(message)
+
+    def stats(self):
+        return {name: subscription.stats() for name, subscription in self.subscriptions.items()}
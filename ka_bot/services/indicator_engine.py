@@ -0,0 +1,151 @@
+# ==============================================================================
+# File: indicator_engine.py
+# NEW FILE: Streaming (O(1) per tick) versions of the TechnicalAnalyzer indicators.
+# ==============================================================================
+import math
+
+MIN_HISTORY = 51
+RSI_LENGTH = 14
+SMA_SHORT = 20
+SMA_LONG = 50
+BBANDS_STD = 2.0
+VOLATILITY_WINDOW = 20
+# Running sums drift slightly with every add/remove, so they are rebuilt
+# from the window every RESYNC_INTERVAL ticks (amortised O(1)).
+RESYNC_INTERVAL = 1000
+
+
+class _RollingWindowStats:
+    """Sliding-window mean and sum of squared deviations (Welford)."""
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x_in, x_out=None):
+        if x_out is None:
+            self.count += 1
+            delta = x_in - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x_in - self.mean)
+        else:
+            old_mean = self.mean
+            self.mean += (x_in - x_out) / self.count
+            self.m2 += (x_in - x_out) * (x_in - self.mean + x_out - old_mean)
+            if self.m2 < 0.0:
+                self.m2 = 0.0
+
+    def reset(self, values):
+        self.count = len(values)
+        self.mean = math.fsum(values) / self.count if self.count else 0.0
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in values)
+
+    def std(self, ddof):
+        if self.count - ddof <= 0:
+            return float('nan')
+        return math.sqrt(self.m2 / (self.count - ddof))
+
+
+def _pct_change(price, prev):
+    return price / prev - 1.0 if prev != 0 else float('nan')
+
+
+class StreamingIndicators:
+    """Per-symbol indicator state updated incrementally on every tick.
+
+    Reproduces what TechnicalAnalyzer used to compute with pandas_ta over the
+    symbol's PriceHistory window (200 ticks):
+
+    * RSI_14 - pandas_ta's Wilder RSI, i.e. an adjusted EWM (alpha=1/14) of the
+      positive/negative price changes inside the window. The EWM is kept as a
+      running weighted sum; the change that falls out of the window is removed
+      with its known weight.
+    * SMA_20 / SMA_50 - rolling means.
+    * Bollinger bands (20, 2.0) - SMA_20 +/- 2 population standard deviations.
+    * volatility - sample std of the last 20 percentage returns, times 100.
+
+    Only scalars are stored here; the prices themselves live in PriceHistory.
+    """
+    __slots__ = ('_rsi_decay', '_rsi_tail_weight', '_rsi_pos', '_rsi_neg',
+                 '_sma_short', '_sma_long', '_volatility', '_ticks')
+
+    def __init__(self):
+        self._rsi_decay = 1.0 - 1.0 / RSI_LENGTH
+        self._rsi_tail_weight = None
+        self._rsi_pos = 0.0
+        self._rsi_neg = 0.0
+        self._sma_short = _RollingWindowStats()
+        self._sma_long = _RollingWindowStats()
+        self._volatility = _RollingWindowStats()
+        self._ticks = 0
+
+    def update(self, history, evicted=None):
+        """Folds in the price just appended to ``history``.
+
+        ``evicted`` is the value ``PriceHistory.append`` returned. Returns the
+        indicator dict, or None while the history is still warming up.
+        """
+        n = len(history)
+        price = history.last(1)
+
+        if n > 1:
+            prev = history.last(2)
+            change = price - prev
+            decay = self._rsi_decay
+            self._rsi_pos = decay * self._rsi_pos + (change if change > 0 else 0.0)
+            self._rsi_neg = decay * self._rsi_neg + (-change if change < 0 else 0.0)
+            if evicted is not None:
+                # The change between the evicted price and the new oldest one
+                # has just left the window.
+                if self._rsi_tail_weight is None:
+                    self._rsi_tail_weight = decay ** (history.capacity - 1)
+                dropped = history.oldest() - evicted
+                if dropped > 0:
+                    self._rsi_pos -= self._rsi_tail_weight * dropped
+                elif dropped < 0:
+                    self._rsi_neg += self._rsi_tail_weight * dropped
+
+            ret_out = (_pct_change(history.last(VOLATILITY_WINDOW + 1), history.last(VOLATILITY_WINDOW + 2))
+                       if n > VOLATILITY_WINDOW + 1 else None)
+            self._volatility.push(_pct_change(price, prev), ret_out)
+
+        self._sma_short.push(price, history.last(SMA_SHORT + 1) if n > SMA_SHORT else None)
+        self._sma_long.push(price, history.last(SMA_LONG + 1) if n > SMA_LONG else None)
+
+        self._ticks += 1
+        if self._ticks % RESYNC_INTERVAL == 0:
+            self._resync(history)
+
+        if n < MIN_HISTORY:
+            return None
+        return self.snapshot()
+
+    def snapshot(self):
+        gains, losses = self._rsi_pos, self._rsi_neg
+        total = gains + losses
+        rsi = 100.0 * gains / total if total > 0 else float('nan')
+        sma_20 = self._sma_short.mean
+        deviation = BBANDS_STD * self._sma_short.std(ddof=0)
+        return {
+            'rsi': rsi,
+            'sma_20': sma_20,
+            'sma_50': self._sma_long.mean,
+            'upper_bollinger': sma_20 + deviation,
+            'lower_bollinger': sma_20 - deviation,
+            'volatility': self._volatility.std(ddof=1) * 100,
+        }
+
+    def _resync(self, history):
+        prices = history.window().tolist()
+        pos = neg = 0.0
+        for prev, cur in zip(prices, prices[1:]):
+            change = cur - prev
+            pos = self._rsi_decay * pos + (change if change > 0 else 0.0)
+            neg = self._rsi_decay * neg + (-change if change < 0 else 0.0)
+        self._rsi_pos, self._rsi_neg = pos, neg
+        self._sma_short.reset(prices[-SMA_SHORT:])
+        self._sma_long.reset(prices[-SMA_LONG:])
+        recent = prices[-(VOLATILITY_WINDOW + 1):]
+        self._volatility.reset([_pct_change(cur, prev) for prev, cur in zip(recent, recent[1:])])
@@ -0,0 +1,107 @@
+# ==============================================================================
+# File: indicator_shards.py
+# NEW FILE: Runs indicator math on N symbol-sharded thread or process workers.
+# ==============================================================================
+import asyncio
+import multiprocessing
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from services.indicator_engine import StreamingIndicators
+from services.price_history import PriceHistory
+
+SHARD_MODES = ('thread', 'process')
+
+
+class IndicatorShard:
+    """Price history and indicator state for the symbols owned by one worker."""
+
+    def __init__(self):
+        self.price_history = defaultdict(PriceHistory)
+        self.indicator_state = defaultdict(StreamingIndicators)
+
+    def process(self, batch):
+        """batch: [(symbol, timestamp, price)] -> [indicators dict or None], same order."""
+        results = []
+        for symbol, timestamp, price in batch:
+            history = self.price_history[symbol]
+            evicted = history.append(timestamp, price)
+            results.append(self.indicator_state[symbol].update(history, evicted))
+        return results
+
+
+# In process mode every worker process holds exactly one shard.
+_process_shard = None
+
+
+def _init_process_shard():
+    global _process_shard
+    _process_shard = IndicatorShard()
+
+
+def _process_in_worker(batch):
+    return _process_shard.process(batch)
+
+
+def shard_for(symbol, num_shards):
+    """Stable across runs and processes, unlike hash()."""
+    return zlib.crc32(symbol.encode()) % num_shards
+
+
+class ShardedIndicatorPool:
+    """Hashes each symbol to one of ``num_shards`` single-worker executors.
+
+    A shard runs its batches one after another, so ticks for a symbol are
+    processed in submission order while different shards run in parallel.
+    ``process`` mode gives every shard its own interpreter and scales with
+    cores. Under spawn each worker re-imports the launching script, so main.py
+    keeps heavy imports (the sentiment model) out of module level.
+    ``thread`` mode keeps everything in-process; the indicator update is pure
+    Python under the GIL, so it does not run faster than inline and is only
+    meant for debugging.
+    """
+
+    def __init__(self, num_shards, mode='process'):
+        if mode not in SHARD_MODES:
+            raise ValueError(f"Unknown shard mode '{mode}', expected one of {SHARD_MODES}")
+        self.num_shards, self.mode = num_shards, mode
+        if mode == 'thread':
+            self._shards = [IndicatorShard() for _ in range(num_shards)]
+            self._executors = [ThreadPoolExecutor(1, thread_name_prefix=f'ta-shard-{i}') for i in range(num_shards)]
+        else:
+            # spawn, not fork: the parent already runs threads (Alpaca stream, inference worker).
+            context = multiprocessing.get_context('spawn')
+            self._executors = [ProcessPoolExecutor(1, mp_context=context, initializer=_init_process_shard)
+                               for _ in range(num_shards)]
+        self.batches = [0] * num_shards
+        self.ticks = [0] * num_shards
+
+    def _submit(self, shard, batch):
+        if self.mode == 'thread':
+            return self._executors[shard].submit(self._shards[shard].process, batch)
+        return self._executors[shard].submit(_process_in_worker, batch)
+
+    async def process(self, batch):
+        """Computes indicators for [(symbol, timestamp, price)]; results line up with the input."""
+        by_shard = defaultdict(list)
+        for position, item in enumerate(batch):
+            by_shard[shard_for(item[0], self.num_shards)].append((position, item))
+        futures = []
+        for shard, entries in by_shard.items():
+            self.batches[shard] += 1
+            self.ticks[shard] += len(entries)
+            futures.append(asyncio.wrap_future(self._submit(shard, [item for _, item in entries])))
+        results = [None] * len(batch)
+        for entries, shard_results in zip(by_shard.values(), await asyncio.gather(*futures)):
+            for (position, _), indicators in zip(entries, shard_results):
+                results[position] = indicators
+        return results
+
+    def close(self):
+        """Cancels queued batches and waits for the workers to exit; blocking, so use asyncio.to_thread."""
+        for executor in self._executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self):
+        return {'mode': self.mode, 'shards': self.num_shards, 'batches': self.batches, 'ticks': self.ticks}
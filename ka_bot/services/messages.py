@@ -0,0 +1,40 @@
+# ==============================================================================
+# File: messages.py
+# NEW FILE: Slot-based message types passed through the ingestion pipeline.
+# ==============================================================================
+
+
+class MarketTick:
+    """One price update from Kraken or Alpaca."""
+    __slots__ = ('symbol', 'price', 'asset_class', 'source', 'trace')
+    type = 'market_data'
+
+    def __init__(self, symbol, price, asset_class, source, trace=None):
+        self.symbol = symbol
+        self.price = price
+        self.asset_class = asset_class
+        self.source = source
+        self.trace = trace
+
+    def __repr__(self):
+        return f"MarketTick({self.source}:{self.symbol} @ {self.price})"
+
+
+class SocialPost:
+    """A stored Reddit comment, referenced by its social_posts id."""
+    __slots__ = ('text', 'post_id', 'trace')
+    type = 'social_post'
+
+    def __init__(self, text, post_id, trace=None):
+        self.text = text
+        self.post_id = post_id
+        self.trace = trace
+
+    def __repr__(self):
+        return f"{type(self).__name__}(#{self.post_id}: {self.text[:40]!r})"
+
+
+class NewsPost(SocialPost):
+    """A stored RSS headline and summary."""
+    __slots__ = ()
+    type = 'news_post'
@@ -0,0 +1,215 @@
+# ==============================================================================
+# File: metrics.py
+# NEW FILE: Minimal Prometheus-style counters, gauges and histograms.
+# ==============================================================================
+import abc
+import threading
+import time
+from bisect import bisect_left
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Seconds; covers everything from one indicator update to a slow DB flush.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(abc.ABC):
+    """Labelled metric family. Unlabelled metrics forward inc/set/observe to their only child."""
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+        registry.register(self)
+
+    def labels(self, *values):
+        """Child for these label values; callers on hot paths should keep the returned object."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        values = tuple(str(v) for v in values)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """A fresh per-label-set value holder."""
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            labels = tuple(zip(self.labelnames, values))
+            for suffix, extra, value in child.samples():
+                yield suffix, labels + extra, value
+
+
+class _Value:
+    __slots__ = ('_lock', 'value')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        yield '', (), self.value
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    """Settable gauge.
+
+    Values are read on the status-server thread, so state owned by the event
+    loop (queue depths, ...) should be sampled on the loop and ``set`` here
+    rather than computed at scrape time.
+    """
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value):
+        self._default.set(value)
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def dec(self, amount=1):
+        self._default.dec(amount)
+
+
+class _HistogramValue:
+    __slots__ = ('_lock', '_bounds', '_counts', '_sum', '_count')
+
+    def __init__(self, bounds):
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value):
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def time(self):
+        return _Timer(self)
+
+    def samples(self):
+        with self._lock:
+            counts, total, count = list(self._counts), self._sum, self._count
+        cumulative = 0
+        for bound, bucket in zip(self._bounds + (float('inf'),), counts):
+            cumulative += bucket
+            yield '_bucket', (('le', _format_value(float(bound))),), cumulative
+        yield '_sum', (), total
+        yield '_count', (), count
+
+
+class _Timer:
+    __slots__ = ('_histogram', '_started')
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._started)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def time(self):
+        """Context manager that observes the elapsed seconds."""
+        return self._default.time()
+
+
+# --- Pipeline metrics (one catalogue, so names and labels stay consistent) ---
+MESSAGES_RECEIVED = Counter('kabot_messages_received_total', 'Messages received from each data source',
+                            ('source',))
+QUEUE_DEPTH = Gauge('kabot_queue_depth', 'Items waiting in each pipeline queue', ('queue',))
+TA_COMPUTE_SECONDS = Histogram('kabot_ta_compute_seconds', 'Indicator computation time per conflated batch')
+TA_TICKS = Counter('kabot_ta_ticks_total', 'Ticks run through technical analysis')
+INFERENCE_SECONDS = Histogram('kabot_sentiment_inference_seconds', 'FinBERT forward pass time per batch')
+INFERENCE_TEXTS = Counter('kabot_sentiment_texts_total', 'Texts scored by FinBERT')
+DB_WRITE_SECONDS = Histogram('kabot_db_write_seconds', 'Bulk insert time per table and flush', ('table',))
+DB_ROWS_WRITTEN = Counter('kabot_db_rows_written_total', 'Rows written by the write-behind queue', ('table',))
+ORDERS_PLACED = Counter('kabot_orders_placed_total', 'Orders sent to a trader', ('asset_class', 'side'))
@@ -9,10 +9,11 @@ class MockTrader:
         self.cash = 10000.0
         self.crypto_portfolio = {}
         self.stock_portfolio = {}
+        self._orders = {}  # client_order_id -> fill, for find_order
         print(f"MOCK Trader Initialized. Cash: ${self.cash:,.2f}")
 
     async def place_order(self, pair, o_type, side, vol, current_price, signal_id, asset_class, **kwargs):
-        asset_id = self._db.get_or_create_asset(pair, asset_class)
+        asset_id = await self._db.get_or_create_asset(pair, asset_class)
         portfolio = self.crypto_portfolio if asset_class == 'crypto' else self.stock_portfolio
 
         if side == 'buy':
@@ -21,7 +22,8 @@ class MockTrader:
                 self.cash -= trade_cost
                 portfolio[pair] = portfolio.get(pair, 0) + vol
                 print(f"MOCK {asset_class.upper()} BUY: {vol:.6f} of {pair} @ ${current_price:,.2f}")
-                self._db.execute_query("INSERT INTO trades (signal_id, asset_id, trade_type, price, volume, total_usd, timestamp) VALUES (%s, %s, %s, %s, %s, %s, %s);", (signal_id, asset_id, 'buy', current_price, vol, trade_cost, datetime.now(timezone.utc)))
+                self._db.writer.put('trades', (signal_id, asset_id, 'buy', current_price, vol, trade_cost, datetime.now(timezone.utc)))
+                return self._record({'client_order_id': kwargs.get('client_order_id'), 'side': 'buy', 'volume': vol})
         elif side == 'sell':
             volume_to_sell = portfolio.get(pair, 0)
             if volume_to_sell > 0:
@@ -29,4 +31,14 @@ class MockTrader:
                 self.cash += trade_value
                 portfolio[pair] = 0
                 print(f"MOCK {asset_class.upper()} SELL: {volume_to_sell:.6f} of {pair} @ ${current_price:,.2f}")
-                self._db.execute_query("INSERT INTO trades (signal_id, asset_id, trade_type, price, volume, total_usd, timestamp) VALUES (%s, %s, %s, %s, %s, %s, %s);", (signal_id, asset_id, 'sell', current_price, volume_to_sell, trade_value, datetime.now(timezone.utc)))
+                self._db.writer.put('trades', (signal_id, asset_id, 'sell', current_price, volume_to_sell, trade_value, datetime.now(timezone.utc)))
+                return self._record({'client_order_id': kwargs.get('client_order_id'), 'side': 'sell', 'volume': volume_to_sell})
+        return None
+
+    def _record(self, fill):
+        if fill['client_order_id']:
+            self._orders[fill['client_order_id']] = fill
+        return fill
+
+    async def find_order(self, client_order_id):
+        return self._orders.get(client_order_id)
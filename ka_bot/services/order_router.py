@@ -0,0 +1,158 @@
+# ==============================================================================
+# File: order_router.py
+# NEW FILE: Queues orders per venue and submits them concurrently within rate limits.
+# ==============================================================================
+import asyncio
+import itertools
+import time
+import uuid
+
+from services.metrics import ORDERS_PLACED
+from services.tracing import TRACKER, mark
+
+
+class RetryableOrderError(Exception):
+    """Raised by a trader when the venue turned the order away but a retry may succeed (rate limit, busy)."""
+
+
+class TokenBucket:
+    """``rate`` tokens per second, bursts up to ``capacity``. Waiters are served in order."""
+
+    def __init__(self, rate, capacity):
+        self.rate, self.capacity = rate, capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = None
+        self.waited = 0.0
+
+    async def acquire(self, cost=1):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                delay = (cost - self._tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+
+
+class OrderRequest:
+    __slots__ = ('client_order_id', 'asset_class', 'symbol', 'side', 'volume', 'price', 'signal_id', 'order_type',
+                 'time_in_force', 'trace', 'tick_trace', 'attempts')
+
+    def __init__(self, client_order_id, asset_class, symbol, side, volume, price, signal_id, order_type='market',
+                 time_in_force='gtc', trace=None, tick_trace=None):
+        self.client_order_id, self.asset_class, self.symbol = client_order_id, asset_class, symbol
+        self.side, self.volume, self.price, self.signal_id = side, volume, price, signal_id
+        self.order_type, self.time_in_force = order_type, time_in_force
+        self.trace, self.tick_trace = trace, tick_trace
+        self.attempts = 0
+
+
+class _Venue:
+    def __init__(self, name, trader, rate, burst, max_pending):
+        self.name, self.trader = name, trader
+        self.bucket = TokenBucket(rate, burst)
+        self.queue = asyncio.Queue(max_pending)
+        self.counts = dict.fromkeys(('queued', 'placed', 'rejected', 'failed', 'retries', 'recovered', 'dropped'), 0)
+
+
+class OrderRouter:
+    """Takes orders from the strategy without waiting on the exchange.
+
+    ``submit`` assigns a client order id and queues the order for its venue
+    (``asset_class``). Each venue has ``workers`` submitters that share one
+    token bucket, so orders go out concurrently but never faster than the
+    venue's limit. Failures that raise are retried with backoff under the same
+    client order id; a trader returning None is a final rejection.
+
+    Only RetryableOrderError says the venue did not take the order. After any
+    other error (timeout, dropped connection, lost ack) the order may well
+    exist, and venues do not reliably refuse a repeated id (Kraken only checks
+    it against *open* orders, and a filled market order is closed), so the
+    next attempt first asks the trader's ``find_order`` and only resubmits if
+    the venue has no such order.
+    """
+
+    def __init__(self, traders, limits, workers=4, max_pending=1000, max_retries=3):
+        self._venues = {name: _Venue(name, trader, *limits[name], max_pending) for name, trader in traders.items()}
+        self.workers, self.max_retries = workers, max_retries
+        self._ids = itertools.count(1)
+        self._prefix = uuid.uuid4().hex[:8]
+
+    def submit(self, symbol, side, volume, asset_class, price, signal_id, trace=None, tick_trace=None, **kwargs):
+        """Queues an order and returns its client order id, or None if the venue's queue is full."""
+        venue = self._venues[asset_class]
+        order = OrderRequest(f"kab-{self._prefix}-{next(self._ids)}", asset_class, symbol, side, volume, price,
+                             signal_id, trace=trace, tick_trace=tick_trace, **kwargs)
+        try:
+            venue.queue.put_nowait(order)
+        except asyncio.QueueFull:
+            venue.counts['dropped'] += 1
+            print(f"ORDER_ROUTER | {asset_class} queue full, dropping {side} {symbol}")
+            return None
+        venue.counts['queued'] += 1
+        return order.client_order_id
+
+    async def run(self):
+        print(f"Order router started ({self.workers} submitters per venue).")
+        await asyncio.gather(*(self._submitter(venue) for venue in self._venues.values()
+                               for _ in range(self.workers)))
+
+    async def _submitter(self, venue):
+        while True:
+            order = await venue.queue.get()
+            try:
+                await self._place(venue, order)
+            except Exception as e:
+                venue.counts['failed'] += 1
+                print(f"ORDER_ROUTER_ERROR: {order.client_order_id} {order.side} {order.symbol}: {e}")
+
+    async def _place(self, venue, order):
+        uncertain = False  # whether an earlier attempt may have reached the venue
+        while True:
+            await venue.bucket.acquire()
+            order.attempts += 1
+            try:
+                if uncertain:
+                    result = await venue.trader.find_order(order.client_order_id)
+                    if result is not None:
+                        venue.counts['recovered'] += 1
+                        break
+                    uncertain = False
+                result = await venue.trader.place_order(
+                    order.symbol, order.order_type, order.side, order.volume, current_price=order.price,
+                    signal_id=order.signal_id, asset_class=order.asset_class, time_in_force=order.time_in_force,
+                    client_order_id=order.client_order_id)
+            except Exception as e:
+                uncertain = uncertain or not isinstance(e, RetryableOrderError)
+                if order.attempts > self.max_retries:
+                    if uncertain:
+                        print(f"ORDER_ROUTER | Giving up on {order.client_order_id}; it may have been placed.")
+                    raise
+                venue.counts['retries'] += 1
+                print(f"ORDER_ROUTER | Retrying {order.client_order_id} after: {e!r}")
+                await asyncio.sleep(min(10.0, 0.5 * 2 ** (order.attempts - 1)))
+                continue
+            break
+
+        if result is None:
+            venue.counts['rejected'] += 1
+            return
+        venue.counts['placed'] += 1
+        ORDERS_PLACED.labels(order.asset_class, order.side).inc()
+        # How old the post and the price were when the order reached the exchange.
+        trace = mark(order, 'order_submitted')
+        TRACKER.record('post_to_order', trace, 'order_submitted', order.symbol)
+        if order.tick_trace is not None and trace is not None:
+            TRACKER.record('tick_to_order', {**order.tick_trace, 'order_submitted': trace['order_submitted']},
+                           'order_submitted', order.symbol)
+
+    def stats(self):
+        return {name: {**venue.counts, 'pending': venue.queue.qsize(), 'throttled_s': round(venue.bucket.waited, 2)}
+                for name, venue in self._venues.items()}
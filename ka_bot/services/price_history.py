@@ -0,0 +1,67 @@
+# ==============================================================================
+# File: price_history.py
+# NEW FILE: Fixed-capacity NumPy ring buffer of (timestamp, price) per symbol.
+# ==============================================================================
+import numpy as np
+
+DEFAULT_CAPACITY = 200
+
+
+class PriceHistory:
+    """Bounded tick history for one symbol.
+
+    Every value is written twice, at ``i`` and ``i + capacity``, so the newest
+    ``n`` entries are always one contiguous slice. That lets ``window()`` hand out
+    read-only NumPy views without copying. Memory is fixed at construction:
+    two float64 arrays of ``2 * capacity`` entries (``nbytes``).
+    """
+    __slots__ = ('capacity', '_times', '_prices', '_pos', '_size')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._times = np.zeros(2 * capacity, dtype=np.float64)
+        self._prices = np.zeros(2 * capacity, dtype=np.float64)
+        self._pos = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        return self._times.nbytes + self._prices.nbytes
+
+    def append(self, timestamp, price):
+        """Stores a tick and returns the price it evicted, or None if not yet full."""
+        pos, cap = self._pos, self.capacity
+        evicted = float(self._prices[pos]) if self._size == cap else None
+        self._times[pos] = self._times[pos + cap] = timestamp
+        self._prices[pos] = self._prices[pos + cap] = price
+        self._pos = pos + 1 if pos + 1 < cap else 0
+        if self._size < cap:
+            self._size += 1
+        return evicted
+
+    def last(self, k=1):
+        """Returns the k-th most recent price (k=1 is the latest)."""
+        if not 0 < k <= self._size:
+            raise IndexError(f"PriceHistory holds {self._size} prices, asked for #{k} from the end")
+        return float(self._prices[self._pos + self.capacity - k])
+
+    def oldest(self):
+        return self.last(self._size)
+
+    def window(self, n=None):
+        """Read-only view of the newest n prices, oldest first."""
+        return self._view(self._prices, n)
+
+    def time_window(self, n=None):
+        """Read-only view of the timestamps matching ``window(n)``."""
+        return self._view(self._times, n)
+
+    def _view(self, array, n):
+        n = self._size if n is None else min(n, self._size)
+        end = self._pos + self.capacity
+        view = array[end - n:end]
+        view.flags.writeable = False
+        return view
@@ -1,63 +1,77 @@
 # ==============================================================================
 # File: technical_analyzer.py
 # ==============================================================================
-import pandas as pd
-import pandas_ta as ta
 from collections import defaultdict
 from datetime import datetime, timezone
+from services.indicator_shards import IndicatorShard
+from services.price_history import PriceHistory
+from services.metrics import TA_COMPUTE_SECONDS, TA_TICKS
+from services.tracing import TRACKER, mark
 
 
 class TechnicalAnalyzer:
-    def __init__(self, config, db_manager):
+    def __init__(self, config, db_manager, shard_pool=None):
         self.config = config
         self.db = db_manager
-        self.price_history = defaultdict(lambda: pd.DataFrame(columns=['close']))
+        # Without a pool the indicator math runs inline on the event loop. With
+        # one, the pool owns the indicator state and this keeps a price history
+        # of its own for price_window().
+        self.shard_pool = shard_pool
+        self._local = IndicatorShard() if shard_pool is None else None
+        self.price_history = self._local.price_history if shard_pool is None else defaultdict(PriceHistory)
         self.latest_indicators = {}
         self.latest_prices = {}
+        self.latest_traces = {}  # symbol -> trace of the tick behind latest_prices
         print("Technical Analyzer initialized.")
 
+    def price_window(self, symbol, n=None):
+        """Read-only view of the newest n prices for symbol, or None if unseen."""
+        history = self.price_history.get(symbol)
+        return history.window(n) if history is not None else None
+
     async def process_data_point(self, data):
         """Processes a single data point to update indicators."""
-        if data.get('type') != 'market_data':
-            return
+        await self.process_batch([data])
 
-        if not all(k in data for k in ['symbol', 'price', 'asset_class']):
-            print(f"TECH_ANALYZER_WARNING: Skipping malformed market_data message: {data}")
-            return
-
-        try:
-            symbol, price, asset_class = data['symbol'], data['price'], data['asset_class']
+    async def process_batch(self, ticks):
+        """Updates indicators for a batch of MarketTicks; ticks of one symbol must be in arrival order."""
+        batch, classes, messages = [], [], []
+        for data in ticks:
+            if data.type != 'market_data':
+                continue
+            symbol, price = data.symbol, data.price
             timestamp = datetime.now(timezone.utc)
             self.latest_prices[symbol] = price
+            if self._local is None:
+                self.price_history[symbol].append(timestamp.timestamp(), price)
+            batch.append((symbol, timestamp.timestamp(), price))
+            classes.append((timestamp, data.asset_class))
+            messages.append(data)
+        if not batch:
+            return
 
-            new_row = pd.DataFrame([{'close': price}], index=[timestamp])
-            self.price_history[symbol] = pd.concat([self.price_history[symbol], new_row]).tail(200)
-
-            if len(self.price_history[symbol]) > 50:
-                df = self.price_history[symbol]
-                df.ta.rsi(length=14, append=True)
-                df.ta.sma(length=20, append=True)
-                df.ta.sma(length=50, append=True)
-                df.ta.bbands(length=20, append=True)
-
-                df['pct_change'] = df['close'].pct_change()
-                df['volatility'] = df['pct_change'].rolling(window=20).std() * 100
+        try:
+            with TA_COMPUTE_SECONDS.time():
+                if self._local is not None:
+                    results = self._local.process(batch)
+                else:
+                    results = await self.shard_pool.process(batch)
+            TA_TICKS.inc(len(batch))
+            for data in messages:
+                trace = mark(data, 'ta_done')
+                if trace is not None:
+                    self.latest_traces[data.symbol] = trace
+                    TRACKER.record('tick_to_ta', trace, 'ta_done', data.symbol)
 
-                latest = df.iloc[-1]
-                self.latest_indicators[symbol] = {
-                    'rsi': latest.get('RSI_14'),
-                    'sma_20': latest.get('SMA_20'),
-                    'sma_50': latest.get('SMA_50'),
-                    'upper_bollinger': latest.get('BBU_20_2.0'),
-                    'lower_bollinger': latest.get('BBL_20_2.0'),
-                    'volatility': latest.get('volatility')
-                }
-                asset_id = self.db.get_or_create_asset(symbol, asset_class)
-                self.db.execute_query(
-                    "INSERT INTO technical_indicators (asset_id, timestamp, rsi, sma_20, sma_50, upper_bollinger, lower_bollinger) VALUES (%s, %s, %s, %s, %s, %s, %s) ON CONFLICT (asset_id, timestamp) DO NOTHING;",
-                    (asset_id, timestamp, latest.get('RSI_14'), latest.get('SMA_20'), latest.get('SMA_50'),
-                     latest.get('BBU_20_2.0'), latest.get('BBL_20_2.0')))
+            for (symbol, _, _), (timestamp, asset_class), indicators in zip(batch, classes, results):
+                if indicators is None:
+                    continue
+                self.latest_indicators[symbol] = indicators
+                asset_id = await self.db.get_or_create_asset(symbol, asset_class)
+                self.db.writer.put('technical_indicators', (
+                    asset_id, timestamp, indicators['rsi'], indicators['sma_20'], indicators['sma_50'],
+                    indicators['upper_bollinger'], indicators['lower_bollinger']))
                 print(
                     f"TA_LOG | Calculated indicators for {symbol} | RSI: {self.latest_indicators[symbol].get('rsi'):.2f}")
         except Exception as e:
-            print(f"TECH_ANALYZER_ERROR: An unexpected error occurred during processing: {e}")
\ No newline at end of file
+            print(f"TECH_ANALYZER_ERROR: An unexpected error occurred during processing: {e}")
@@ -0,0 +1,64 @@
+# ==============================================================================
+# File: ticker_extractor.py
+# NEW FILE: Rule-based ticker extraction for AssetDiscoverer.
+# ==============================================================================
+import re
+
+CASHTAG = re.compile(r'\$([A-Za-z]{1,6})(?![A-Za-z])')
+UPPER_TOKEN = re.compile(r'(?<![A-Za-z$])([A-Z]{2,5})(?![A-Za-z])')
+WORD = re.compile(r'[a-z]{3,}')
+
+# Upper-case tokens that show up in finance chatter but are almost never the
+# ticker being discussed. Cashtags bypass this list.
+STOP_WORDS = frozenset("""
+    AI ALL AM AN AND ANY API ARE AS AT ATH ATL BE BIG BS BUY BY CAN CEO CFO CPI CTO DCA DD DM DO DOJ ECB EDIT
+    EOD EOW EPS ETF EU EV FAQ FBI FD FDA FED FOMO FOR FTC FUD FY GDP GO GOT HAS HE HODL HOLD I IF IMO IN
+    IPO IRA IRS IS IT ITM LOL LOSS MACD MOON NEW NFT NO NOT NOW NYSE OF OH OK ON ONE OP OR OTM OUT PE
+    PM PR PT RSI SEC SEE SELL SO THE TL TLDR TO UK UP US USA USD VS WE WSB YES YOLO YOU YTD
+""".split())
+
+# Common names for the larger coins, mapped to their base symbol.
+CRYPTO_NAMES = {
+    'bitcoin': 'BTC', 'ethereum': 'ETH', 'ether': 'ETH', 'solana': 'SOL', 'dogecoin': 'DOGE',
+    'cardano': 'ADA', 'ripple': 'XRP', 'litecoin': 'LTC', 'polkadot': 'DOT', 'chainlink': 'LINK',
+    'avalanche': 'AVAX', 'polygon': 'MATIC', 'shiba': 'SHIB',
+}
+
+
+class LocalTickerExtractor:
+    """Pulls known tickers out of a post without calling an LLM.
+
+    Candidates are cashtags (``$TSLA``), standalone upper-case tokens of 2-5
+    letters that are not stop words, and well-known coin names. A candidate is
+    kept only if it is in ``known_stock_tickers`` or ``{candidate}/USD`` is in
+    ``known_crypto_pairs`` (both held by reference, so later additions count).
+    """
+
+    def __init__(self, known_stock_tickers, known_crypto_pairs, stop_words=STOP_WORDS):
+        self.known_stock_tickers, self.known_crypto_pairs = known_stock_tickers, known_crypto_pairs
+        self.stop_words = stop_words
+
+    def _is_known(self, ticker):
+        return ticker in self.known_stock_tickers or f"{ticker}/USD" in self.known_crypto_pairs
+
+    def extract(self, text):
+        """Returns (tickers, unresolved).
+
+        ``tickers`` are the known tickers found, in order of first mention.
+        ``unresolved`` are candidates that looked like tickers but matched nothing
+        known; a post with no tickers but some unresolved candidates is the case
+        the rules could not classify.
+        """
+        tickers, unresolved = [], []
+        candidates = [t.upper() for t in CASHTAG.findall(text)]
+        candidates += [t for t in UPPER_TOKEN.findall(text) if t not in self.stop_words]
+        for candidate in candidates:
+            if self._is_known(candidate):
+                if candidate not in tickers: tickers.append(candidate)
+            elif candidate not in unresolved:
+                unresolved.append(candidate)
+        for word in WORD.findall(text.lower()):
+            ticker = CRYPTO_NAMES.get(word)
+            if ticker and ticker not in tickers and self._is_known(ticker):
+                tickers.append(ticker)
+        return tickers, unresolved
@@ -0,0 +1,104 @@
+# ==============================================================================
+# File: ticker_matcher.py
+# NEW FILE: Single-pass asset lookup for SentimentEngine._identify_asset_in_text.
+# ==============================================================================
+import re
+
+
+class TickerMatcher:
+    """Finds which watched asset a post mentions without looping over every keyword.
+
+    Keeps the SentimentEngine rules and their priority (keyword insertion order,
+    stocks before crypto):
+
+    * stock keyword K matches on the cashtag ``$K`` anywhere in the raw text, or
+      when K equals one of the upper-cased whitespace-separated tokens;
+    * crypto keyword k matches when ``k.lower()`` is a substring of the lower-cased
+      text.
+
+    Stock lookups are dict hits per token / per ``$``, so their cost does not grow
+    with the number of watched tickers. Crypto keywords are compiled into one
+    overlapping-match regex, rebuilt lazily after ``add_crypto``.
+    """
+
+    def __init__(self):
+        self._stock_index, self._stock_values, self._stock_upper = {}, [], {}
+        self._stock_lengths = set()
+        self._crypto_index, self._crypto_values, self._crypto_lower = {}, [], {}
+        self._crypto_pattern = None
+        self._crypto_dirty = False
+
+    def add_stock(self, keyword, asset):
+        index = self._stock_index.get(keyword)
+        if index is not None:
+            self._stock_values[index] = asset
+            return
+        index = self._stock_index[keyword] = len(self._stock_values)
+        self._stock_values.append(asset)
+        upper = keyword.upper()
+        self._stock_upper.setdefault(upper, index)
+        self._stock_lengths.add(len(upper))
+
+    def add_crypto(self, keyword, asset):
+        index = self._crypto_index.get(keyword)
+        if index is not None:
+            self._crypto_values[index] = asset
+            return
+        index = self._crypto_index[keyword] = len(self._crypto_values)
+        self._crypto_values.append(asset)
+        if keyword.lower() not in self._crypto_lower:
+            self._crypto_lower[keyword.lower()] = index
+            self._crypto_dirty = True
+
+    def match(self, text):
+        """Returns (asset, asset_class) for the highest-priority match, or (None, None)."""
+        index = self._match_stock(text)
+        if index is not None:
+            return self._stock_values[index], 'stock'
+        index = self._match_crypto(text)
+        if index is not None:
+            return self._crypto_values[index], 'crypto'
+        return None, None
+
+    def _match_stock(self, text):
+        if not self._stock_upper:
+            return None
+        upper_index = self._stock_upper
+        best = None
+        for token in text.upper().split():
+            index = upper_index.get(token)
+            if index is not None and (best is None or index < best):
+                best = index
+        position = text.find('$')
+        while position != -1:
+            start = position + 1
+            for length in self._stock_lengths:
+                index = upper_index.get(text[start:start + length])
+                if index is not None and (best is None or index < best):
+                    best = index
+            position = text.find('$', start)
+        return best
+
+    def _match_crypto(self, text):
+        if self._crypto_dirty:
+            self._compile_crypto()
+        if self._crypto_pattern is None:
+            return None
+        lower_index = self._crypto_lower
+        best = None
+        for found in self._crypto_pattern.finditer(text.lower()):
+            index = lower_index[found.group(1)]
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return best
+
+    def _compile_crypto(self):
+        # Alternatives in priority order: at each position the lookahead reports
+        # the highest-priority keyword starting there.
+        keywords = sorted(self._crypto_lower, key=self._crypto_lower.get)
+        keywords = [k for k in keywords if k]
+        self._crypto_pattern = (re.compile('(?=(' + '|'.join(map(re.escape, keywords)) + '))')
+                                if keywords else None)
+        self._crypto_dirty = False
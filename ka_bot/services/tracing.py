@@ -0,0 +1,80 @@
+# ==============================================================================
+# File: tracing.py
+# NEW FILE: Monotonic per-stage timestamps and per-path latency percentiles.
+# ==============================================================================
+import json
+import random
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+
+from services.metrics import Histogram
+
+PATH_LATENCY = Histogram('kabot_path_latency_seconds', 'End-to-end latency from receipt to a pipeline stage',
+                         ('path',), buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+                                             60.0, 300.0))
+
+
+def start_trace():
+    """Trace for a message entering the system; clients attach it as ``message.trace``."""
+    return {'received': time.monotonic()}
+
+
+def mark(message, stage):
+    """Returns a copy of the message's trace with ``stage`` stamped, or None for untraced messages.
+
+    Messages are shared between EventBus subscribers and must stay read-only,
+    so the trace is never stamped in place; callers carry the copy forward.
+    """
+    trace = message.trace
+    if trace is None:
+        return None
+    return {**trace, stage: time.monotonic()}
+
+
+class LatencyTracker:
+    """Keeps the last ``window`` latencies per path for percentiles on /status.
+
+    Every recorded trace also feeds the kabot_path_latency_seconds histogram.
+    With a ``sample_rate`` and a write-behind ``writer``, that fraction of
+    traces is persisted to pipeline_traces with each stage's offset from
+    receipt in milliseconds.
+    """
+
+    def __init__(self, window=2048):
+        self._windows = defaultdict(lambda: deque(maxlen=window))
+        self._histograms = {}
+        self.sample_rate, self._writer = 0.0, None
+
+    def configure(self, window=None, sample_rate=0.0, writer=None):
+        if window:
+            self._windows = defaultdict(lambda: deque(maxlen=window))
+        self.sample_rate, self._writer = sample_rate, writer
+
+    def record(self, path, trace, stage, symbol=None):
+        if not trace or stage not in trace:
+            return
+        seconds = trace[stage] - trace['received']
+        histogram = self._histograms.get(path)
+        if histogram is None:
+            histogram = self._histograms[path] = PATH_LATENCY.labels(path)
+        histogram.observe(seconds)
+        self._windows[path].append(seconds)
+        if self._writer is not None and self.sample_rate and random.random() < self.sample_rate:
+            stages = {name: round((at - trace['received']) * 1000, 3) for name, at in trace.items()}
+            self._writer.put('pipeline_traces', (path, symbol, round(seconds * 1000, 3), json.dumps(stages),
+                                                 datetime.now(timezone.utc)))
+
+    def stats(self):
+        report = {}
+        for path, window in list(self._windows.items()):
+            samples = sorted(window)
+            if not samples:
+                continue
+            pick = lambda q: round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 2)
+            report[path] = {'samples': len(samples), 'p50_ms': pick(0.50), 'p90_ms': pick(0.90),
+                            'p99_ms': pick(0.99), 'max_ms': round(samples[-1] * 1000, 2)}
+        return report
+
+
+TRACKER = LatencyTracker()
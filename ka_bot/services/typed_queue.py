@@ -0,0 +1,130 @@
+# ==============================================================================
+# File: typed_queue.py
+# NEW FILE: Bounded FIFO with a separate limit and overflow policy per message type.
+# ==============================================================================
+import asyncio
+from collections import deque
+from itertools import count
+
+from services.event_bus import OVERFLOW_POLICIES
+
+
+class _Lane:
+    __slots__ = ('maxsize', 'overflow', 'items', 'put_waiters', 'enqueued', 'dropped', 'blocked', 'high_water')
+
+    def __init__(self, maxsize, overflow):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        self.maxsize, self.overflow = maxsize, overflow
+        self.items = deque()
+        self.put_waiters = deque()
+        self.enqueued = self.dropped = self.blocked = self.high_water = 0
+
+    def full(self):
+        return 0 < self.maxsize <= len(self.items)
+
+
+class TypedQueue:
+    """Drop-in for the ``asyncio.Queue`` between the clients and the pipeline.
+
+    Messages are bucketed by ``item.type``; each type has its own bound and
+    overflow policy (``block`` the producer, ``drop_oldest`` or ``drop_newest``),
+    so a burst of ticks cannot crowd out posts or the other way round. ``get``
+    still returns messages in arrival order across all types.
+    """
+
+    def __init__(self, policies, default=(1000, 'block')):
+        self._default = default
+        self._lanes = {message_type: _Lane(*policy) for message_type, policy in policies.items()}
+        self._seq = count()
+        self._size = 0
+        self._getters = deque()
+
+    def _lane(self, message_type):
+        lane = self._lanes.get(message_type)
+        if lane is None:
+            lane = self._lanes[message_type] = _Lane(*self._default)
+        return lane
+
+    @staticmethod
+    def _wake(waiters):
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def qsize(self):
+        return self._size
+
+    def empty(self):
+        return self._size == 0
+
+    async def put(self, item):
+        lane = self._lane(item.type)
+        if lane.full() and lane.overflow == 'block':
+            lane.blocked += 1
+            while lane.full():
+                waiter = asyncio.get_running_loop().create_future()
+                lane.put_waiters.append(waiter)
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    if not waiter.cancelled() and not lane.full():
+                        self._wake(lane.put_waiters)
+                    raise
+        self.put_nowait(item)
+
+    def put_nowait(self, item):
+        lane = self._lane(item.type)
+        if lane.full():
+            if lane.overflow == 'drop_newest':
+                lane.dropped += 1
+                return
+            if lane.overflow == 'drop_oldest':
+                lane.items.popleft()
+                lane.dropped += 1
+                self._size -= 1
+            else:
+                raise asyncio.QueueFull
+        lane.items.append((next(self._seq), item))
+        lane.enqueued += 1
+        self._size += 1
+        if len(lane.items) > lane.high_water:
+            lane.high_water = len(lane.items)
+        self._wake(self._getters)
+
+    async def get(self):
+        while self._size == 0:
+            waiter = asyncio.get_running_loop().create_future()
+            self._getters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if not waiter.cancelled() and self._size:
+                    self._wake(self._getters)
+                raise
+        return self.get_nowait()
+
+    def get_nowait(self):
+        if self._size == 0:
+            raise asyncio.QueueEmpty
+        lane = min((lane for lane in self._lanes.values() if lane.items), key=lambda lane: lane.items[0][0])
+        _, item = lane.items.popleft()
+        self._size -= 1
+        self._wake(lane.put_waiters)
+        return item
+
+    def stats(self):
+        return {
+            message_type: {
+                'maxsize': lane.maxsize,
+                'overflow': lane.overflow,
+                'depth': len(lane.items),
+                'high_water': lane.high_water,
+                'enqueued': lane.enqueued,
+                'dropped': lane.dropped,
+                'blocked_puts': lane.blocked,
+            }
+            for message_type, lane in self._lanes.items()
+        }
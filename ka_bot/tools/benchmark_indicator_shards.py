@@ -0,0 +1,58 @@
+# ==============================================================================
+# File: benchmark_indicator_shards.py
+# NEW FILE: Indicator throughput inline vs. on symbol-sharded thread/process workers.
+# Usage (from ka_bot/): python -m tools.benchmark_indicator_shards --symbols 500 --shards 4
+# ==============================================================================
+import argparse
+import asyncio
+import random
+import time
+
+from services.indicator_shards import IndicatorShard, ShardedIndicatorPool
+
+
+def make_rounds(symbols, rounds, seed=7):
+    rng = random.Random(seed)
+    prices = {f"SYM{i}": 100.0 for i in range(symbols)}
+    batches = []
+    for r in range(rounds):
+        batch = []
+        for symbol in prices:
+            prices[symbol] *= 1 + rng.gauss(0, 0.002)
+            batch.append((symbol, float(r), prices[symbol]))
+        batches.append(batch)
+    return batches
+
+
+async def run(args):
+    batches = make_rounds(args.symbols, args.rounds)
+    ticks = args.symbols * args.rounds
+
+    shard = IndicatorShard()
+    started = time.perf_counter()
+    for batch in batches:
+        shard.process(batch)
+    inline = time.perf_counter() - started
+    print(f"inline        : {ticks / inline:,.0f} ticks/s")
+
+    for mode in ('thread', 'process'):
+        pool = ShardedIndicatorPool(args.shards, mode)
+        await pool.process(batches[0][:args.shards])  # start the workers before timing
+        started = time.perf_counter()
+        for batch in batches:
+            await pool.process(batch)
+        elapsed = time.perf_counter() - started
+        pool.close()
+        print(f"{mode:<7} x {args.shards:<4}: {ticks / elapsed:,.0f} ticks/s ({inline / elapsed:.2f}x inline)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sharded indicator workers.")
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=200, help="ticks per symbol")
+    parser.add_argument('--shards', type=int, default=4)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# ==============================================================================
+# File: benchmark_kraken_decode.py
+# NEW FILE: Parse + message-build cost per Kraken ticker frame (json vs orjson, dict vs MarketTick).
+# Usage (from ka_bot/): python -m tools.benchmark_kraken_decode --frames 200000
+# ==============================================================================
+import argparse
+import json
+import time
+import tracemalloc
+
+from services.messages import MarketTick
+
+FRAME = json.dumps({
+    "channel": "ticker", "type": "update",
+    "data": [{"symbol": "BTC/USD", "bid": 67250.1, "bid_qty": 0.5, "ask": 67250.2, "ask_qty": 1.2, "last": 67250.1,
+              "volume": 1523.4, "vwap": 67011.9, "low": 66100.0, "high": 67900.0, "change": 812.3,
+              "change_pct": 1.22}],
+})
+
+
+def as_dict(entry):
+    return {'type': 'market_data', 'source': 'kraken', 'symbol': entry['symbol'], 'price': float(entry['last']),
+            'asset_class': 'crypto', 'trace': None}
+
+
+def as_tick(entry):
+    return MarketTick(entry['symbol'], float(entry['last']), 'crypto', 'kraken')
+
+
+def measure(loads, build, frames):
+    started = time.perf_counter()
+    for _ in range(frames):
+        for entry in loads(FRAME)['data']:
+            build(entry)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    kept = [build(loads(FRAME)['data'][0]) for _ in range(10000)]
+    size = tracemalloc.get_traced_memory()[0] / len(kept)
+    tracemalloc.stop()
+    return frames / elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Kraken ticker frame decoding.")
+    parser.add_argument('--frames', type=int, default=200000)
+    args = parser.parse_args()
+    decoders = [('json', json.loads)]
+    try:
+        import orjson
+        decoders.append(('orjson', orjson.loads))
+    except ImportError:
+        print("orjson not installed; only the stdlib decoder is measured.")
+    for name, loads in decoders:
+        for kind, build in (('dict', as_dict), ('MarketTick', as_tick)):
+            rate, size = measure(loads, build, args.frames)
+            print(f"{name:<6} + {kind:<10}: {rate:>10,.0f} frames/s, {size:,.0f} bytes per retained message")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# ==============================================================================
+# File: benchmark_kraken_ws.py
+# NEW FILE: Ticks/s through KrakenWsClient with K sharded connections against the stub.
+# Usage (from ka_bot/): python -m tools.benchmark_kraken_ws --pairs 300 --connections 4 --rate 2000
+# ==============================================================================
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from clients.kraken_ws_client import KrakenWsClient
+from tools.stub_kraken_ws import StubKrakenWs, start
+
+
+class CountingQueue:
+    def __init__(self):
+        self.count = 0
+
+    async def put(self, item):
+        self.count += 1
+
+
+async def run(args):
+    stub = StubKrakenWs(args.rate, args.batch, args.drop_after)
+    server = await start(stub, port=args.port)
+    queue = CountingQueue()
+    pairs = [f"P{i}/USD" for i in range(args.pairs)]
+    client = KrakenWsClient(pairs, queue, SimpleNamespace(KRAKEN_WS_CONNECTIONS=args.connections),
+                            url=f"ws://127.0.0.1:{args.port}")
+    listener = asyncio.ensure_future(client.listen())
+    await asyncio.sleep(1)  # connect and subscribe
+    for i in range(args.added):  # discoverer-style additions are batched per shard
+        await client.add_subscription(f"NEW{i}/USD")
+    started, before = time.perf_counter(), queue.count
+    await asyncio.sleep(args.seconds)
+    elapsed = time.perf_counter() - started
+    listener.cancel()
+    server.close()
+
+    print(f"{(queue.count - before) / elapsed:,.0f} ticks/s over {args.connections} connection(s), "
+          f"{args.pairs + args.added} pairs")
+    print(f"stub: {stub.connections} connections, {stub.subscribe_requests} subscribe requests")
+    print(f"shards: {client.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sharded KrakenWsClient against a local stub.")
+    parser.add_argument('--pairs', type=int, default=300)
+    parser.add_argument('--added', type=int, default=200, help="pairs added dynamically after connecting")
+    parser.add_argument('--connections', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=2000, help="updates per second per connection")
+    parser.add_argument('--batch', type=int, default=5, help="entries per frame")
+    parser.add_argument('--drop-after', type=int, default=None)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--port', type=int, default=8765)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# ==============================================================================
+# File: benchmark_llm_client.py
+# NEW FILE: Offline throughput/batching check of LlmTickerClient against the stub.
+# Usage (from ka_bot/): python -m tools.benchmark_llm_client --posts 2000 --rate-limit 5
+# ==============================================================================
+import argparse
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
+from clients.llm_ticker_client import LlmTickerClient
+from tools.stub_llm_server import StubLlmServer, start
+
+TICKERS = ['TSLA', 'AAPL', 'NVDA', 'GME', 'AMC', 'BTC', 'ETH', 'SOL', 'PLTR', 'AMD']
+
+
+async def run(args):
+    stub = StubLlmServer(args.latency_ms, args.rate_limit)
+    runner = await start(stub, port=args.port)
+    config = SimpleNamespace(GEMINI_API_URL=f"http://127.0.0.1:{args.port}", GEMINI_MODEL='stub', GEMINI_API_KEY='x')
+    client = LlmTickerClient(config, max_batch_size=args.batch_size, max_latency=args.batch_latency_ms / 1000,
+                             max_concurrency=args.concurrency)
+
+    rng = random.Random(3)
+    posts = [f"post {i % args.unique}: thinking about {rng.choice(TICKERS)} today" for i in range(args.posts)]
+    started = time.perf_counter()
+    results = await asyncio.gather(*(client.extract(post) for post in posts))
+    elapsed = time.perf_counter() - started
+    await client.close()
+    await runner.cleanup()
+
+    wrong = sum(1 for post, tickers in zip(posts, results) if post.split()[-2] not in tickers)
+    print(f"{len(posts)} posts in {elapsed:.2f}s ({len(posts) / elapsed:,.0f} posts/s), {wrong} wrong")
+    print(f"client: {client.stats}, cache: {client.cache.stats()}")
+    print(f"stub:   {stub.requests} requests ({stub.rejected} rejected with 429), {stub.posts} posts answered")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LlmTickerClient against a local stub server.")
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--unique', type=int, default=1500, help="distinct post texts (the rest are repeats)")
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--batch-latency-ms', type=float, default=50)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=200)
+    parser.add_argument('--rate-limit', type=int, default=None)
+    parser.add_argument('--port', type=int, default=8089)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# ==============================================================================
+# File: benchmark_order_router.py
+# NEW FILE: Order throughput through OrderRouter against two rate-limited fake venues.
+# Usage (from ka_bot/): python -m tools.benchmark_order_router --orders 200 --rate 20
+# ==============================================================================
+import argparse
+import asyncio
+import time
+
+from services.order_router import OrderRouter
+from tools.fake_exchange import FakeExchange
+
+
+async def run(args):
+    venues = {'crypto': FakeExchange('kraken', args.latency_ms, args.exchange_limit, args.ack_loss, 1, 'kraken', nonces=True),
+              'stock': FakeExchange('alpaca', args.latency_ms, args.exchange_limit, args.ack_loss, 2, 'alpaca')}
+    router = OrderRouter(venues, {name: (args.rate, args.burst) for name in venues}, args.workers,
+                         max_retries=args.retries)
+    runner = asyncio.ensure_future(router.run())
+
+    started = time.perf_counter()
+    for i in range(args.orders):
+        asset_class = 'crypto' if i % 2 else 'stock'
+        router.submit(f"SYM{i % 10}", 'buy', 1.0, asset_class, 100.0, signal_id=i)
+    enqueue_ms = (time.perf_counter() - started) * 1000
+    done = ('placed', 'rejected', 'failed')
+    while sum(router.stats()[v][k] for v in venues for k in done) < args.orders:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    runner.cancel()
+
+    print(f"{args.orders} orders enqueued in {enqueue_ms:.1f} ms, all submitted after {elapsed:.2f}s "
+          f"({args.orders / elapsed:.1f} orders/s across 2 venues, limit {args.rate}/s each)")
+    print(f"router:    {router.stats()}")
+    print(f"exchanges: {({name: venue.stats() for name, venue in venues.items()})}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OrderRouter against fake rate-limited exchanges.")
+    parser.add_argument('--orders', type=int, default=200)
+    parser.add_argument('--rate', type=float, default=20, help="router token-bucket rate per venue")
+    parser.add_argument('--burst', type=int, default=10)
+    parser.add_argument('--exchange-limit', type=int, default=25, help="orders/second the fake venue accepts")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=40)
+    parser.add_argument('--ack-loss', type=float, default=0.05)
+    parser.add_argument('--retries', type=int, default=3)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
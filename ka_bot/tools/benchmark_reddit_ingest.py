@@ -0,0 +1,70 @@
+# ==============================================================================
+# File: benchmark_reddit_ingest.py
+# NEW FILE: Sustained comment throughput of RedditClient's batched ingestion.
+# Usage (from ka_bot/): python -m tools.benchmark_reddit_ingest --comments 20000 --batch-size 50
+# ==============================================================================
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+import clients.reddit_client as reddit_client
+from clients.reddit_client import RedditClient
+from tools.fake_reddit import FakeReddit
+
+
+class FakeDb:
+    """ingest_posts costs one simulated round trip per call, regardless of batch size."""
+
+    def __init__(self, round_trip_ms):
+        self.round_trip = round_trip_ms / 1000
+        self.calls = self.rows = 0
+
+    async def ingest_posts(self, batch):
+        await asyncio.sleep(self.round_trip)
+        start = self.rows
+        self.calls += 1
+        self.rows += len(batch)
+        return list(range(start + 1, self.rows + 1))
+
+
+class CountingQueue:
+    def __init__(self):
+        self.count = 0
+
+    async def put(self, item):
+        self.count += 1
+
+
+async def run(args):
+    reddit_client.INITIAL_BACKOFF = reddit_client.MAX_BACKOFF = 0  # reconnect straight away in the benchmark
+    config = SimpleNamespace(REDDIT_BATCH_SIZE=args.batch_size, REDDIT_BATCH_SECONDS=args.batch_seconds,
+                             REDDIT_DEDUP_SIZE=50000, REDDIT_MAX_BUFFERED=10 * args.batch_size)
+    db, queue = FakeDb(args.round_trip_ms), CountingQueue()
+    source = FakeReddit(args.rate, args.fail_every, total=args.comments)
+    client = RedditClient(queue, config, db, ['wallstreetbets'], reddit=source)
+
+    started = time.perf_counter()
+    task = asyncio.ensure_future(client.stream_comments())
+    while queue.count < args.comments:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    task.cancel()
+
+    print(f"{queue.count} unique comments stored and queued in {elapsed:.2f}s ({queue.count / elapsed:,.0f}/s)")
+    print(f"db: {db.calls} ingest calls for {db.rows} rows; client: {client.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched Reddit ingestion against a fake stream.")
+    parser.add_argument('--comments', type=int, default=20000)
+    parser.add_argument('--rate', type=float, default=20000, help="comments per second from the fake stream")
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--batch-seconds', type=float, default=0.5)
+    parser.add_argument('--round-trip-ms', type=float, default=2)
+    parser.add_argument('--fail-every', type=int, default=5000, help="drop the stream every N comments")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
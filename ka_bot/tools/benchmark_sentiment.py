@@ -0,0 +1,97 @@
+# ==============================================================================
+# File: benchmark_sentiment.py
+# NEW FILE: Compares the FinBERT CPU backends on a fixed local corpus.
+# Usage (from ka_bot/): python -m tools.benchmark_sentiment --backends torch onnx-int8
+# ==============================================================================
+import argparse
+import statistics
+import time
+
+from analysis.ai_sentiment_analyzer import BACKENDS, AISentimentAnalyzer
+
+CORPUS = (
+    "Apple beats earnings expectations and raises full-year guidance.",
+    "Tesla shares slide after deliveries miss analyst estimates.",
+    "The Federal Reserve left interest rates unchanged on Wednesday.",
+    "Bitcoin rallies above $70,000 as ETF inflows accelerate.",
+    "Ethereum drops 8% after a major exchange reports a security breach.",
+    "Nvidia announces a 10-for-1 stock split.",
+    "Retail sales were flat in March, in line with forecasts.",
+    "Boeing faces another FAA investigation into production quality.",
+    "Microsoft cloud revenue grew 31% year over year.",
+    "Oil prices fell as OPEC signalled higher output next quarter.",
+    "GME to the moon, diamond hands everyone",
+    "I just lost half my account on SPY puts, this market is rigged",
+    "AMD guidance was weak but the data center business keeps growing.",
+    "Shares of Intel plunged after the company suspended its dividend.",
+    "The company reported a net loss of $2.1 billion for the quarter.",
+    "Analysts upgraded Netflix to buy citing strong subscriber growth.",
+    "Coinbase was sued by the SEC for operating an unregistered exchange.",
+    "Solana network suffers a five-hour outage.",
+    "Unemployment claims rose more than expected last week.",
+    "Amazon will cut 9,000 more jobs in its cloud and advertising units.",
+    "Meta's ad revenue beat estimates, sending the stock up 15% after hours.",
+    "Moderna shares tumble on disappointing vaccine sales outlook.",
+    "Dogecoin is just a meme, not sure why people keep buying it",
+    "JPMorgan raised its price target on Alphabet to $200.",
+    "Housing starts declined for the third consecutive month.",
+    "XRP jumps after a favourable court ruling against the SEC.",
+    "Palantir wins a $480 million Army contract.",
+    "The board approved a $10 billion share buyback program.",
+    "Ford recalls 1.9 million vehicles over a faulty rear-view camera.",
+    "Inflation cooled to 3.1% in January, below economists' forecasts.",
+    "Holding my AAPL calls through earnings, feeling good about it",
+    "Disney misses on streaming subscribers, shares down 4% premarket.",
+)
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def benchmark(backend, batch_size, rounds):
+    analyzer = AISentimentAnalyzer(backend=backend)
+    analyzer.analyze_batch(list(CORPUS[:batch_size]))  # warm up
+
+    latencies = []
+    for _ in range(rounds):
+        for text in CORPUS:
+            started = time.perf_counter()
+            analyzer.analyze(text)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    texts = list(CORPUS) * rounds
+    started = time.perf_counter()
+    labels = []
+    for i in range(0, len(texts), batch_size):
+        labels.extend(label for label, _ in analyzer.analyze_batch(texts[i:i + batch_size]))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': _percentile(latencies, 0.95),
+        'posts_per_sec': len(texts) / elapsed,
+        'labels': labels[:len(CORPUS)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FinBERT CPU backends.")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    backends = ['torch'] + [b for b in args.backends if b != 'torch']
+    results = {backend: benchmark(backend, args.batch_size, args.rounds) for backend in backends}
+    reference = results['torch']['labels']
+
+    print(f"\n{'backend':<12}{'p50 ms':>10}{'p95 ms':>10}{'posts/s':>12}{'agreement':>12}")
+    for backend, r in results.items():
+        agreement = sum(a == b for a, b in zip(r['labels'], reference)) / len(reference)
+        print(f"{backend:<12}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['posts_per_sec']:>12.1f}{agreement:>12.1%}")
+
+
+if __name__ == '__main__':
+    main()
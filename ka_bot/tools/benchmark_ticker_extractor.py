@@ -0,0 +1,49 @@
+# ==============================================================================
+# File: benchmark_ticker_extractor.py
+# NEW FILE: Throughput of LocalTickerExtractor (accuracy is covered by
+#           tests/test_ticker_extractor.py).
+# Usage (from ka_bot/): python -m tools.benchmark_ticker_extractor
+# ==============================================================================
+import time
+
+from services.ticker_extractor import LocalTickerExtractor
+
+KNOWN_STOCKS = {'AAPL', 'TSLA', 'NVDA', 'AMD', 'GME', 'AMC', 'SPY', 'MSFT', 'PLTR', 'F', 'T', 'ALL', 'NOW', 'IT'}
+KNOWN_CRYPTO = {'BTC/USD', 'ETH/USD', 'SOL/USD', 'DOGE/USD', 'XRP/USD', 'ADA/USD'}
+
+POSTS = (
+    "$TSLA earnings tomorrow, loading calls",
+    "Is NVDA overvalued at this point?",
+    "I bought more GME and AMC today, YOLO",
+    "The CEO said on CNBC that the FED will cut",
+    "bitcoin just broke 70k!!",
+    "ETH/USD looking weak on the 4h chart",
+    "Selling my $F position, switching to $T",
+    "DD on PLTR: government contracts keep growing",
+    "Why is everyone talking about AI stocks now",
+    "SPY puts printed today, IMO the top is in",
+    "Dogecoin to the moon",
+    "AAPL vs MSFT, which is the better long term hold?",
+    "I think it is a good time to buy the dip",
+    "$AMD guidance was weak but data center grew",
+    "solana outage again, selling all my SOL",
+    "USA GDP numbers came in hot, IPO market reopening",
+    "XRP and ADA pumping while BTC goes sideways",
+    "Just opened a Roth IRA with $5000",
+    "$XYZW is my new favourite penny stock",
+    "Fed minutes out at 2pm EST",
+)
+
+
+def main():
+    extractor = LocalTickerExtractor(KNOWN_STOCKS, KNOWN_CRYPTO)
+    posts = POSTS * 500
+    started = time.perf_counter()
+    for post in posts:
+        extractor.extract(post)
+    elapsed = time.perf_counter() - started
+    print(f"throughput {len(posts) / elapsed:,.0f} posts/sec on one core")
+
+
+if __name__ == '__main__':
+    main()
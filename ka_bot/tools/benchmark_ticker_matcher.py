@@ -0,0 +1,87 @@
+# ==============================================================================
+# File: benchmark_ticker_matcher.py
+# NEW FILE: Per-post cost of asset identification vs. number of watched tickers.
+# Usage (from ka_bot/): python -m tools.benchmark_ticker_matcher
+# ==============================================================================
+import argparse
+import random
+import string
+import time
+
+from services.ticker_matcher import TickerMatcher
+
+CRYPTO_ASSETS = ['BTC/USD', 'ETH/USD', 'SOL/USD', 'XRP/USD', 'DOGE/USD', 'ADA/USD', 'DOT/USD', 'LINK/USD']
+WORDS = ("the market is going to rip today buy calls on earnings I think this stock is overvalued "
+         "selling my position before the fed meeting holding long term bag holders unite").split()
+
+
+def legacy_identify(stock_keywords, crypto_keywords, text):
+    """The loop SentimentEngine._identify_asset_in_text used before TickerMatcher."""
+    for k, s in stock_keywords.items():
+        if f"${k.upper()}" in text or k.upper() in text.upper().split(): return s, 'stock'
+    for k, s in crypto_keywords.items():
+        if k.lower() in text.lower(): return s, 'crypto'
+    return None, None
+
+
+def make_tickers(count, rng):
+    tickers = set()
+    while len(tickers) < count:
+        tickers.add(''.join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5))))
+    return sorted(tickers)
+
+
+def make_posts(tickers, count, rng):
+    posts = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(8, 40))
+        roll = rng.random()
+        if roll < 0.3:
+            words.insert(rng.randrange(len(words)), '$' + rng.choice(tickers))
+        elif roll < 0.5:
+            words.insert(rng.randrange(len(words)), rng.choice(tickers))
+        elif roll < 0.6:
+            words.insert(rng.randrange(len(words)), rng.choice(CRYPTO_ASSETS).split('/')[0].lower())
+        posts.append(' '.join(words))
+    return posts
+
+
+def time_per_post(fn, posts):
+    started = time.perf_counter()
+    for post in posts:
+        fn(post)
+    return (time.perf_counter() - started) / len(posts) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TickerMatcher against the legacy keyword loop.")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000, 5000, 10000])
+    parser.add_argument('--posts', type=int, default=2000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    print(f"{'tickers':>8}{'legacy us/post':>16}{'matcher us/post':>17}{'speed-up':>10}")
+    for size in args.sizes:
+        tickers = make_tickers(size, rng)
+        posts = make_posts(tickers, args.posts, rng)
+
+        stock_keywords = {t: t for t in tickers}
+        crypto_keywords = {}
+        for asset in CRYPTO_ASSETS:
+            base = asset.split('/')[0]
+            crypto_keywords.update({base.upper(): asset, base.lower(): asset})
+        matcher = TickerMatcher()
+        for k, s in crypto_keywords.items(): matcher.add_crypto(k, s)
+        for k, s in stock_keywords.items(): matcher.add_stock(k, s)
+
+        mismatches = [p for p in posts if matcher.match(p) != legacy_identify(stock_keywords, crypto_keywords, p)]
+        if mismatches:
+            raise SystemExit(f"Matcher disagrees with the legacy loop on {len(mismatches)} posts, e.g. {mismatches[0]!r}")
+
+        legacy = time_per_post(lambda p: legacy_identify(stock_keywords, crypto_keywords, p), posts)
+        compiled = time_per_post(matcher.match, posts)
+        print(f"{size:>8}{legacy:>16.1f}{compiled:>17.1f}{legacy / compiled:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
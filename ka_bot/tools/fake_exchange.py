@@ -0,0 +1,99 @@
+# ==============================================================================
+# File: fake_exchange.py
+# NEW FILE: In-process exchange stand-in for exercising OrderRouter under rate limits.
+# ==============================================================================
+import asyncio
+import random
+import time
+from collections import deque
+
+from services.order_router import RetryableOrderError
+
+DUPLICATE_POLICIES = ('kraken', 'alpaca')
+
+
+class FakeExchange:
+    """Trader-compatible ``place_order``/``find_order`` with latency, a rate limit and flaky acks.
+
+    More than ``rate_limit`` orders in any one-second window are refused with
+    RetryableOrderError. With ``ack_loss``, that fraction of orders is
+    accepted but the reply is lost (a ConnectionError or a timeout), so the
+    caller cannot tell whether the order exists.
+
+    Repeated client order ids behave like the venue named by ``duplicates``:
+
+    * ``kraken`` - ids are only unique among open orders. Market orders fill
+      (and close) at once, so a repeat is a brand-new order: a double fill.
+    * ``alpaca`` - every repeat is refused (HTTP 422); AlpacaRestClient then
+      looks the original up, so this returns it as that trader would.
+
+    With ``nonces``, every call is signed with an increasing nonce when it is
+    made and the venue refuses one that is not above the last nonce it
+    accepted, as Kraken does (``EAPI:Invalid nonce``). Calls reach the venue
+    after a random delay, so concurrent ones can overtake each other;
+    KrakenRestClient raises RetryableOrderError for the refusal.
+    """
+
+    def __init__(self, name, latency_ms=40, rate_limit=10, ack_loss=0.0, seed=1, duplicates='kraken', nonces=False):
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy '{duplicates}', expected one of {DUPLICATE_POLICIES}")
+        self.name, self.latency, self.rate_limit, self.ack_loss = name, latency_ms / 1000, rate_limit, ack_loss
+        self.duplicates, self.nonces = duplicates, nonces
+        self._signed = self._accepted = 0
+        self._rng = random.Random(seed)
+        self._recent = deque()
+        self.orders = []
+        self._by_client_id = {}
+        self.calls = self.lookups = self.rate_limited = self.refused_duplicates = self.lost_acks = 0
+        self.invalid_nonces = 0
+
+    async def _round_trip(self):
+        if self.nonces:
+            self._signed += 1
+            nonce = self._signed
+            await asyncio.sleep(self.latency * self._rng.uniform(0, 0.5))
+            if nonce <= self._accepted:
+                self.invalid_nonces += 1
+                raise RetryableOrderError(f"{self.name}: EAPI:Invalid nonce")
+            self._accepted = nonce
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] >= 1.0:
+            self._recent.popleft()
+        if len(self._recent) >= self.rate_limit:
+            self.rate_limited += 1
+            raise RetryableOrderError(f"{self.name}: rate limit exceeded")
+        self._recent.append(now)
+        await asyncio.sleep(self.latency * self._rng.uniform(0.5, 1.5))
+
+    async def place_order(self, symbol, order_type, side, volume, client_order_id=None, **kwargs):
+        self.calls += 1
+        await self._round_trip()
+        if self.duplicates == 'alpaca' and client_order_id in self._by_client_id:
+            self.refused_duplicates += 1
+            return self._by_client_id[client_order_id]
+
+        order = {'id': len(self.orders) + 1, 'client_order_id': client_order_id, 'symbol': symbol, 'side': side,
+                 'volume': volume, 'status': 'closed' if order_type == 'market' else 'open'}
+        self.orders.append(order)
+        self._by_client_id.setdefault(client_order_id, order)
+        if self._rng.random() < self.ack_loss:
+            self.lost_acks += 1
+            if self._rng.random() < 0.5:
+                raise ConnectionError(f"{self.name}: connection reset before ack")
+            raise asyncio.TimeoutError()
+        return order
+
+    async def find_order(self, client_order_id):
+        self.lookups += 1
+        await self._round_trip()
+        return self._by_client_id.get(client_order_id)
+
+    @property
+    def double_fills(self):
+        """Orders placed under a client order id that had already been used."""
+        return len(self.orders) - len(self._by_client_id)
+
+    def stats(self):
+        return {'calls': self.calls, 'lookups': self.lookups, 'filled': len(self.orders),
+                'double_fills': self.double_fills, 'refused_duplicates': self.refused_duplicates,
+                'rate_limited': self.rate_limited, 'lost_acks': self.lost_acks, 'invalid_nonces': self.invalid_nonces}
@@ -0,0 +1,48 @@
+# ==============================================================================
+# File: fake_reddit.py
+# NEW FILE: asyncpraw-shaped comment stream for exercising RedditClient offline.
+# ==============================================================================
+import asyncio
+import random
+from types import SimpleNamespace
+
+WORDS = "TSLA AAPL NVDA GME BTC ETH calls puts moon dip earnings guidance buy sell hold yolo".split()
+
+
+class FakeReddit:
+    """Stands in for ``asyncpraw.Reddit`` (only ``subreddit(...).stream.comments``).
+
+    Yields ``rate`` comments per second. Every ``fail_every`` comments the
+    stream raises, like a dropped connection; the next stream then replays
+    the last ``replay`` comments, as the real stream does on reconnect.
+    """
+
+    def __init__(self, rate=2000, fail_every=None, replay=100, total=None, seed=5):
+        self.rate, self.fail_every, self.replay, self.total = rate, fail_every, replay, total
+        self._rng = random.Random(seed)
+        self._history = []
+        self.yielded = 0
+
+    async def subreddit(self, name):
+        return SimpleNamespace(stream=SimpleNamespace(comments=self._comments))
+
+    def _make(self, n):
+        body = ' '.join(self._rng.choice(WORDS) for _ in range(12))
+        return SimpleNamespace(id=f"c{n:x}", author=SimpleNamespace(name=f"user{n % 97}"),
+                               subreddit=SimpleNamespace(display_name='wallstreetbets'), body=body)
+
+    async def _comments(self, skip_existing=True):
+        for comment in self._history[-self.replay:]:
+            yield comment
+        since_failure = 0
+        while self.total is None or len(self._history) < self.total:
+            comment = self._make(len(self._history))
+            self._history.append(comment)
+            self.yielded += 1
+            yield comment
+            since_failure += 1
+            if self.fail_every and since_failure >= self.fail_every:
+                raise ConnectionError("fake stream dropped")
+            if self.yielded % 100 == 0:
+                await asyncio.sleep(100 / self.rate)
+        await asyncio.Future()  # Idle like a quiet subreddit.
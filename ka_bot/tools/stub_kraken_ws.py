@@ -0,0 +1,87 @@
+# ==============================================================================
+# File: stub_kraken_ws.py
+# NEW FILE: Local stand-in for the Kraken v2 ticker WebSocket at high message rates.
+# Usage (from ka_bot/): python -m tools.stub_kraken_ws --port 8765 --rate 2000
+# ==============================================================================
+import argparse
+import asyncio
+import json
+import random
+
+import websockets
+
+
+class StubKrakenWs:
+    """Acknowledges subscribe requests and streams ticker updates for them.
+
+    Every connection emits ``rate`` updates per second spread over its
+    subscribed pairs, ``batch`` entries per frame. With ``drop_after`` set, a
+    connection is closed after that many frames to exercise reconnects.
+    """
+
+    def __init__(self, rate=1000, batch=1, drop_after=None):
+        self.rate, self.batch, self.drop_after = rate, batch, drop_after
+        self.connections = self.subscribe_requests = self.frames = 0
+
+    async def handler(self, websocket, path=None):
+        self.connections += 1
+        symbols = []
+        sender = asyncio.ensure_future(self._stream(websocket, symbols))
+        try:
+            async for raw in websocket:
+                request = json.loads(raw)
+                if request.get('method') == 'subscribe':
+                    self.subscribe_requests += 1
+                    requested = request['params']['symbol']
+                    symbols.extend(s for s in requested if s not in symbols)
+                    await websocket.send(json.dumps({'method': 'subscribe', 'success': True,
+                                                     'result': {'channel': 'ticker', 'symbol': requested}}))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            sender.cancel()
+
+    async def _stream(self, websocket, symbols):
+        rng = random.Random()
+        prices = {}
+        interval = self.batch / self.rate
+        sent = 0
+        while True:
+            await asyncio.sleep(interval)
+            if not symbols:
+                continue
+            entries = []
+            for _ in range(self.batch):
+                symbol = rng.choice(symbols)
+                price = prices[symbol] = prices.get(symbol, 100.0) * (1 + rng.gauss(0, 0.001))
+                entries.append({'symbol': symbol, 'last': round(price, 6)})
+            await websocket.send(json.dumps({'channel': 'ticker', 'type': 'update', 'data': entries}))
+            self.frames += 1
+            sent += 1
+            if self.drop_after and sent >= self.drop_after:
+                await websocket.close()
+                return
+
+
+async def start(stub, host='127.0.0.1', port=8765):
+    return await websockets.serve(stub.handler, host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Kraken v2 ticker WebSocket stub.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rate', type=float, default=1000, help="updates per second per connection")
+    parser.add_argument('--batch', type=int, default=1, help="entries per frame")
+    parser.add_argument('--drop-after', type=int, default=None, help="close each connection after N frames")
+    args = parser.parse_args()
+
+    async def serve():
+        await start(StubKrakenWs(args.rate, args.batch, args.drop_after), port=args.port)
+        print(f"Kraken WS stub on ws://127.0.0.1:{args.port}")
+        await asyncio.Future()
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
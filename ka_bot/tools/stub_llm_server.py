@@ -0,0 +1,78 @@
+# ==============================================================================
+# File: stub_llm_server.py
+# NEW FILE: Local stand-in for the Gemini generateContent endpoint.
+# Usage (from ka_bot/): python -m tools.stub_llm_server --port 8089 --latency-ms 300
+# ==============================================================================
+import argparse
+import asyncio
+import json
+import re
+import time
+
+from aiohttp import web
+
+POST_LINE = re.compile(r'^\[(\d+)\] (.*)$', re.MULTILINE)
+TICKER = re.compile(r'(?<![A-Za-z])\$?([A-Z]{2,5})(?![A-Za-z])')
+
+
+class StubLlmServer:
+    """Answers batched ticker prompts after a fixed latency.
+
+    Tickers are "extracted" with a regex over upper-case tokens. When more than
+    ``rate_limit`` requests arrive within one second, the extra ones get 429
+    with a Retry-After header, like the real API under quota pressure.
+    """
+
+    def __init__(self, latency_ms=300, rate_limit=None):
+        self.latency = latency_ms / 1000
+        self.rate_limit = rate_limit
+        self.requests = self.rejected = self.posts = 0
+        self._window_start, self._window_count = time.monotonic(), 0
+
+    def app(self):
+        application = web.Application()
+        application.router.add_post('/v1beta/models/{model}', self.generate)
+        return application
+
+    def _over_limit(self):
+        if self.rate_limit is None:
+            return False
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start, self._window_count = now, 0
+        self._window_count += 1
+        return self._window_count > self.rate_limit
+
+    async def generate(self, request):
+        self.requests += 1
+        if self._over_limit():
+            self.rejected += 1
+            return web.json_response({'error': {'code': 429}}, status=429, headers={'Retry-After': '1'})
+        payload = await request.json()
+        prompt = payload['contents'][0]['parts'][0]['text']
+        results = [{'index': int(i), 'tickers': sorted(set(TICKER.findall(text)))}
+                   for i, text in POST_LINE.findall(prompt)]
+        self.posts += len(results)
+        await asyncio.sleep(self.latency)
+        body = {'candidates': [{'content': {'parts': [{'text': json.dumps({'results': results})}]}}]}
+        return web.json_response(body)
+
+
+async def start(stub, host='127.0.0.1', port=8089):
+    runner = web.AppRunner(stub.app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Gemini stub for ticker extraction.")
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--rate-limit', type=int, default=None, help="requests per second before 429s")
+    args = parser.parse_args()
+    web.run_app(StubLlmServer(args.latency_ms, args.rate_limit).app(), host='127.0.0.1', port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+# Modules import each other relative to ka_bot/ (e.g. ``from services.x import Y``),
+# the same way main.py is run, so the tests do too.
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ka_bot'))
@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('transformers')
+pytest.importorskip('onnxruntime')
+
+from analysis.ai_sentiment_analyzer import AISentimentAnalyzer
+
+SENTENCES = [
+    "Profit beat estimates and the stock jumped 12% in early trading.",
+    "Sell-off.",
+    "Regulators opened an investigation into the exchange's accounting practices, "
+    "sending the token down sharply as traders pulled funds.",
+    "The company will report results on Thursday.",
+]
+
+
+def load(*args):
+    try:
+        return AISentimentAnalyzer(*args)
+    except OSError as e:  # model not cached and no network
+        pytest.skip(f"FinBERT unavailable: {e}")
+
+
+@pytest.fixture(scope='module')
+def onnx_path(tmp_path_factory):
+    return str(tmp_path_factory.mktemp('models') / 'finbert.onnx')
+
+
+def test_onnx_matches_torch(onnx_path):
+    reference = load('torch')
+    exported = load('onnx', onnx_path)
+    np.testing.assert_allclose(exported._probabilities(SENTENCES), reference._probabilities(SENTENCES), atol=1e-4)
+    assert [label for label, _ in exported.analyze_batch(SENTENCES)] == \
+           [label for label, _ in reference.analyze_batch(SENTENCES)]
+
+
+def test_onnx_int8_is_written_next_to_the_fp32_export(onnx_path):
+    pytest.importorskip('onnx')
+    quantized = load('onnx-int8', onnx_path)
+    assert os.path.exists(os.path.join(os.path.dirname(onnx_path), 'finbert.int8.onnx'))
+    assert len(quantized.analyze_batch(SENTENCES)) == len(SENTENCES)
@@ -0,0 +1,76 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+websockets = pytest.importorskip('websockets')
+pytest.importorskip('alpaca_trade_api')
+
+from clients.alpaca_ws_client import AlpacaWsClient
+
+
+class FakeAlpacaStream:
+    """Market data stream speaking Alpaca's v2 JSON protocol; answers every subscribe with one trade per symbol."""
+
+    def __init__(self):
+        self.subscribe_requests = []
+
+    async def handler(self, ws, path=None):
+        await ws.send(json.dumps([{"T": "success", "msg": "connected"}]))
+        auth = json.loads(await ws.recv())
+        if auth['key'] == 'over-limit':
+            await ws.send(json.dumps([{"T": "error", "code": 406, "msg": "connection limit exceeded"}]))
+            return
+        await ws.send(json.dumps([{"T": "success", "msg": "authenticated"}]))
+        async for message in ws:
+            request = json.loads(message)
+            self.subscribe_requests.append(request['trades'])
+            await ws.send(json.dumps([{"T": "subscription", "trades": request['trades']}]))
+            await ws.send(json.dumps([{"T": "t", "S": symbol, "p": 100.5, "s": 10} for symbol in request['trades']]))
+
+
+@pytest_asyncio.fixture
+async def stream_url():
+    fake = FakeAlpacaStream()
+    server = await websockets.serve(fake.handler, '127.0.0.1', 0)
+    port = next(iter(server.sockets)).getsockname()[1]
+    yield fake, f"ws://127.0.0.1:{port}"
+    server.close()
+    await server.wait_closed()
+
+
+def make_client(url, queue, key='key'):
+    config = SimpleNamespace(ALPACA_DATA_WS_URL=url, APCA_API_KEY_ID=key, APCA_API_SECRET_KEY='secret',
+                             ALPACA_STREAM_MODE='async')
+    return AlpacaWsClient(['AAPL', 'TSLA'], queue, config, asyncio.get_running_loop())
+
+
+@pytest.mark.asyncio
+async def test_async_mode_streams_initial_and_dynamic_symbols(stream_url):
+    fake, url = stream_url
+    queue = asyncio.Queue()
+    client = make_client(url, queue)
+    runner = asyncio.ensure_future(client.run_async())
+    try:
+        ticks = [await asyncio.wait_for(queue.get(), 2) for _ in range(2)]
+        assert sorted(t.symbol for t in ticks) == ['AAPL', 'TSLA']
+        assert all(t.price == 100.5 and t.asset_class == 'stock' for t in ticks)
+
+        assert await client.add_subscription('NVDA')
+        assert (await asyncio.wait_for(queue.get(), 2)).symbol == 'NVDA'
+        assert fake.subscribe_requests == [['AAPL', 'TSLA'], ['NVDA']]
+        assert client.stats()['connected'] and client.stats()['reconnects'] == 0
+    finally:
+        runner.cancel()
+
+
+@pytest.mark.asyncio
+async def test_connection_limit_backs_off_for_a_minute(stream_url):
+    _, url = stream_url
+    client = make_client(url, asyncio.Queue(), key='over-limit')
+    async with websockets.connect(url) as ws:
+        with pytest.raises(ValueError, match="connection limit exceeded") as error:
+            await client._authenticate(ws)
+    assert client._retry_delay(error.value, 5) == 60
@@ -0,0 +1,100 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from services.asset_discoverer import AssetDiscoverer
+
+
+class SlowResponse:
+    status = 200
+    headers = {}
+
+    def __init__(self, count, tickers, delay):
+        self._results = [{'index': i, 'tickers': tickers} for i in range(count)]
+        self._delay = delay
+
+    async def json(self):
+        return {'candidates': [{'content': {'parts': [{'text': json.dumps({'results': self._results})}]}}]}
+
+    async def __aenter__(self):
+        await asyncio.sleep(self._delay)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class SlowHttp:
+    """Answers every post in a request with ``tickers`` after ``delay`` seconds; records the batch sizes."""
+
+    def __init__(self, tickers, delay):
+        self.tickers, self.delay = tickers, delay
+        self.batches = []
+
+    def post(self, url, json=None, timeout=None):
+        count = json['contents'][0]['parts'][0]['text'].count('\n[')
+        self.batches.append(count)
+        return SlowResponse(count, self.tickers, self.delay)
+
+
+class FakeWs:
+    def __init__(self):
+        self._subscribed_assets = set()
+
+    async def add_subscription(self, asset):
+        self._subscribed_assets.add(asset)
+        return True
+
+
+def make_discoverer(http, threshold=10):
+    config = SimpleNamespace(GEMINI_API_URL='http://stub', GEMINI_MODEL='stub', GEMINI_API_KEY='x',
+                             LLM_BATCH_SIZE=20, LLM_BATCH_LATENCY_MS=50, LLM_MAX_CONCURRENCY=4,
+                             DISCOVERY_LLM_FALLBACK=True, DISCOVERY_MAX_IN_FLIGHT=64,
+                             DISCOVERY_MENTION_THRESHOLD=threshold, DISCOVERY_TIMEFRAME_SECONDS=300)
+    engine = SimpleNamespace(added=[])
+    engine.add_asset = lambda asset, asset_class: engine.added.append(asset)
+    discoverer = AssetDiscoverer(asyncio.Queue(), config, {}, {'crypto': FakeWs(), 'stock': FakeWs()}, engine, http)
+    discoverer.known_stock_tickers.update({'NVDA', 'TSLA'})
+    return discoverer, engine
+
+
+def post(text):
+    return SimpleNamespace(type='social_post', text=text)
+
+
+@pytest.mark.asyncio
+async def test_llm_fallbacks_share_a_batch():
+    http = SlowHttp(['NVDA'], delay=0.05)
+    discoverer, engine = make_discoverer(http)
+    for i in range(10):
+        discoverer.data_queue.put_nowait(post(f"Loading up on $ZQX{chr(65 + i)} before the chip earnings"))
+    runner = asyncio.ensure_future(discoverer.run())
+    try:
+        for _ in range(100):
+            if engine.added:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        runner.cancel()
+
+    assert http.batches == [10]
+    assert engine.added == ['NVDA']
+
+
+@pytest.mark.asyncio
+async def test_local_posts_are_not_held_up_by_the_llm():
+    http = SlowHttp(['NVDA'], delay=0.5)
+    discoverer, engine = make_discoverer(http, threshold=1)
+    discoverer.data_queue.put_nowait(post("What is $ZQXA?"))
+    discoverer.data_queue.put_nowait(post("$TSLA calls"))
+    runner = asyncio.ensure_future(discoverer.run())
+    try:
+        await asyncio.sleep(0.1)
+        assert engine.added == ['TSLA']  # while the LLM request is still out
+    finally:
+        runner.cancel()
+        await discoverer.llm.close()
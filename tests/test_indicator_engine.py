@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from services.indicator_engine import MIN_HISTORY, RESYNC_INTERVAL, StreamingIndicators
+from services.price_history import PriceHistory
+
+KEYS = ('rsi', 'sma_20', 'sma_50', 'upper_bollinger', 'lower_bollinger', 'volatility')
+
+
+def reference_indicators(prices):
+    """What TechnicalAnalyzer computed with pandas_ta 0.3.14b before StreamingIndicators, in plain pandas.
+
+    pandas_ta's RSI_14 is the ratio of adjusted EWMs (alpha=1/14, at least 14
+    changes) of the up and down moves; BBANDS_20_2.0 use the population std.
+    """
+    close = pd.Series(prices)
+    change = close.diff()
+    up = change.clip(lower=0).ewm(alpha=1 / 14, adjust=True, min_periods=14).mean()
+    down = (-change).clip(lower=0).ewm(alpha=1 / 14, adjust=True, min_periods=14).mean()
+    rsi = 100 * up / (up + down)
+    sma_20, deviation = close.rolling(20).mean(), 2.0 * close.rolling(20).std(ddof=0)
+    volatility = close.pct_change().rolling(window=20).std() * 100
+    latest = pd.DataFrame({'rsi': rsi, 'sma_20': sma_20, 'sma_50': close.rolling(50).mean(),
+                           'upper_bollinger': sma_20 + deviation, 'lower_bollinger': sma_20 - deviation,
+                           'volatility': volatility}).iloc[-1]
+    return {key: latest[key] for key in KEYS}
+
+
+def random_walk(n, seed):
+    rng = np.random.default_rng(seed)
+    return (100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))).tolist()
+
+
+def trending_then_flat(n):
+    half = n // 2
+    return [50 + 0.25 * i for i in range(half)] + [50 + 0.25 * half] * (n - half)
+
+
+def stream(prices, checkpoints):
+    """Feeds prices tick by tick and yields (n, streamed, window) at each checkpoint."""
+    history, indicators = PriceHistory(), StreamingIndicators()
+    for n, price in enumerate(prices, start=1):
+        evicted = history.append(float(n), price)
+        result = indicators.update(history, evicted)
+        if n in checkpoints:
+            yield n, result, history.window().tolist()
+
+
+def assert_matches(streamed, reference):
+    for key in KEYS:
+        expected = reference[key]
+        if math.isnan(expected):
+            assert math.isnan(streamed[key]), key
+        else:
+            assert streamed[key] == pytest.approx(expected, rel=1e-7, abs=1e-6), key
+
+
+def test_returns_none_until_warmed_up():
+    history, indicators = PriceHistory(), StreamingIndicators()
+    for n, price in enumerate(random_walk(MIN_HISTORY, seed=0), start=1):
+        result = indicators.update(history, history.append(float(n), price))
+        assert (result is None) == (n < MIN_HISTORY)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_matches_reference_during_warm_up(seed):
+    checkpoints = {MIN_HISTORY, 75, 150, 199}
+    for n, streamed, window in stream(random_walk(200, seed), checkpoints):
+        assert_matches(streamed, reference_indicators(window))
+
+
+@pytest.mark.parametrize('seed', [4, 5])
+def test_matches_reference_once_the_window_slides(seed):
+    # 200 is the first full window, 201 the first eviction; the later points
+    # fall either side of a running-sum resync.
+    checkpoints = {200, 201, 333, RESYNC_INTERVAL - 1, RESYNC_INTERVAL, RESYNC_INTERVAL + 1, 2500}
+    for n, streamed, window in stream(random_walk(2500, seed), checkpoints):
+        assert_matches(streamed, reference_indicators(window))
+
+
+def test_matches_reference_on_a_trend_that_goes_flat():
+    checkpoints = {MIN_HISTORY, 200, 260, 320, 400}
+    for n, streamed, window in stream(trending_then_flat(400), checkpoints):
+        assert_matches(streamed, reference_indicators(window))
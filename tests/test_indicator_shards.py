@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from services.indicator_shards import IndicatorShard, ShardedIndicatorPool
+
+
+def make_batches(symbols=12, rounds=80, seed=7):
+    rng = random.Random(seed)
+    prices = {f"SYM{i}": 100.0 for i in range(symbols)}
+    batches = []
+    for r in range(rounds):
+        batch = []
+        for symbol in prices:
+            prices[symbol] *= 1 + rng.gauss(0, 0.002)
+            batch.append((symbol, float(r), prices[symbol]))
+        batches.append(batch)
+    return batches
+
+
+@pytest.mark.asyncio
+async def test_process_shards_match_inline():
+    batches = make_batches()
+    inline = IndicatorShard()
+    expected = [inline.process(batch) for batch in batches]
+
+    pool = ShardedIndicatorPool(3)
+    try:
+        assert pool.mode == 'process'
+        assert [await pool.process(batch) for batch in batches] == expected
+    finally:
+        pool.close()
+    assert sum(pool.ticks) == sum(len(batch) for batch in batches)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from analysis.inference_service import SentimentInferenceService
+from analysis.text_cache import TextCache
+
+POSTS = [
+    "BTC",
+    "Bitcoin is going to the moon after the ETF approval",
+    "Earnings missed badly, guidance cut, shares tumble after hours",
+    "meh",
+    "The central bank held rates steady while signalling that further tightening "
+    "remains possible if inflation does not continue to cool over the coming quarters",
+    "ETH gas fees are up again",
+    "Record revenue and a raised full-year outlook",
+    "Layoffs announced",
+]
+
+
+class LengthAnalyzer:
+    """Deterministic stand-in for AISentimentAnalyzer that records its batches."""
+
+    def __init__(self):
+        self.batches = []
+
+    def analyze(self, text):
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts):
+        self.batches.append(list(texts))
+        return [('positive' if len(text) % 2 else 'negative', len(text) / 1000) for text in texts]
+
+
+async def score_concurrently(service, texts):
+    service.start()
+    try:
+        return await asyncio.gather(*(service.analyze(text) for text in texts))
+    finally:
+        await asyncio.to_thread(service.stop)
+
+
+@pytest.mark.asyncio
+async def test_batched_results_come_back_in_request_order():
+    analyzer = LengthAnalyzer()
+    service = SentimentInferenceService(analyzer, max_batch_size=3, max_latency=0.05)
+    results = await score_concurrently(service, POSTS)
+    assert results == [LengthAnalyzer().analyze(text) for text in POSTS]
+    assert all(len(batch) <= 3 for batch in analyzer.batches)
+    assert len(analyzer.batches) < len(POSTS)
+
+
+@pytest.mark.asyncio
+async def test_identical_texts_share_one_request():
+    analyzer = LengthAnalyzer()
+    service = SentimentInferenceService(analyzer, max_batch_size=8, max_latency=0.05, cache=TextCache())
+    results = await score_concurrently(service, ["Layoffs announced", "layoffs   ANNOUNCED", "Layoffs announced"])
+    assert len(set(results)) == 1
+    assert sum(map(len, analyzer.batches)) == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_requests_still_waiting():
+    service = SentimentInferenceService(LengthAnalyzer())  # never started, so nothing is consumed
+    pending = [asyncio.ensure_future(service.analyze(text)) for text in POSTS[:3]]
+    await asyncio.sleep(0)
+    await asyncio.to_thread(service.stop)  # as main.py does
+    results = await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), timeout=1)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(RuntimeError):
+        await service.analyze("too late")
+
+
+@pytest.fixture(scope='module')
+def finbert():
+    pytest.importorskip('torch')
+    pytest.importorskip('transformers')
+    from analysis.ai_sentiment_analyzer import AISentimentAnalyzer
+    try:
+        return AISentimentAnalyzer('torch')
+    except OSError as e:  # model not cached and no network
+        pytest.skip(f"FinBERT unavailable: {e}")
+
+
+@pytest.mark.asyncio
+async def test_finbert_micro_batches_match_single_posts(finbert):
+    # Mixed lengths force padding inside each batch; the attention mask must
+    # keep it from changing any post's score.
+    expected = [finbert.analyze(text) for text in POSTS]
+    service = SentimentInferenceService(finbert, max_batch_size=4, max_latency=0.05)
+    results = await score_concurrently(service, POSTS)
+    for (label, score), (expected_label, expected_score) in zip(results, expected):
+        assert label == expected_label
+        assert score == pytest.approx(expected_score, abs=1e-4)
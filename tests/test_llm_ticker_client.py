@@ -0,0 +1,66 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from clients.llm_ticker_client import LlmTickerClient
+
+
+class FakeResponse:
+    status = 200
+    headers = {}
+
+    def __init__(self, tickers):
+        self._tickers = tickers
+
+    async def json(self):
+        results = [{'index': 0, 'tickers': self._tickers}]
+        return {'candidates': [{'content': {'parts': [{'text': json.dumps({'results': results})}]}}]}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FlakyHttp:
+    """Fails the first request for the TSLA post with ``error``; everything else is answered."""
+
+    def __init__(self, error):
+        self.error = error
+        self.failed = False
+
+    def post(self, url, json=None, timeout=None):
+        prompt = json['contents'][0]['parts'][0]['text']
+        if 'TSLA to the moon' in prompt and not self.failed:
+            self.failed = True
+            raise self.error
+        return FakeResponse(['TSLA'] if 'TSLA to the moon' in prompt else ['NVDA'])
+
+
+def make_client(http, **kwargs):
+    config = SimpleNamespace(GEMINI_API_URL='http://stub', GEMINI_MODEL='stub', GEMINI_API_KEY='x')
+    return LlmTickerClient(config, http=http, max_latency=0.01, **kwargs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('error', [aiohttp.ClientConnectionError("reset"), asyncio.TimeoutError()])
+async def test_transport_errors_are_retried(error):
+    client = make_client(FlakyHttp(error))
+    assert await client.extract("TSLA to the moon") == ['TSLA']
+    assert client.stats['retries'] == 1 and client.stats['errors'] == 0
+
+
+@pytest.mark.asyncio
+async def test_backoff_does_not_hold_a_concurrency_slot():
+    http = FlakyHttp(aiohttp.ClientConnectionError("reset"))
+    client = make_client(http, max_batch_size=1, max_concurrency=1)
+    first = asyncio.ensure_future(client.extract("TSLA to the moon"))
+    await asyncio.sleep(0.05)  # the TSLA batch has failed and is backing off for 0.5 s
+    assert await asyncio.wait_for(client.extract("NVDA earnings"), timeout=0.3) == ['NVDA']
+    assert not first.done()
+    assert await first == ['TSLA']
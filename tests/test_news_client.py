@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('feedparser')
+pytest.importorskip('aiohttp')
+
+from clients.news_client import FinancialNewsClient, link_key
+
+RSS = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Markets</title>
+<item><title>Stocks rally</title><link>https://news.test/a</link><description>Indexes up.</description></item>
+<item><title>Oil slides</title><link>https://news.test/b</link><description>Crude down.</description></item>
+<item><title>Stocks rally</title><link>https://news.test/a</link><description>Indexes up.</description></item>
+</channel></rss>"""
+
+
+class FeedResponse:
+    status = 200
+    headers = {'ETag': '"v1"'}
+
+    def raise_for_status(self):
+        pass
+
+    async def text(self):
+        return RSS
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FeedHttp:
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(dict(headers or {}))
+        return FeedResponse()
+
+
+class Writer:
+    def __init__(self):
+        self.rows = []
+
+    def put(self, table, row):
+        self.rows.append((table, row))
+
+
+class Db:
+    """ingest_posts fails (returns [], like the real managers on a DB error) while ``down``."""
+
+    def __init__(self):
+        self.down = True
+        self.writer = Writer()
+        self.ingested = []
+
+    async def ingest_posts(self, batch):
+        if self.down:
+            return []
+        self.ingested.extend(batch)
+        return list(range(len(self.ingested) - len(batch) + 1, len(self.ingested) + 1))
+
+
+@pytest.mark.asyncio
+async def test_failed_insert_leaves_articles_unseen_and_validators_unchanged():
+    http, db, queue = FeedHttp(), Db(), asyncio.Queue()
+    client = FinancialNewsClient(queue, db, http, feeds=['https://news.test/rss'])
+
+    await client._poll_feed('https://news.test/rss')
+    assert client.counts['errors'] == 1
+    assert len(client._seen) == 0 and db.writer.rows == [] and queue.empty()
+
+    db.down = False
+    await client._poll_feed('https://news.test/rss')
+    assert http.requests[1] == {}  # no conditional GET after the failed round
+    assert [content for _, content, _, _ in db.ingested] == ["Stocks rally. Indexes up.", "Oil slides. Crude down."]
+    assert {row[0] for _, row in db.writer.rows} == {link_key('https://news.test/a'), link_key('https://news.test/b')}
+    assert queue.qsize() == 2
+
+    await client._poll_feed('https://news.test/rss')
+    assert http.requests[2] == {'If-None-Match': '"v1"'}
+    assert len(db.ingested) == 2 and client.counts['new_articles'] == 2
@@ -0,0 +1,164 @@
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from services.order_router import OrderRouter, RetryableOrderError
+from tools.fake_exchange import FakeExchange
+
+
+async def route(venues, orders, limits=(1000, 100), max_retries=4):
+    router = OrderRouter(venues, {name: limits for name in venues}, workers=4, max_retries=max_retries)
+    runner = asyncio.ensure_future(router.run())
+    try:
+        for i in range(orders):
+            for name in venues:
+                router.submit(f"SYM{i % 5}", 'buy', 1.0, name, 100.0, signal_id=i)
+        done = ('placed', 'rejected', 'failed')
+        while sum(router.stats()[v][k] for v in venues for k in done) < orders * len(venues):
+            await asyncio.sleep(0.01)
+    finally:
+        runner.cancel()
+    return router.stats()
+
+
+@pytest.mark.asyncio
+async def test_lost_acks_are_recovered_without_double_fills():
+    venues = {'crypto': FakeExchange('kraken', latency_ms=1, rate_limit=1000, ack_loss=0.3, seed=1),
+              'stock': FakeExchange('alpaca', latency_ms=1, rate_limit=1000, ack_loss=0.3, seed=2,
+                                    duplicates='alpaca')}
+    stats = await route(venues, orders=30)
+    for name, exchange in venues.items():
+        assert exchange.lost_acks > 0
+        assert exchange.double_fills == 0
+        assert stats[name]['placed'] == 30 and stats[name]['failed'] == 0
+        assert stats[name]['recovered'] == exchange.lost_acks
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_orders_are_resubmitted_without_a_lookup():
+    venue = FakeExchange('kraken', latency_ms=1, rate_limit=5)
+    stats = await route({'crypto': venue}, orders=8, max_retries=6)
+    assert venue.rate_limited > 0
+    assert venue.lookups == 0 and venue.double_fills == 0
+    assert stats['crypto']['placed'] == 8
+
+
+@pytest.mark.asyncio
+async def test_orders_refused_for_a_stale_nonce_are_resubmitted():
+    venue = FakeExchange('kraken', latency_ms=2, rate_limit=1000, nonces=True, seed=3)
+    stats = await route({'crypto': venue}, orders=12, max_retries=8)
+    assert venue.invalid_nonces > 0
+    assert stats['crypto']['placed'] == 12 and stats['crypto']['rejected'] == 0
+    assert venue.lookups == 0 and venue.double_fills == 0
+
+
+class KrakenApi:
+    """Answers KrakenRestClient's private calls by path."""
+
+    def __init__(self, responses):
+        self.responses, self.calls = responses, []
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        path = url.split('kraken.test', 1)[1]
+        self.calls.append((path, dict(data)))
+        body = self.responses[path]
+
+        class Response:
+            async def json(self):
+                return body
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Response()
+
+
+def kraken_client(responses):
+    pytest.importorskip('aiohttp')
+    from clients.kraken_rest_client import KrakenRestClient
+    config = SimpleNamespace(KRAKEN_API_KEY='key', KRAKEN_PRIVATE_KEY=base64.b64encode(b'secret').decode(),
+                             KRAKEN_REST_URL='https://kraken.test', KRAKEN_ORDER_TIMEOUT_SECONDS=5)
+    api = KrakenApi(responses)
+    return KrakenRestClient(config, http=api), api
+
+
+@pytest.mark.asyncio
+async def test_kraken_duplicate_open_order_returns_the_existing_order():
+    client, api = kraken_client({
+        '/0/private/AddOrder': {'error': ['EOrder:Duplicate order']},
+        '/0/private/OpenOrders': {'error': [], 'result': {'open': {'OABC-1': {'cl_ord_id': 'kab-1'}}}},
+    })
+    order = await client.place_order('XBT/USD', 'limit', 'buy', 0.1, client_order_id='kab-1')
+    assert order['txid'] == ['OABC-1']
+    assert [path for path, _ in api.calls] == ['/0/private/AddOrder', '/0/private/OpenOrders']
+
+
+@pytest.mark.asyncio
+async def test_kraken_find_order_checks_closed_orders():
+    client, api = kraken_client({
+        '/0/private/OpenOrders': {'error': [], 'result': {'open': {}}},
+        '/0/private/ClosedOrders': {'error': [], 'result': {'closed': {'OXYZ-2': {'status': 'closed'}}}},
+    })
+    assert (await client.find_order('kab-2'))['txid'] == ['OXYZ-2']
+    assert all(data['cl_ord_id'] == 'kab-2' for _, data in api.calls)
+
+
+@pytest.mark.asyncio
+async def test_kraken_nonces_increase_within_a_millisecond():
+    client, api = kraken_client({'/0/private/Balance': {'error': [], 'result': {}}})
+    await asyncio.gather(*(client.get_balance() for _ in range(20)))
+    nonces = [int(data['nonce']) for _, data in api.calls]
+    assert nonces == sorted(set(nonces))
+
+
+@pytest.mark.asyncio
+async def test_kraken_invalid_nonce_is_retryable():
+    client, _ = kraken_client({'/0/private/AddOrder': {'error': ['EAPI:Invalid nonce']}})
+    with pytest.raises(RetryableOrderError):
+        await client.place_order('XBT/USD', 'market', 'buy', 0.1, client_order_id='kab-5')
+
+
+def alpaca_client(submit_order, get_order_by_client_order_id):
+    pytest.importorskip('alpaca_trade_api')
+    from clients.alpaca_rest_client import AlpacaRestClient
+    config = SimpleNamespace(APCA_API_KEY_ID='key', APCA_API_SECRET_KEY='secret',
+                             APCA_BASE_URL='https://paper-api.alpaca.markets')
+    client = AlpacaRestClient(config)
+    client.api = SimpleNamespace(submit_order=submit_order, get_order_by_client_order_id=get_order_by_client_order_id)
+    return client
+
+
+def alpaca_error(status_code, message):
+    from alpaca_trade_api.rest import APIError
+    return APIError({'code': status_code * 100000, 'message': message},
+                    SimpleNamespace(response=SimpleNamespace(status_code=status_code)))
+
+
+@pytest.mark.asyncio
+async def test_alpaca_duplicate_client_order_id_returns_the_existing_order():
+    def submit_order(*args, **kwargs):
+        raise alpaca_error(422, "client_order_id must be unique")
+
+    client = alpaca_client(submit_order, lambda client_order_id: {'id': 'a1', 'client_order_id': client_order_id})
+    try:
+        order = await client.place_order('AAPL', 'market', 'buy', 1, client_order_id='kab-3')
+        assert order == {'id': 'a1', 'client_order_id': 'kab-3'}
+    finally:
+        client.close()
+
+
+@pytest.mark.asyncio
+async def test_alpaca_find_order_returns_none_when_unknown():
+    def get_order_by_client_order_id(client_order_id):
+        raise alpaca_error(404, "order not found")
+
+    client = alpaca_client(None, get_order_by_client_order_id)
+    try:
+        assert await client.find_order('kab-4') is None
+    finally:
+        client.close()
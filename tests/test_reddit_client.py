@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('asyncpraw')
+
+from clients.reddit_client import RedditClient
+from tools.fake_reddit import FakeReddit
+
+
+class SlowDb:
+    """ingest_posts takes ``delay`` seconds, or waits for ``gate`` when one is set."""
+
+    def __init__(self, delay=0.0):
+        self.delay, self.gate = delay, None
+        self.rows = []
+
+    async def ingest_posts(self, batch):
+        if self.gate is not None:
+            await self.gate.wait()
+        await asyncio.sleep(self.delay)
+        self.rows.extend(batch)
+        return list(range(len(self.rows) - len(batch) + 1, len(self.rows) + 1))
+
+
+def make_client(db, queue, source, batch_size=10, max_buffered=30):
+    config = SimpleNamespace(REDDIT_BATCH_SIZE=batch_size, REDDIT_BATCH_SECONDS=0.05, REDDIT_DEDUP_SIZE=1000,
+                             REDDIT_MAX_BUFFERED=max_buffered)
+    return RedditClient(queue, config, db, ['wallstreetbets'], reddit=source)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_stores_the_batch_being_flushed():
+    db, queue = SlowDb(delay=0.2), asyncio.Queue()
+    client = make_client(db, queue, FakeReddit(rate=10000, total=25))
+    task = asyncio.ensure_future(client.stream_comments())
+    while not client.counts['comments'] == 25:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)  # the flusher is now inside a slow ingest_posts call
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert len(db.rows) == 25 and queue.qsize() == 25
+    assert client.stats()['buffered'] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_pauses_while_the_buffer_is_full():
+    db, queue = SlowDb(), asyncio.Queue()
+    db.gate = asyncio.Event()
+    source = FakeReddit(rate=100000, total=500)
+    client = make_client(db, queue, source, batch_size=10, max_buffered=30)
+    task = asyncio.ensure_future(client.stream_comments())
+    await asyncio.sleep(0.2)
+    assert client.stats()['buffered'] <= 30
+    assert source.yielded < 500 and client.counts['stalls'] > 0
+
+    db.gate.set()
+    while queue.qsize() < 500:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert len(db.rows) == 500
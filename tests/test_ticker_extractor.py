@@ -0,0 +1,68 @@
+import pytest
+
+from services.ticker_extractor import LocalTickerExtractor
+
+KNOWN_STOCKS = {'AAPL', 'TSLA', 'NVDA', 'AMD', 'GME', 'AMC', 'SPY', 'MSFT', 'PLTR', 'F', 'T', 'ALL', 'NOW', 'IT'}
+KNOWN_CRYPTO = {'BTC/USD', 'ETH/USD', 'SOL/USD', 'DOGE/USD', 'XRP/USD', 'ADA/USD'}
+
+# (post, tickers a human would tag)
+LABELED = (
+    ("$TSLA earnings tomorrow, loading calls", {'TSLA'}),
+    ("Is NVDA overvalued at this point?", {'NVDA'}),
+    ("I bought more GME and AMC today, YOLO", {'GME', 'AMC'}),
+    ("The CEO said on CNBC that the FED will cut", set()),
+    ("bitcoin just broke 70k!!", {'BTC'}),
+    ("ETH/USD looking weak on the 4h chart", {'ETH'}),
+    ("Selling my $F position, switching to $T", {'F', 'T'}),
+    ("DD on PLTR: government contracts keep growing", {'PLTR'}),
+    ("Why is everyone talking about AI stocks now", set()),
+    ("SPY puts printed today, IMO the top is in", {'SPY'}),
+    ("Dogecoin to the moon", {'DOGE'}),
+    ("AAPL vs MSFT, which is the better long term hold?", {'AAPL', 'MSFT'}),
+    ("I think it is a good time to buy the dip", set()),
+    ("$AMD guidance was weak but data center grew", {'AMD'}),
+    ("solana outage again, selling all my SOL", {'SOL'}),
+    ("USA GDP numbers came in hot, IPO market reopening", set()),
+    ("XRP and ADA pumping while BTC goes sideways", {'XRP', 'ADA', 'BTC'}),
+    ("Just opened a Roth IRA with $5000", set()),
+    ("$XYZW is my new favourite penny stock", set()),
+    ("Fed minutes out at 2pm EST", set()),
+    ("ALL IN on calls, IT is NOW or never", set()),
+    ("Adding to $NOW and $IT on this dip", {'NOW', 'IT'}),
+    ("ethereum and cardano both down 8% this week", {'ETH', 'ADA'}),
+    ("MSFT MSFT MSFT", {'MSFT'}),
+)
+
+
+@pytest.fixture
+def extractor():
+    return LocalTickerExtractor(set(KNOWN_STOCKS), set(KNOWN_CRYPTO))
+
+
+def test_precision_and_recall_on_labeled_posts(extractor):
+    true_positives = false_positives = false_negatives = 0
+    for post, expected in LABELED:
+        found = set(extractor.extract(post)[0])
+        true_positives += len(found & expected)
+        false_positives += len(found - expected)
+        false_negatives += len(expected - found)
+    precision = true_positives / (true_positives + false_positives)
+    recall = true_positives / (true_positives + false_negatives)
+    assert precision >= 0.95, precision
+    assert recall >= 0.95, recall
+
+
+@pytest.mark.parametrize('post', [post for post, expected in LABELED if not expected])
+def test_no_false_positives_on_ticker_free_posts(extractor, post):
+    assert extractor.extract(post)[0] == []
+
+
+def test_unknown_cashtags_are_reported_as_unresolved(extractor):
+    tickers, unresolved = extractor.extract("$XYZW is my new favourite penny stock")
+    assert tickers == [] and unresolved == ['XYZW']
+
+
+def test_known_sets_are_read_live(extractor):
+    assert extractor.extract("HOOD is ripping")[0] == []
+    extractor.known_stock_tickers.add('HOOD')
+    assert extractor.extract("HOOD is ripping")[0] == ['HOOD']
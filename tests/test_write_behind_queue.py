@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('psycopg2')
+
+from db.database import WriteBehindQueue
+
+
+class SlowDb:
+    """insert_many takes ``delay`` seconds; rows count as stored only once it returns."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.rows = []
+        self.writing = asyncio.Event()
+
+    async def insert_many(self, table, columns, rows, suffix=''):
+        self.writing.set()
+        await asyncio.sleep(self.delay)
+        self.rows.extend(rows)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_run_mid_write_keeps_the_batch():
+    db = SlowDb(delay=0.1)
+    writer = WriteBehindQueue(db, max_rows=2, max_delay=10)
+    runner = asyncio.ensure_future(writer.run())
+    await asyncio.sleep(0)
+    writer.put('seen_news', ('a', 1))
+    writer.put('seen_news', ('b', 2))
+    await db.writing.wait()
+    writer.put('seen_news', ('c', 3))  # arrives while the first batch is being written
+
+    runner.cancel()  # as gather does on shutdown
+    await writer.close()
+
+    assert sorted(db.rows) == [('a', 1), ('b', 2), ('c', 3)]